@@ -1,10 +1,13 @@
 import pygame as pg
 import os
 import platform
-from data.constants import SCR_SIZE
+import argparse
+from time import perf_counter
 
 
-def main():
+def init_display():
+    from data.constants import SCR_SIZE
+
     os.environ['SDL_VIDEO_CENTERED'] = '1'
     pg.mixer.pre_init(44100, -16, 2, 512)
     pg.init()
@@ -18,11 +21,87 @@ def main():
         from ctypes import windll
         windll.shcore.SetProcessDpiAwareness(2)
 
-    screen = pg.display.set_mode(SCR_SIZE, flags=0)
+    return pg.display.set_mode(SCR_SIZE, flags=0)
+
+
+def main(record=None):
+    screen = init_display()
 
     from components.game import Game
-    Game(screen).run()
+    game = Game(screen)
+    if record is not None:
+        from components.replay import ReplayRecorder
+        game.recorder = ReplayRecorder(game, record)
+    game.run()
+
+
+def play_replay(path, headless=False):
+    if headless:
+        from headless import init_headless
+        screen = init_headless()
+    else:
+        screen = init_display()
+
+    from components.replay import Replay, ReplayGame
+    from components.gc_scheduler import gc_scheduler
+    game = ReplayGame(screen, Replay.load(path), render=not headless)
+    game.start()
+    start_time = perf_counter()
+    game.run()
+    elapsed = perf_counter() - start_time
+
+    print("Replayed %d of %d frames in %.2f s (%.0f frames per second)" %
+          (game.frames, len(game.replay.frames), elapsed, game.frames / max(elapsed, 1e-9)))
+    print(game.collision_grid.report())
+    print(gc_scheduler.report())
+    if not headless:
+        from components.sprite_cache import circle_sprites, baked_sprites
+        from components.render_queue import render_queue
+        print(circle_sprites.report())
+        print(baked_sprites.report())
+        print(game.bg_environment.room_strips.report())
+        print(render_queue.report())
+    if game.desync_frame is not None:
+        print("Desync detected at frame %d" % game.desync_frame)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bubble Tanks 2")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the simulation without a display")
+    parser.add_argument("--frames", type=int, default=10000,
+                        help="number of frames to simulate in headless mode")
+    parser.add_argument("--save", default=None,
+                        help="name of the save file to start headless mode from")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the random streams in headless mode")
+    parser.add_argument("--record", default=None,
+                        help="record the game into the given replay file")
+    parser.add_argument("--replay", default=None,
+                        help="play the given replay file, without a display in headless mode")
+    parser.add_argument("--player", default=None, metavar="INPUT",
+                        help="drive the player in headless mode by a scripted player ('scripted') "
+                             "or by the input recorded in the given replay file")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the simulation in headless mode")
+    parser.add_argument("--memory", action="store_true",
+                        help="print the memory taken by live entities in headless mode")
+    parser.add_argument("--bench-enemies", type=int, default=None, metavar="COUNT",
+                        help="measure how many enemies of every type are constructed per second")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.bench_enemies is not None:
+        from headless import bench_enemies
+        bench_enemies(args.bench_enemies)
+    elif args.replay is not None:
+        play_replay(args.replay, args.headless)
+    elif args.headless:
+        from headless import run_headless
+        run_headless(args.frames, args.save, seed=args.seed,
+                     record=args.record, profile=args.profile,
+                     memory=args.memory, player=args.player)
+    else:
+        main(args.record)
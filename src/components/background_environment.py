@@ -8,6 +8,8 @@ from data.languages import TEXTS
 from gui.widgets.text_widget import TextWidget
 
 from components.boss_skeleton import BossSkeleton
+from components.render_queue import render_queue
+from components.sprite_cache import SpriteCache
 from components.utils import *
 
 
@@ -58,6 +60,97 @@ def room_bg() -> list:
     return bg
 
 
+class RoomStrips(SpriteCache):
+    """Strips of the background of a room flattened with the gradient.
+
+    The strips have transparency, so every pixel of them is blended with
+    the gradient under it every frame. The gradient doesn't move with the
+    camera, so a strip can't be flattened with it once, but it only changes
+    vertically, so a strip looks the same wherever it is horizontally.
+
+    The strips are cut into pieces at most 'piece_width' pixels wide,
+    and a piece is composited with the rows of the gradient at its vertical
+    position on the screen, rounded to 'gradient_step' pixels, into an opaque
+    surface. The step is a 24th of the screen height, which changes the
+    colors by two levels at most. Flattened pieces are cached by their index
+    and the rounded position, so a piece is composited again only when the
+    camera moves it vertically by the step, and otherwise it is drawn without
+    blending. Pieces off the screen are skipped.
+    """
+    name = "Room strips"
+
+    def __init__(self, strips, bg, piece_width=ROOM_STRIPS_PIECE_WIDTH,
+                 gradient_step=ROOM_STRIPS_GRADIENT_STEP,
+                 max_bytes=ROOM_STRIPS_MAX_BYTES, enabled=ROOM_STRIPS_ENABLED):
+        super().__init__(max_bytes, 1, enabled)
+        self.pieces, self.rows = self.cut(strips, piece_width)
+        self.gradient_step = gradient_step
+        self.pad = max(strip.get_height() for strip in strips) + gradient_step
+        self.gradient = self.make_gradient(bg)
+
+    @staticmethod
+    def cut(strips, piece_width) -> tuple:
+        """Returns the list of the pieces of the strips and the rows of
+        the strips. A row is the vertical position of its strips in the room,
+        their height and the index of every piece in them with its position.
+        """
+        pieces = []
+        rows = dict()
+        for strip in strips:
+            x_offset, y_offset = strip.get_offset()
+            w, h = strip.get_size()
+            row = rows.setdefault((y_offset, h), [])
+            for x in range(0, w, piece_width):
+                piece_w = min(piece_width, w - x)
+                row.append((len(pieces), x_offset, x, piece_w))
+                pieces.append(strip.subsurface(x, 0, piece_w, h))
+        return pieces, [(y_offset, h, row) for (y_offset, h), row in rows.items()]
+
+    def make_gradient(self, bg) -> pg.Surface:
+        """Returns a column of the gradient extended above and below
+        the screen with the colors of its first and last rows.
+        """
+        pad = self.pad
+        gradient = pg.Surface((1, SCR_H + 2 * pad))
+        if pg.display.get_surface() is not None:
+            gradient = gradient.convert()
+        gradient.fill(bg.get_at((0, 0)), pg.Rect(0, 0, 1, pad))
+        gradient.fill(bg.get_at((0, SCR_H - 1)), pg.Rect(0, SCR_H + pad, 1, pad))
+        gradient.blit(bg, (0, pad), pg.Rect(0, 0, 1, SCR_H))
+        return gradient
+
+    def get(self, index, y) -> pg.Surface:
+        """Returns the piece with the index flattened
+        for the vertical position y on the screen.
+        """
+        step = self.gradient_step
+        y = y // step * step + step // 2
+        key = (index, y)
+        sprite = self.lookup(key)
+        if sprite is None:
+            piece = self.pieces[index]
+            w, h = piece.get_size()
+            top = max(0, min(y + self.pad, SCR_H + self.pad))
+            sprite = pg.transform.scale(self.gradient.subsurface(0, top, 1, h), (w, h))
+            sprite.blit(piece, (0, 0))
+            self.store(key, sprite)
+        return sprite
+
+    def draw(self, screen, x, y):
+        """Draws the pieces on the screen, given the position
+        of the top left corner of the room on the screen.
+        """
+        blits = []
+        for y_offset, h, row in self.rows:
+            piece_y = int(y + y_offset)
+            if -h < piece_y < SCR_H:
+                for index, x_offset, piece_x, w in row:
+                    piece_x += int(x + x_offset)
+                    if -w < piece_x < SCR_W:
+                        blits.append((self.get(index, piece_y), (piece_x, piece_y)))
+        screen.blits(blits, False)
+
+
 class RoomGlare:
     def __init__(self,
                  x: float,
@@ -71,7 +164,7 @@ class RoomGlare:
         self.surface = pg.transform.smoothscale(self.image, (round(diam), round(diam)))
 
     def draw(self, surface, dx, dy):
-        surface.blit(self.surface, (round(self.x - dx), round(self.y - dy)))
+        render_queue.blit(surface, self.surface, (round(self.x - dx), round(self.y - dy)))
 
 
 class PlayerHalo:
@@ -157,6 +250,7 @@ class BackgroundEnvironment:
 
         self.bg = pg.transform.scale(pg.image.load(BG).convert(), SCR_SIZE)
         self.room_bg = room_bg()
+        self.room_strips = RoomStrips(self.room_bg, self.bg)
         self.player_halo = PlayerHalo()
         self.destination_circle = DestinationCircle()
         self.player_trace = PlayerTrace()
@@ -259,6 +353,9 @@ class BackgroundEnvironment:
     def draw_room_bg(self, screen, dx, dy):
         x = SCR_W2 - ROOM_RADIUS - dx
         y = SCR_H2 - ROOM_RADIUS - dy
+        if self.room_strips.enabled:
+            self.room_strips.draw(screen, x, y)
+            return
         for surface in self.room_bg:
             x_offset, y_offset = surface.get_offset()
             screen.blit(surface, (x + x_offset, y + y_offset))
@@ -1,37 +1,57 @@
-from math import cos, sin
+from math import cos, sin, floor, ceil
 import pygame as pg
 
 from components.circle import make_circles_list
-from components.utils import HF, H
+from components.utils import HF
+from data.constants import COLOR_KEY
 from data.shapes import SHAPES
 
 
 class SkeletonPart:
+    """Part of the boss skeleton. Nothing in it moves, so its circles are
+    drawn once into a surface around the center of the part when the part
+    is made, that is once per resolution, and the part is drawn with
+    one blit of the surface when its rect is on the screen.
+    """
     def __init__(self, screen_rect, data: dict):
         self.screen_rect = screen_rect
-        self.rect = pg.Rect(0, 0, H(data["width"]), H(data["height"]))
         self.distance = HF(data["distance"])
         self.angle = data["angle"]
-        self.circles = make_circles_list(screen_rect, data["circles"])
+        self.surface, self.offset = self.render(make_circles_list(screen_rect, data["circles"]))
+        self.rect = self.surface.get_rect()
         self.x = 0
         self.y = 0
 
-    @property
-    def is_on_screen(self):
-        return self.rect.colliderect(self.screen_rect)
+    @staticmethod
+    def render(circles) -> tuple:
+        """Draws the circles placed around (0, 0) into a new surface.
+        Returns the surface and the position of its top left corner.
+        """
+        for circle in circles:
+            circle.move_to(0, 0)
+        left = floor(min(circle.x - circle.radius for circle in circles)) - 1
+        top = floor(min(circle.y - circle.radius for circle in circles)) - 1
+        right = ceil(max(circle.x + circle.radius for circle in circles)) + 1
+        bottom = ceil(max(circle.y + circle.radius for circle in circles)) + 1
+
+        surface = pg.Surface((right - left, bottom - top))
+        if pg.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(COLOR_KEY)
+        for circle in circles:
+            circle.draw(surface, left, top)
+        surface.set_colorkey(COLOR_KEY, pg.RLEACCEL)
+        return surface, (left, top)
 
     def move_to(self, x, y):
         self.x = x + self.distance * cos(self.angle)
         self.y = y - self.distance * sin(self.angle)
-        for circle in self.circles:
-            circle.move_to(self.x, self.y)
-        self.rect.center = self.x, self.y
+        self.rect.topleft = self.x + self.offset[0], self.y + self.offset[1]
 
     def draw(self, screen, dx, dy):
-        if self.is_on_screen:
-            for circle in self.circles:
-                if circle.is_on_screen:
-                    circle.draw(screen, dx, dy)
+        if self.rect.colliderect(self.screen_rect):
+            screen.blit(self.surface, (round(self.x - dx) + self.offset[0],
+                                       round(self.y - dy) + self.offset[1]))
 
 
 class BossSkeleton:
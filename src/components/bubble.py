@@ -1,15 +1,26 @@
-from random import uniform
-from math import hypot, cos, sin
+from math import hypot, cos, sin, atan2
 import pygame as pg
 
 from components.simple_body import Body
+from components.circle import circle_template
 from components.utils import *
+from components.rng import rng
+from components.object_pool import bubble_pool
+from components.render_queue import render_queue
 from data.constants import *
 from data.bubbles import BUBBLES
 from assets.paths import BUBBLE_HALO
 
 
+# circle templates of bodies of all bubble types
+BUBBLE_TEMPLATES = {name: tuple(circle_template(data) for data in bubble["circles"])
+                    for name, bubble in BUBBLES.items()}
+
+
 class Bubble:
+    __slots__ = ("bubble_type", "x", "y", "body", "radius", "rect", "screen_rect", "health",
+                 "vel", "acc", "gravity_vel", "max_gravity_vel", "gravity_acc", "angle",
+                 "gravity_radius", "base_halo", "halo")
     BUBBLE_MAX_VEL = HF(0.7)
     BUBBLE_ACC = HF(0.0024)
 
@@ -20,16 +31,17 @@ class Bubble:
                  angle=0,
                  gravitation_radius=0,
                  bubble_type="medium"):
+        self.bubble_type = bubble_type
         self.x = x
         self.y = y
 
-        self.body = Body(self, screen_rect, BUBBLES[bubble_type]["circles"])
+        self.body = Body(self, screen_rect, BUBBLE_TEMPLATES[bubble_type])
         self.radius = self.body.circles[0].max_radius
         self.rect = pg.Rect(0, 0, round(2*self.radius), round(2*self.radius))
         self.rect.center = x, y
         self.screen_rect = screen_rect
         self.health = BUBBLES[bubble_type]["health"]
-        self.vel = uniform(0.7, 1.7) * self.BUBBLE_MAX_VEL
+        self.vel = rng.ai.uniform(0.7, 1.7) * self.BUBBLE_MAX_VEL
         self.acc = -self.BUBBLE_ACC
         self.gravity_vel = 0
         self.max_gravity_vel = self.BUBBLE_MAX_VEL
@@ -43,6 +55,23 @@ class Bubble:
             self.base_halo = pg.image.load(BUBBLE_HALO).convert_alpha()
             self.update_halo()
 
+    def reset(self, x, y, angle=0, gravitation_radius=0):
+        """Re-initializes a recycled bubble as if it was just created. """
+        self.x = x
+        self.y = y
+        self.body.reset()
+        self.rect.center = x, y
+        self.health = BUBBLES[self.bubble_type]["health"]
+        self.vel = rng.ai.uniform(0.7, 1.7) * self.BUBBLE_MAX_VEL
+        self.acc = -self.BUBBLE_ACC
+        self.gravity_vel = 0
+        self.max_gravity_vel = self.BUBBLE_MAX_VEL
+        self.gravity_acc = self.BUBBLE_ACC
+        self.angle = angle
+        self.gravity_radius = gravitation_radius
+        if self.halo is not None:
+            self.update_halo()
+
     @property
     def is_outside(self):
         return not circle_collidepoint(SCR_W2, SCR_H2, ROOM_RADIUS, self.x, self.y)
@@ -114,7 +143,7 @@ class Bubble:
         radius = self.halo.get_width() / 2
         x = round(self.x - radius - dx)
         y = round(self.y - radius - dy)
-        surface.blit(self.halo, (x, y))
+        render_queue.blit(surface, self.halo, (x, y))
 
     def draw(self, surface, dx=0, dy=0):
         if self.is_on_screen:
@@ -123,4 +152,70 @@ class Bubble:
                 self.draw_halo(surface, dx, dy)
 
 
-__all__ = ["Bubble"]
+def make_bubble(screen_rect, x, y, angle=0, gravitation_radius=0, bubble_type="medium"):
+    """Returns a new bubble, taken from the pool of removed bubbles if possible. """
+    bubble = bubble_pool.acquire(bubble_type)
+    if bubble is None:
+        return Bubble(screen_rect, x, y, angle, gravitation_radius, bubble_type)
+    bubble.reset(x, y, angle, gravitation_radius)
+    return bubble
+
+
+def update_bubbles(bubbles, player_x, player_y, dt):
+    """Updates all bubbles of the entity list with the same equations as
+    'Bubble.update' in a single loop, without per-bubble method calls,
+    and removes bubbles that left the room from the list, releasing
+    them to the pool. The distance to the player
+    is computed once per bubble and shared by the gravity zone test
+    and the pass-through test.
+    """
+    acc = Bubble.BUBBLE_ACC
+    for i, bubble in enumerate(bubbles):
+        x, y = bubble.x, bubble.y
+        vel = bubble.vel
+        if vel == 0:
+            bubble.acc = 0
+        bubble_acc = bubble.acc
+
+        distance = hypot(x - player_x, y - player_y)
+        gravity_vel = bubble.gravity_vel
+        if distance <= bubble.gravity_radius:
+            gravity_acc = acc
+        elif gravity_vel != 0:
+            gravity_acc = -acc
+        else:
+            gravity_acc = 0
+        bubble.gravity_acc = gravity_acc
+
+        gravity_dr = gravity_vel * dt + gravity_acc * dt * dt / 2
+        if gravity_dr > distance:
+            x, y = player_x, player_y
+        else:
+            dr = vel * dt + bubble_acc * dt * dt / 2
+            gravity_angle = atan2(y - player_y, player_x - x)
+            angle = bubble.angle
+            x += dr * cos(angle) + gravity_dr * cos(gravity_angle)
+            y -= dr * sin(angle) + gravity_dr * sin(gravity_angle)
+        bubble.x, bubble.y = x, y
+
+        bubble.vel = max(0, vel + bubble_acc * dt)
+        if gravity_acc > 0:
+            bubble.gravity_vel = min(bubble.max_gravity_vel, gravity_vel + gravity_acc * dt)
+        else:
+            bubble.gravity_vel = max(0, gravity_vel + gravity_acc * dt)
+
+        bubble.rect.center = x, y
+        bubble.update_shape(dt)
+        if hypot(x - SCR_W2, y - SCR_H2) > ROOM_RADIUS:
+            bubble_pool.release(bubble.bubble_type, bubble)
+            bubbles[i] = None
+    bubbles.remove_none()
+
+
+def release_bubbles(bubbles):
+    """Releases bubbles of the list to the pool before the list is cleared. """
+    for bubble in bubbles:
+        bubble_pool.release(bubble.bubble_type, bubble)
+
+
+__all__ = ["Bubble", "make_bubble", "update_bubbles", "release_bubbles"]
@@ -1,7 +1,8 @@
-from random import randint, uniform
 from collections import defaultdict
 from math import sqrt
 
+from components.rng import rng
+
 
 def generate_test():
     enemies = defaultdict(int)
@@ -64,11 +65,11 @@ def generate_boss():
 
 def generate_easy(health_change):
     def add(name, n_min, n_max):
-        enemies[name] = randint(n_min, n_max)
+        enemies[name] = rng.world.randint(n_min, n_max)
 
     enemies = defaultdict(int)
-    enemy_set_1 = randint(1, 2)
-    enemy_set_2 = randint(1, 2)
+    enemy_set_1 = rng.world.randint(1, 2)
+    enemy_set_2 = rng.world.randint(1, 2)
 
     if health_change < 75:
         add("Ameba", 2, 3)
@@ -100,7 +101,7 @@ def generate_easy(health_change):
         add("Infusoria", 2, 3)
 
     else:
-        choice = randint(1, 100)
+        choice = rng.world.randint(1, 100)
         if choice <= 50:
             add("Ameba", 2, 3)
             add("BigBaby", 6, 8)
@@ -120,10 +121,10 @@ def generate_easy(health_change):
 
 def generate_help(world_distance):
     def add(name, n_min, n_max):
-        enemies[name] = randint(n_min, n_max)
+        enemies[name] = rng.world.randint(n_min, n_max)
 
     enemies = defaultdict(int)
-    enemy_set_2 = randint(1, 2)
+    enemy_set_2 = rng.world.randint(1, 2)
 
     if world_distance < 7:
         add("Ameba", 1, 2)
@@ -142,7 +143,7 @@ def generate_help(world_distance):
             add("Cell", 1, 3)
 
     else:
-        choice = randint(1, 60)
+        choice = rng.world.randint(1, 60)
         if choice <= 20:
             add("BigBaby", 1, 2)
             add("Infusoria", 2, 4)
@@ -168,11 +169,11 @@ def generate_help(world_distance):
 
 def generate_enemies(world_distance):
     def add(name, n_min, n_max):
-        enemies[name] = randint(n_min, n_max)
+        enemies[name] = rng.world.randint(n_min, n_max)
 
     enemies = defaultdict(int)
-    enemy_set_1 = randint(1, 3)
-    enemy_set_2 = randint(1, 2)
+    enemy_set_1 = rng.world.randint(1, 3)
+    enemy_set_2 = rng.world.randint(1, 2)
 
     if world_distance < 2:
         add("Ameba", 1, 2)
@@ -183,7 +184,7 @@ def generate_enemies(world_distance):
             add("Baby", 0, 2)
 
     elif world_distance < 4:
-        choice = randint(1, 4)
+        choice = rng.world.randint(1, 4)
         if choice == 1:
             add("Ameba", 1, 2)
             add("Infusoria", 1, 2)
@@ -202,7 +203,7 @@ def generate_enemies(world_distance):
                 add("Baby", 0, 2)
 
     elif world_distance < 6:
-        choice = randint(1, 21)
+        choice = rng.world.randint(1, 21)
         if choice <= 6:
             add("Infusoria", 0, 2)
             if enemy_set_1 == 1:
@@ -243,7 +244,7 @@ def generate_enemies(world_distance):
             add("EnemySpawnerLarge", 1, 1)
 
     elif world_distance < 8:
-        choice = randint(1, 20)
+        choice = rng.world.randint(1, 20)
         if choice <= 6:
             add("Infusoria", 1, 2)
             if enemy_set_1 == 1:
@@ -293,7 +294,7 @@ def generate_enemies(world_distance):
                 add("Baby", 0, 2)
 
     elif world_distance < 10:
-        choice = randint(1, 21)
+        choice = rng.world.randint(1, 21)
         if choice <= 4:
             add("Ameba", 1, 2)
             if enemy_set_1 == 1:
@@ -340,7 +341,7 @@ def generate_enemies(world_distance):
                 add("Baby", 0, 2)
 
     elif world_distance < 12:
-        choice = randint(1, 98)
+        choice = rng.world.randint(1, 98)
         if choice <= 20:
             add("Cockroach", 2, 3)
             add("Infusoria", 0, 2)
@@ -402,7 +403,7 @@ def generate_enemies(world_distance):
             add("Ameba", 0, 2)
 
     elif world_distance < 14:
-        choice = randint(1, 115)
+        choice = rng.world.randint(1, 115)
         if choice <= 20:
             add("Infusoria", 0, 2)
             add("StickyTurtle", 1, 2)
@@ -453,7 +454,7 @@ def generate_enemies(world_distance):
             add("Ameba", 0, 2)
 
     elif world_distance < 16:
-        choice = randint(1, 145)
+        choice = rng.world.randint(1, 145)
         if choice <= 30:
             add("Beetle", 1, 2)
             if enemy_set_2 == 1:
@@ -516,7 +517,7 @@ def generate_enemies(world_distance):
                 add("BenLaden", 0, 1)
 
     elif world_distance < 18:
-        choice = randint(1, 170)
+        choice = rng.world.randint(1, 170)
         if choice <= 20:
             add("Beetle", 1, 2)
             if enemy_set_2 == 1:
@@ -598,7 +599,7 @@ def generate_enemies(world_distance):
             add("Ameba", 0, 1)
 
     elif world_distance < 20:
-        choice = randint(1, 150)
+        choice = rng.world.randint(1, 150)
         if choice <= 30:
             add("Spider", 1, 1)
             add("Infusoria", 0, 2)
@@ -656,7 +657,7 @@ def generate_enemies(world_distance):
             add("Ameba", 0, 1)
 
     elif world_distance < 25:
-        choice = randint(1, 170)
+        choice = rng.world.randint(1, 170)
         if choice <= 20:
             add("BubbleBomber", 2, 4)
             add("StickyTurtle", 1, 2)
@@ -752,7 +753,7 @@ def generate_enemies(world_distance):
                 add("Cell", 0, 2)
 
     elif world_distance < 30:
-        choice = randint(1, 150)
+        choice = rng.world.randint(1, 150)
         if choice <= 20:
             add("BubbleBomber", 2, 3)
             add("Spider", 2, 2)
@@ -837,7 +838,7 @@ def generate_enemies(world_distance):
                 add("Bug", 1, 3)
 
     elif world_distance < 35:
-        choice = randint(1, 160)
+        choice = rng.world.randint(1, 160)
         if choice <= 20:
             add("SmallPropeller", 1, 2)
             add("Ant", 2, 3)
@@ -921,11 +922,11 @@ def generate_enemies(world_distance):
             add("Ameba", 0, 1)
 
     elif world_distance >= 35:
-        choice = randint(1, 158)
+        choice = rng.world.randint(1, 158)
         if choice <= 15:
             add("Infusoria", 0, 3)
             for _ in range(3):
-                choice_2 = randint(1, 15)
+                choice_2 = rng.world.randint(1, 15)
                 if choice_2 == 1:
                     add("LargeMachineGunner", 1, 1)
                 elif choice_2 == 2:
@@ -1209,7 +1210,7 @@ class BubbleTanksWorld:
             world_distance = round(sqrt(room[0] ** 2 + room[1] ** 2))
             help_chance = 0
             if self.player.is_help_needed:
-                help_chance = uniform(0, 100)
+                help_chance = rng.world.uniform(0, 100)
             if help_chance > 50:
                 enemies = generate_help(world_distance)
             else:
@@ -0,0 +1,41 @@
+from typing import NamedTuple
+import pygame as pg
+
+from data.bullets import BULLETS
+from components.circle import circle_template
+from components.simple_body import Body
+
+
+class BulletSpec(NamedTuple):
+    """Immutable description of a kind of bullet compiled from its data.
+    Every bullet refers to the spec of its kind, and bullets of the same
+    kind share its circle template or its prebuilt sprite.
+    """
+    name: str
+    radius: float
+    size: float
+    hit_effect: str
+    template: tuple
+    sprite: pg.Surface
+
+    def make_body(self, bullet, screen_rect):
+        """Returns the body of a new bullet: the shared sprite
+        or a new body made from the circle template.
+        """
+        if self.template is None:
+            return self.sprite
+        return Body(bullet, screen_rect, self.template)
+
+
+def _compile_spec(name, data) -> BulletSpec:
+    if isinstance(data["circles"], pg.Surface):
+        template, sprite = None, data["circles"]
+    else:
+        template, sprite = tuple(circle_template(circle) for circle in data["circles"]), None
+    return BulletSpec(name, data["radius"], data["size"], data["hit effect"], template, sprite)
+
+
+BULLET_SPECS = {name: _compile_spec(name, data) for name, data in BULLETS.items()}
+
+
+__all__ = ["BulletSpec", "BULLET_SPECS"]
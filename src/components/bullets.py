@@ -1,28 +1,41 @@
-from math import cos, sin, pi, hypot
-from random import uniform
+from math import cos, sin, pi, hypot, atan2
 import pygame as pg
-from itertools import chain
 
 from assets.paths import ENEMY_DEATH
 from data.constants import *
-from data.bullets import BULLETS
+from components.bullet_specs import BULLET_SPECS
 from components.special_effects import add_effect
-from components.simple_body import Body
 from components.utils import *
+from components.rng import rng
+from components.object_pool import bullet_pool
+from components.spatial_index import MOBS, SEEKERS
 from components.special_effects import sapper_surfaces
+from components.render_queue import render_queue
 
 
 class Bullet:
     """ a parent class for all bullets classes """
-    def __init__(self, name, screen_rect, x, y, damage, vel, angle):
+    __slots__ = ("spec", "x", "y", "angle", "radius", "rect", "screen_rect", "VELOCITY",
+                 "vel_x", "vel_y", "damage", "hit_effect", "killed", "body")
+    # Straight bullets move uniformly and rectilinearly, and their shape
+    # depends only on their position, so they are updated all at once
+    # by 'update_bullets' instead of their own 'update' method.
+    straight = False
+    # Homing bullets steer towards their targets, and their steering
+    # is done for all of them at once by 'update_seekers'.
+    homing = False
+    # Pooled bullets are recycled by 'make_bullet' after they are killed.
+    pooled = False
+
+    def __init__(self, spec, screen_rect, x, y, damage, vel, angle):
+        self.spec = spec
         self.x = x
         self.y = y
 
         self.angle = angle
-        self.radius = BULLETS[name]["radius"]
+        self.radius = spec.radius
 
-        rect_size = BULLETS[name]["size"]
-        self.rect = pg.Rect(0, 0, rect_size, rect_size)
+        self.rect = pg.Rect(0, 0, spec.size, spec.size)
         self.rect.center = x, y
         self.screen_rect = screen_rect
 
@@ -31,14 +44,26 @@ class Bullet:
         self.vel_y = -vel * sin(angle)
 
         self.damage = damage
-        self.hit_effect = BULLETS[name]["hit effect"]
+        self.hit_effect = spec.hit_effect
         self.killed = False
+        self.body = spec.make_body(self, screen_rect)
 
-        body_data = BULLETS[name]["circles"]
-        if isinstance(body_data, pg.Surface):
-            self.body = body_data
-        else:
-            self.body = Body(self, screen_rect, body_data)
+    def reset(self, x, y, damage, vel, angle):
+        """Re-initializes a recycled bullet as if it was just created. """
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.rect.center = x, y
+        self.VELOCITY = vel
+        self.vel_x = vel * cos(angle)
+        self.vel_y = -vel * sin(angle)
+        self.damage = damage
+        self.killed = False
+        self.body.reset()
+
+    @property
+    def name(self):
+        return self.spec.name
 
     @property
     def is_outside(self):
@@ -67,6 +92,10 @@ class Bullet:
         if self.is_on_screen:
             self.body.update_shape(dt)
 
+    def update_state(self, dt):
+        """Updates everything except the position and the shape. """
+        pass
+
     def move(self, dx, dy):
         self.x += dx
         self.y += dy
@@ -79,15 +108,17 @@ class Bullet:
 
 class RegularBullet(Bullet):
     """ A bullet with uniform rectilinear motion """
-    def __init__(self, name, screen_rect, x, y, damage, vel, angle):
-        super().__init__(name, screen_rect, x, y, damage, vel, angle)
+    __slots__ = ()
+    straight = True
+    pooled = True
 
-    def update_color(self, dt):
-        pass
+    def __init__(self, spec, screen_rect, x, y, damage, vel, angle):
+        super().__init__(spec, screen_rect, x, y, damage, vel, angle)
 
     def update(self, dt):
         self.update_pos(dt)
         self.update_shape(dt)
+        self.update_state(dt)
 
 
 class ExplodingBullet(RegularBullet):
@@ -96,8 +127,11 @@ class ExplodingBullet(RegularBullet):
      from contact with the enemy, damaging others.
 
     """
+    __slots__ = ("colors", "color_switch", "T", "color_time", "explosion_radius")
+    pooled = False
+
     def __init__(self, screen_rect, x, y, angle):
-        super().__init__("big light red", screen_rect, x, y, -21, HF(1.1), angle)
+        super().__init__(BULLET_SPECS["big light red"], screen_rect, x, y, -21, HF(1.1), angle)
         self.hit_effect = 'DamageBurstLarge'
         self.colors = {1: LIGHT_RED, -1: LIGHT_RED_2}
         self.color_switch = 1
@@ -109,8 +143,7 @@ class ExplodingBullet(RegularBullet):
         self.color_switch *= -1
         self.body.circles[0].color = self.colors[self.color_switch]
 
-    def update(self, dt):
-        super().update(dt)
+    def update_state(self, dt):
         self.color_time += dt
         if self.color_time >= 0.75 * self.T and self.color_switch == 1:
             self.change_color()
@@ -121,15 +154,17 @@ class ExplodingBullet(RegularBullet):
 
 class Mine(Bullet):
     """Mine doesn't move and deals damage to a tank that moved too close. """
-    def __init__(self, name, screen_rect, x, y, damage, vel, angle):
-        super().__init__(name, screen_rect, x, y, damage, vel, angle)
+    __slots__ = ("colors", "color_switch", "T", "color_time")
+
+    def __init__(self, spec, screen_rect, x, y, damage, vel, angle):
+        super().__init__(spec, screen_rect, x, y, damage, vel, angle)
 
-        self.body.rotate(uniform(0, 2 * pi))
+        self.body.rotate(rng.vfx.uniform(0, 2 * pi))
         self.body.update_shape(0)
         self.colors = {1: self.body.circles[0].color, -1: LIGHT_RED_2}
         self.color_switch = 1
         self.T = 240
-        self.color_time = uniform(0, self.T)
+        self.color_time = rng.vfx.uniform(0, self.T)
 
     def update_shape(self, dt):
         self.color_time += dt
@@ -155,8 +190,11 @@ class AllyOrbitalSeeker(Bullet):
     bullet starts moving evenly and rectilinearly to a target's position.
 
     """
+    __slots__ = ("game", "owner", "orbiting", "orbiting_radius", "orbiting_angle",
+                 "search_radius")
+
     def __init__(self, game, screen_rect, x, y):
-        super().__init__("orbital seeker", screen_rect, x, y, -5, HF(1.68), 0)
+        super().__init__(BULLET_SPECS["orbital seeker"], screen_rect, x, y, -5, HF(1.68), 0)
         self.game = game
         self.owner = game.player
         self.orbiting = True
@@ -174,16 +212,16 @@ class AllyOrbitalSeeker(Bullet):
             super().update_pos(dt)
 
     def check_targets(self):
-        for enemy in chain(self.game.room.mobs, self.game.room.seekers):
-            if circle_collidepoint(self.x, self.y, self.search_radius+enemy.radius, enemy.x, enemy.y):
-                self.orbiting = False
-                predicted_time = hypot(self.x - enemy.x, self.y - enemy.y) / self.VELOCITY
-                x = enemy.x + enemy.vel_x * predicted_time
-                y = enemy.y + enemy.vel_y * predicted_time
-                angle = calculate_angle(self.x, self.y, x, y)
-                self.update_vel(angle)
-                self.owner.bullets.append(self)
-                break
+        enemy = next(self.game.spatial_index.within_radius(
+            self.x, self.y, self.search_radius, MOBS | SEEKERS, touching=True), None)
+        if enemy is not None:
+            self.orbiting = False
+            predicted_time = hypot(self.x - enemy.x, self.y - enemy.y) / self.VELOCITY
+            x = enemy.x + enemy.vel_x * predicted_time
+            y = enemy.y + enemy.vel_y * predicted_time
+            angle = calculate_angle(self.x, self.y, x, y)
+            self.update_vel(angle)
+            self.owner.bullets.append(self)
 
     def update(self, dt):
         self.update_pos(dt)
@@ -195,8 +233,11 @@ class AllyOrbitalSeeker(Bullet):
 class Seeker(Bullet):
     """ A bullet which moves with constant velocity and follows a moving target.
         Therefore, the x- and y-components of velocity are changing. """
-    def __init__(self, game, name, screen_rect, x, y, start_angle, rotation_speed, damage, vel):
-        super().__init__(name, screen_rect, x, y, damage, vel, start_angle)
+    __slots__ = ("game", "rotation_speed", "target")
+    homing = True
+
+    def __init__(self, game, spec, screen_rect, x, y, start_angle, rotation_speed, damage, vel):
+        super().__init__(spec, screen_rect, x, y, damage, vel, start_angle)
         self.game = game
         self.rotation_speed = rotation_speed
         self.target = None
@@ -204,8 +245,8 @@ class Seeker(Bullet):
     def receive_damage(self, damage):
         self.killed = True
 
-    def closest_target(self, targets):
-        return min(targets, key=lambda t: hypot(self.x - t.x, self.y - t.y))
+    def closest_target(self, groups, filter=None):
+        return self.game.spatial_index.nearest(self.x, self.y, groups, filter)
 
     def update_angle(self, dt):
         if self.target is None:
@@ -227,9 +268,8 @@ class Seeker(Bullet):
 
     def update_target(self):
         if self.target is None or self.target.killed:
-            if self.game.room.mobs or self.game.room.seekers:
-                self.target = self.closest_target(chain(self.game.room.mobs, self.game.room.seekers))
-            else:
+            self.target = self.closest_target(MOBS | SEEKERS)
+            if self.target is None:
                 self.killed = True
                 add_effect(self.hit_effect, self.game.room.top_effects, self.x, self.y)
 
@@ -240,17 +280,19 @@ class Seeker(Bullet):
 
     def update(self, dt):
         self.update_target()
-        if self.killed:
-            return
-        self.update_angle(dt)
-        self.update_vel(self.angle)
-        self.update_pos(dt)
-        self.update_shape(dt)
+        if not self.killed:
+            self.update_angle(dt)
+            self.update_vel(self.angle)
+            self.update_pos(dt)
+            self.update_shape(dt)
+        self.update_state(dt)
 
 
 class EnemySeeker(Seeker):
-    def __init__(self, game, name, screen_rect, x, y, start_angle, rotation_speed, damage, vel):
-        super().__init__(game, name, screen_rect, x, y, start_angle, rotation_speed, damage, vel)
+    __slots__ = ("sticky", "stunned")
+
+    def __init__(self, game, spec, screen_rect, x, y, start_angle, rotation_speed, damage, vel):
+        super().__init__(game, spec, screen_rect, x, y, start_angle, rotation_speed, damage, vel)
         self.target = game.player
         self.sticky = False
         self.stunned = False
@@ -264,14 +306,16 @@ class EnemySeeker(Seeker):
 
     def receive_damage(self, damage):
         self.killed = True
-        add_effect("RedCircle", self.game.room.top_effects, self.x, self.y)
+        self.game.events.add_effect("RedCircle", self.game.room.top_effects, self.x, self.y)
         self.game.sound_player.play_sound(ENEMY_DEATH)
 
 
 class EnemyOrbitalSeeker(EnemySeeker):
-    def __init__(self, owner, name, screen_rect, x, y,
+    __slots__ = ("owner", "orbiting", "orbiting_radius", "orbiting_angle", "action_radius")
+
+    def __init__(self, owner, spec, screen_rect, x, y,
                  start_angle, maneuvering_angle, damage):
-        super().__init__(owner.game, name, screen_rect, x, y, start_angle,
+        super().__init__(owner.game, spec, screen_rect, x, y, start_angle,
                          maneuvering_angle, damage, HF(0.42))
         self.owner = owner
         self.orbiting = True
@@ -279,6 +323,10 @@ class EnemyOrbitalSeeker(EnemySeeker):
         self.orbiting_angle = start_angle
         self.action_radius = HF(160) + self.target.radius
 
+    @property
+    def homing(self):
+        return not self.orbiting
+
     def update(self, dt):
         if self.owner.killed and self.orbiting:
             self.killed = True
@@ -300,35 +348,50 @@ class EnemyOrbitalSeeker(EnemySeeker):
 
 
 class AllyInfector(Seeker):
+    __slots__ = ()
+
     def __init__(self, game, screen_rect, x, y, start_angle):
-        super().__init__(game, "ally infector", screen_rect, x, y, start_angle, 0.0072,  -1, HF(0.72))
+        super().__init__(game, BULLET_SPECS["ally infector"], screen_rect, x, y, start_angle, 0.0072,  -1, HF(0.72))
 
-    def eval_enemy(self, enemy):
-        if not enemy.infected:
-            if not enemy.chasing_infectors:
-                return hypot(self.x - enemy.x, self.y - enemy.y)
-            return hypot(self.x - enemy.x, self.y - enemy.y) + 100000
-        return hypot(self.x - enemy.x, self.y - enemy.y) + 200000
+    @staticmethod
+    def is_free(enemy):
+        return not enemy.infected and not enemy.chasing_infectors
+
+    @staticmethod
+    def is_not_infected(enemy):
+        return not enemy.infected
 
     def update_target(self):
+        """The closest enemy that is neither infected nor chased by other infectors
+        is preferred, then the closest not infected enemy, then any closest enemy.
+        """
         if self.target is None or self.target.killed:
             if self.game.room.mobs:
-                self.target = min(self.game.room.mobs, key=self.eval_enemy)
+                for filter in (self.is_free, self.is_not_infected, None):
+                    self.target = self.closest_target(MOBS, filter)
+                    if self.target is not None:
+                        break
                 self.target.chasing_infectors.add(self)
             elif self.game.room.seekers:
-                self.target = self.closest_target(self.game.room.seekers)
+                self.target = self.closest_target(SEEKERS)
             else:
                 self.killed = True
                 add_effect(self.hit_effect, self.game.room.top_effects, self.x, self.y)
 
 
 class EnemyLeecher(EnemySeeker):
-    def __init__(self, player, name, screen_rect, x, y, start_angle, rotation_speed, damage, vel):
-        super().__init__(player.game, name, screen_rect, x, y, start_angle, rotation_speed, damage, vel)
+    __slots__ = ("leeching", "leech_time", "leech_cooldown")
+
+    def __init__(self, player, spec, screen_rect, x, y, start_angle, rotation_speed, damage, vel):
+        super().__init__(player.game, spec, screen_rect, x, y, start_angle, rotation_speed, damage, vel)
         self.leeching = False
         self.leech_time = 0
         self.leech_cooldown = 450
 
+    @property
+    def homing(self):
+        return not self.leeching
+
     def update(self, dt):
         if self.leeching:
             self.angle = calculate_angle(self.x, self.y, self.target.x, self.target.y)
@@ -342,6 +405,9 @@ class EnemyLeecher(EnemySeeker):
             super().update(dt)
 
     def draw_beam(self, surface, dx, dy):
+        render_queue.draw(surface, self.draw_beam_lines, dx, dy)
+
+    def draw_beam_lines(self, surface, dx, dy):
         start_pos = (SCR_W2, SCR_H2)
         end_pos = (round(self.x - dx), round(self.y - dy))
         pg.draw.line(surface, PINK, start_pos, end_pos, H(10))
@@ -354,8 +420,10 @@ class EnemyLeecher(EnemySeeker):
 
 
 class EnemySapper(EnemySeeker):
-    def __init__(self, owner, game, name, screen_rect, x, y, start_angle, rotation_speed, damage, vel):
-        super().__init__(game, name, screen_rect, x, y, start_angle, rotation_speed, damage, vel)
+    __slots__ = ("owner", "player", "going_to_player", "halo_time", "time_to_hold_attack")
+
+    def __init__(self, owner, game, spec, screen_rect, x, y, start_angle, rotation_speed, damage, vel):
+        super().__init__(game, spec, screen_rect, x, y, start_angle, rotation_speed, damage, vel)
         self.owner = owner
         self.player = game.player
         self.going_to_player = True
@@ -370,8 +438,7 @@ class EnemySapper(EnemySeeker):
     def can_attack(self):
         return self.going_to_player and self.time_to_hold_attack == 0
 
-    def update(self, dt):
-        super().update(dt)
+    def update_state(self, dt):
         if self.owner.killed:
             self.killed = True
         elif self.going_to_player:
@@ -390,7 +457,7 @@ class EnemySapper(EnemySeeker):
     def draw_fullness_effect(self, surface, dx, dy):
         index = int(18 * self.halo_time / 540)
         pos = self.body.circles[0].x - dx - H(27.5), self.body.circles[0].y - dy - H(27.5)
-        surface.blit(sapper_surfaces[index], pos)
+        render_queue.blit(surface, sapper_surfaces[index], pos)
 
     def draw(self, surface, dx, dy):
         if self.is_on_screen:
@@ -400,8 +467,11 @@ class EnemySapper(EnemySeeker):
 
 
 class LeecherBullet(Bullet):
+    __slots__ = ()
+    straight = True
+
     def __init__(self, screen_rect, x, y, damage, vel, angle):
-        super().__init__("leecher bullet", screen_rect, x, y, damage, vel, angle)
+        super().__init__(BULLET_SPECS["leecher bullet"], screen_rect, x, y, damage, vel, angle)
         self.body.angle = angle
 
     def update(self, dt):
@@ -410,10 +480,11 @@ class LeecherBullet(Bullet):
 
 
 class Drone(Bullet):
-    def __init__(self, name, screen_rect, x, y, damage, vel, angle, player):
-        super().__init__(name, screen_rect, x, y, damage, vel, angle)
+    __slots__ = ("player", "time", "mitosis_time")
+
+    def __init__(self, spec, screen_rect, x, y, damage, vel, angle, player):
+        super().__init__(spec, screen_rect, x, y, damage, vel, angle)
         self.player = player
-        self.name = name
         self.time = 0
         self.mitosis_time = 300
         self.body.angle = angle
@@ -421,7 +492,7 @@ class Drone(Bullet):
     def divide(self):
         self.killed = True
         if self.name == "tiny drone":
-            seeker = Seeker(self.player.game, "tiny drone", self.screen_rect,
+            seeker = Seeker(self.player.game, BULLET_SPECS["tiny drone"], self.screen_rect,
                             self.x, self.y, self.body.angle, 0.009, -7, HF(0.9))
             seeker.update(0)
             self.player.seekers.append(seeker)
@@ -433,8 +504,8 @@ class Drone(Bullet):
             else:
                 child_name = "tiny drone"
             for k in (-1, 1):
-                angle = self.body.angle + k * uniform(0.2*pi, 0.8*pi)
-                drone = Drone(child_name, self.screen_rect,
+                angle = self.body.angle + k * rng.ai.uniform(0.2*pi, 0.8*pi)
+                drone = Drone(BULLET_SPECS[child_name], self.screen_rect,
                               self.x, self.y, 0, HF(0.6), angle, self.player)
                 drone.update(0)
                 self.player.drones.append(drone)
@@ -454,8 +525,10 @@ class Drone(Bullet):
 
 class PierceShot(Bullet):
     """ A bullet that can pass through many enemies. """
+    __slots__ = ("attacked_mobs",)
+
     def __init__(self, screen_rect, x, y, damage, vel, angle):
-        super().__init__("sniper bullet", screen_rect, x, y, damage, vel, angle)
+        super().__init__(BULLET_SPECS["sniper bullet"], screen_rect, x, y, damage, vel, angle)
         self.body = pg.transform.rotate(self.body, angle * 180 / pi)
         self.x = x - self.body.get_width() / 2
         self.y = y - self.body.get_height() / 2
@@ -478,10 +551,12 @@ class PierceShot(Bullet):
 
     def draw(self, surface, dx, dy):
         if self.is_on_screen:
-            surface.blit(self.body, (round(self.x - dx), round(self.y - dy)))
+            render_queue.blit(surface, self.body, (round(self.x - dx), round(self.y - dy)))
 
 
 class ExplosivePierceShot(PierceShot):
+    __slots__ = ("explosion_radius",)
+
     def __init__(self, screen_rect, x, y, damage, vel, angle):
         super().__init__(screen_rect, x, y, damage, vel, angle)
         self.hit_effect = 'DamageBurst'
@@ -494,8 +569,11 @@ class FrangibleBullet(Bullet):
      If bullet collides with an object before fragmentation_time, it deals
      damage as a regular bullet and then disappears.
     """
+    __slots__ = ("time", "fragmentation_time", "player")
+    straight = True
+
     def __init__(self, player, screen_rect, x, y, angle):
-        super().__init__("big light red", screen_rect, x, y, -20, HF(0.8), angle)
+        super().__init__(BULLET_SPECS["big light red"], screen_rect, x, y, -20, HF(0.8), angle)
         self.time = 0
         self.fragmentation_time = 1000
         self.player = player
@@ -503,6 +581,9 @@ class FrangibleBullet(Bullet):
     def update(self, dt):
         self.update_pos(dt)
         self.update_shape(dt)
+        self.update_state(dt)
+
+    def update_state(self, dt):
         self.time = min(self.fragmentation_time, self.time + dt)
         if self.time == self.fragmentation_time:
             self.killed = True
@@ -512,35 +593,151 @@ class FrangibleBullet(Bullet):
 
 
 class BulletBuster(RegularBullet):
-    def __init__(self, name, screen_rect, x, y, damage, vel, angle):
-        super().__init__(name, screen_rect, x, y, damage, vel, angle)
+    __slots__ = ()
+
+    def __init__(self, spec, screen_rect, x, y, damage, vel, angle):
+        super().__init__(spec, screen_rect, x, y, damage, vel, angle)
+
+
+def make_bullet(bullet_type, spec, screen_rect, x, y, damage, vel, angle):
+    """Returns a new bullet of the given type and spec. A bullet of a pooled type
+    is taken from the pool of killed bullets with the same name if possible.
+    """
+    if bullet_type.pooled:
+        bullet = bullet_pool.acquire((bullet_type, spec.name))
+        if bullet is not None:
+            bullet.reset(x, y, damage, vel, angle)
+            return bullet
+    return bullet_type(spec, screen_rect, x, y, damage, vel, angle)
+
+
+def update_bullets(bullets, dt):
+    """Updates all bullets of the entity list in the same way as their 'update'
+    methods and removes killed bullets from the list. Killed bullets
+    of pooled types are released to the pool.
+
+    Straight bullets are moved in one pass, then the ones on screen are found
+    with a single 'collidelistall' call and their shapes are updated, and
+    only then their own state is updated. Since a straight bullet moves
+    independently of others, this gives the same result as updating
+    the bullets one by one. Bullets appended to the list during the update
+    are updated too, as when the list is iterated.
+    """
+    straight = []
+    for bullet in bullets:
+        if bullet.straight:
+            straight.append(bullet)
+        else:
+            bullet.update(dt)
+    if straight:
+        for bullet in straight:
+            x = bullet.x = bullet.x + bullet.vel_x * dt
+            y = bullet.y = bullet.y + bullet.vel_y * dt
+            bullet.rect.center = x, y
+            if hypot(x - SCR_W2, y - SCR_H2) > ROOM_RADIUS:
+                bullet.killed = True
+        screen_rect = straight[0].screen_rect
+        for i in screen_rect.collidelistall([bullet.rect for bullet in straight]):
+            straight[i].body.update_shape(dt)
+        n_bullets = len(bullets)
+        for bullet in straight:
+            bullet.update_state(dt)
+        for i in range(n_bullets, len(bullets)):
+            bullets[i].update(dt)
+
+    for bullet in bullets:
+        if bullet.killed and bullet.pooled:
+            bullet_pool.release((type(bullet), bullet.spec.name), bullet)
+    bullets.compact()
+
+
+def release_bullets(bullets):
+    """Releases bullets of pooled types to the pool before the list is cleared. """
+    for bullet in bullets:
+        if bullet.pooled:
+            bullet_pool.release((type(bullet), bullet.spec.name), bullet)
+
+
+def release_seekers(seekers):
+    """Kills seekers removed from their list, so that the guns which spawned
+    them can spawn new ones, and enemies chased by evicted infectors
+    can be chosen as targets by other infectors again.
+    """
+    for seeker in seekers:
+        seeker.killed = True
+        if isinstance(seeker, AllyInfector):
+            chasing_infectors = getattr(seeker.target, "chasing_infectors", None)
+            if chasing_infectors is not None:
+                chasing_infectors.discard(seeker)
+
+
+def update_seekers(seekers, dt):
+    """Updates all seekers of the list in the same way as their 'update' methods.
+
+    Targets of homing seekers are updated first, in the order of the list.
+    Then all homing seekers that are still alive are steered to their
+    targets, moved and reshaped in one pass, and finally their own state
+    is updated. Steering of a seeker depends only on its target, and
+    targets don't move while seekers are updated, so this gives the same
+    result as updating the seekers one by one.
+    """
+    homing = []
+    for seeker in seekers:
+        if seeker.homing:
+            seeker.update_target()
+            homing.append(seeker)
+        else:
+            seeker.update(dt)
+    if not homing:
+        return
+    for seeker in homing:
+        if seeker.killed:
+            continue
+        angle = seeker.angle
+        target = seeker.target
+        if target is not None:
+            angle_to_target = atan2(seeker.y - target.y, target.x - seeker.x)
+            max_rotation = seeker.rotation_speed * dt
+            if abs(angle_to_target - angle) > pi:
+                rotation = -max_rotation if angle_to_target > angle else max_rotation
+            elif angle_to_target > angle:
+                rotation = min(angle_to_target - angle, max_rotation)
+            else:
+                rotation = max(angle_to_target - angle, -max_rotation)
+            angle = (angle + rotation + pi) % (2*pi) - pi
+            seeker.angle = seeker.body.angle = angle
+        vel = seeker.VELOCITY
+        vel_x = seeker.vel_x = vel * cos(angle)
+        vel_y = seeker.vel_y = -vel * sin(angle)
+        x = seeker.x = seeker.x + vel_x * dt
+        y = seeker.y = seeker.y + vel_y * dt
+        seeker.rect.center = x, y
+        seeker.update_shape(dt)
+    n_seekers = len(seekers)
+    for seeker in homing:
+        seeker.update_state(dt)
+    for i in range(n_seekers, len(seekers)):
+        seekers[i].update(dt)
+
+
+BULLET_CLASSES = {
+    "regular bullet": RegularBullet,
+    "mine": Mine,
+    "pierce shot": PierceShot,
+    "explosive pierce shot": ExplosivePierceShot,
+    "leecher bullet": LeecherBullet,
+    "drone": Drone,
+    "seeker": Seeker,
+    "enemy seeker": EnemySeeker,
+    "enemy leecher": EnemyLeecher,
+    "enemy orbital seeker": EnemyOrbitalSeeker,
+    "enemy sapper": EnemySapper,
+    "bullet buster": BulletBuster,
+}
 
 
 def get_bullet_type(bullet_type: str):
-    if bullet_type == "regular bullet":
-        return RegularBullet
-    if bullet_type == "mine":
-        return Mine
-    if bullet_type == "pierce shot":
-        return PierceShot
-    if bullet_type == "explosive pierce shot":
-        return ExplosivePierceShot
-    if bullet_type == "leecher bullet":
-        return LeecherBullet
-    if bullet_type == "drone":
-        return Drone
-    if bullet_type == "seeker":
-        return Seeker
-    if bullet_type == "enemy seeker":
-        return EnemySeeker
-    if bullet_type == "enemy leecher":
-        return EnemyLeecher
-    if bullet_type == "enemy orbital seeker":
-        return EnemyOrbitalSeeker
-    if bullet_type == "enemy sapper":
-        return EnemySapper
-    if bullet_type == "bullet buster":
-        return BulletBuster
+    return BULLET_CLASSES.get(bullet_type)
 
 
 __all__ = [
@@ -561,6 +758,11 @@ __all__ = [
     "Drone",
     "EnemyOrbitalSeeker",
     "AllyInfector",
+    "make_bullet",
+    "update_bullets",
+    "release_bullets",
+    "release_seekers",
+    "update_seekers",
     "get_bullet_type"
 
 ]
@@ -1,7 +1,6 @@
-from random import uniform
-
 from data.constants import *
 from .utils import *
+from .rng import rng
 
 
 class Camera:
@@ -31,8 +30,8 @@ class Camera:
 
     def update(self, player_x, player_y, dt):
         if self.shaking:
-            self.shaking_dx = uniform(-HF(0.9), HF(0.9)) * dt
-            self.shaking_dy = uniform(-HF(0.9), HF(0.9)) * dt
+            self.shaking_dx = rng.ai.uniform(-HF(0.9), HF(0.9)) * dt
+            self.shaking_dy = rng.ai.uniform(-HF(0.9), HF(0.9)) * dt
             self.shaking_time += dt
             if self.shaking_time >= self.shaking_duration:
                 self.stop_shaking()
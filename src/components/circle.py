@@ -1,12 +1,16 @@
 from math import cos, sin, pi
-from random import uniform
 import pygame as pg
 
 from data.constants import *
 from components.utils import HF
+from components.rng import rng
+from components.sprite_cache import circle_sprites, baked_sprites
+from components.render_queue import render_queue
 
 
 class StaticGlare:
+    __slots__ = ("x", "y", "radius", "color", "x_offset", "y_offset")
+
     def __init__(self, color, angle, circle_radius, radius_coeff, offset_factor):
         self.x = 0
         self.y = 0
@@ -24,6 +28,9 @@ class StaticGlare:
 
 
 class StaticCircle:
+    __slots__ = ("x", "y", "distance", "angle", "screen_rect", "rect", "color", "edge_color",
+                 "radius", "edge", "glares")
+
     def __init__(self, screen_rect, color, radius, edge_factor, distance, angle, glares_angle):
         self.x = 0
         self.y = 0
@@ -55,6 +62,9 @@ class StaticCircle:
         self.rect.center = self.x, self.y
 
     def draw(self, screen, dx, dy):
+        render_queue.draw(screen, self.draw_shapes, dx, dy)
+
+    def draw_shapes(self, screen, dx, dy):
         pos = round(self.x - dx), round(self.y - dy)
         pg.draw.circle(screen, self.edge_color, pos, self.radius)
         pg.draw.circle(screen, self.color, pos, self.radius - self.edge)
@@ -65,6 +75,8 @@ class StaticCircle:
 
 class Glare:
     """Glare of a circle. Each circle has 4 glares. """
+    __slots__ = ("x", "y", "radius", "color", "angle", "radius_coeff", "offset_factor")
+
     def __init__(self, color, angle, radius_coeff, offset_factor):
         self.x = 0
         self.y = 0
@@ -74,6 +86,17 @@ class Glare:
         self.radius_coeff = radius_coeff
         self.offset_factor = offset_factor
 
+    def clone(self):
+        glare = Glare.__new__(Glare)
+        glare.x = self.x
+        glare.y = self.y
+        glare.radius = self.radius
+        glare.color = self.color
+        glare.angle = self.angle
+        glare.radius_coeff = self.radius_coeff
+        glare.offset_factor = self.offset_factor
+        return glare
+
     def move(self, dx, dy):
         self.x += dx
         self.y += dy
@@ -88,6 +111,9 @@ class Glare:
 
 
 class Circle:
+    __slots__ = ("x", "y", "radius", "max_radius", "screen_rect", "rect", "edge", "distance",
+                 "angle", "edge_color", "color", "glares", "glares_angle")
+
     def __init__(self, screen_rect, color, radius, edge_factor, distance, angle, scale=1, edge_color=WHITE):
         self.x = 0
         self.y = 0
@@ -100,6 +126,7 @@ class Circle:
         self.angle = angle
         self.edge_color = edge_color
         self.color = color
+        self.glares_angle = 0
 
         k = pi if angle >= 0 else -pi
         b = pi if angle != 0 else 0
@@ -110,6 +137,30 @@ class Circle:
             Glare(GLARE_COLORS[self.color][1], b - 0.5 * k, 0.18, 0.52)
         )
 
+    def reset(self):
+        """Restores the initial state of a circle of a recycled object. """
+        self.radius = self.max_radius
+
+    def clone(self, screen_rect):
+        """Returns a copy of a circle that was never updated, drawing
+        the same random numbers as a new circle would draw.
+        """
+        circle = object.__new__(type(self))
+        circle.x = self.x
+        circle.y = self.y
+        circle.radius = self.radius
+        circle.max_radius = self.max_radius
+        circle.screen_rect = screen_rect
+        circle.rect = self.rect.copy()
+        circle.edge = self.edge
+        circle.distance = self.distance
+        circle.angle = self.angle
+        circle.edge_color = self.edge_color
+        circle.color = self.color
+        circle.glares = tuple([glare.clone() for glare in self.glares])
+        circle.glares_angle = self.glares_angle
+        return circle
+
     def become_infected(self):
         if self.color not in INFECTION_COLORS:
             return
@@ -123,7 +174,9 @@ class Circle:
         return self.rect.colliderect(self.screen_rect)
 
     def update_glares(self, angle_to_target):
-        angle = self.angle + angle_to_target
+        angle = self.glares_angle = self.angle + angle_to_target
+        if circle_sprites.enabled and self.radius < circle_sprites.max_radius:
+            return
         radius = self.radius - self.edge
         if self.radius >= 6:
             for glare in self.glares:
@@ -140,6 +193,14 @@ class Circle:
         self.update_glares(angle_to_target)
 
     def draw(self, surface, dx=0, dy=0):
+        r = round(self.radius)
+        if circle_sprites.enabled and r <= circle_sprites.max_radius:
+            sprite = circle_sprites.get(self, r, self.radius >= 6)
+            render_queue.blit(surface, sprite, (round(self.x - dx) - r, round(self.y - dy) - r))
+        else:
+            render_queue.draw(surface, self.draw_shapes, dx, dy)
+
+    def draw_shapes(self, surface, dx, dy):
         r = round(self.radius)
         pos = round(self.x - dx), round(self.y - dy)
         pg.draw.circle(surface, self.edge_color, pos, r)
@@ -150,13 +211,27 @@ class Circle:
 
 
 class ScalingCircle(Circle):
+    __slots__ = ("phase", "phase_speed", "amplitude")
+
     def __init__(self, screen_rect, color, radius, edge_factor,
                  amplitude_factor, distance, angle, scale=1, edge_color=WHITE):
         super().__init__(screen_rect, color, radius, edge_factor, distance, angle, scale=scale, edge_color=edge_color)
-        self.phase = uniform(0, 1)
-        self.phase_speed = uniform(0.0019, 0.0023)
+        self.phase = rng.vfx.uniform(0, 1)
+        self.phase_speed = rng.vfx.uniform(0.0019, 0.0023)
         self.amplitude = amplitude_factor * self.radius
 
+    def reset(self):
+        super().reset()
+        self.phase = rng.vfx.uniform(0, 1)
+        self.phase_speed = rng.vfx.uniform(0.0019, 0.0023)
+
+    def clone(self, screen_rect):
+        circle = super().clone(screen_rect)
+        circle.phase = rng.vfx.uniform(0, 1)
+        circle.phase_speed = rng.vfx.uniform(0.0019, 0.0023)
+        circle.amplitude = self.amplitude
+        return circle
+
     def update_pos(self, x, y, dt, angle_to_target):
         angle = self.angle + angle_to_target
         self.x = x + self.distance * cos(angle)
@@ -169,6 +244,8 @@ class ScalingCircle(Circle):
 
 
 class LoopingCircle(Circle):
+    __slots__ = ("max_offset", "offsets", "loop_vel", "loop_angle", "loop_rotation")
+
     def __init__(self, screen_rect, distance, angle, loop_angle, scale=1):
         super().__init__(screen_rect, BLUE, HF(16.863), 8/75, distance, angle, scale)
         self.max_offset = HF(39.079) * 6 * scale
@@ -177,6 +254,20 @@ class LoopingCircle(Circle):
         self.loop_angle = loop_angle
         self.loop_rotation = loop_angle
 
+    def reset(self):
+        super().reset()
+        self.offsets = [i * HF(39.079) for i in range(6)]
+        self.loop_rotation = self.loop_angle
+
+    def clone(self, screen_rect):
+        circle = super().clone(screen_rect)
+        circle.max_offset = self.max_offset
+        circle.offsets = self.offsets.copy()
+        circle.loop_vel = self.loop_vel
+        circle.loop_angle = self.loop_angle
+        circle.loop_rotation = self.loop_rotation
+        return circle
+
     @property
     def is_on_screen(self):
         return True
@@ -192,10 +283,25 @@ class LoopingCircle(Circle):
         self.rect.center = self.x, self.y
 
     def update_glares(self, angle_to_target):
+        self.glares_angle = self.loop_rotation
+        if circle_sprites.enabled and self.radius < circle_sprites.max_radius:
+            return
         for glare in self.glares:
             glare.update(self.x, self.y, self.radius - self.edge, self.loop_rotation)
 
     def draw(self, surface, dx=0, dy=0):
+        cosa = cos(self.loop_rotation)
+        sina = sin(self.loop_rotation)
+        r = round(self.radius)
+        if circle_sprites.enabled and r <= circle_sprites.max_radius:
+            sprite = circle_sprites.get(self, r)
+            x, y = self.x - dx - r, self.y - dy - r
+            for offset in self.offsets:
+                render_queue.blit(surface, sprite, (round(x + offset * cosa), round(y - offset * sina)))
+        else:
+            render_queue.draw(surface, self.draw_shapes, dx, dy)
+
+    def draw_shapes(self, surface, dx, dy):
         cosa = cos(self.loop_rotation)
         sina = sin(self.loop_rotation)
         for offset in self.offsets:
@@ -211,6 +317,8 @@ class LoopingCircle(Circle):
 
 
 class SwingingCircle(Circle):
+    __slots__ = ("swing_distance", "swing_distance_max", "swing_angle", "swing_vel")
+
     def __init__(self, screen_rect, color, radius, edge_factor, distance,
                  angle, swing_distance_max, swing_angle, scale=1):
 
@@ -220,6 +328,19 @@ class SwingingCircle(Circle):
         self.swing_angle = swing_angle
         self.swing_vel = self.swing_distance_max / 160
 
+    def reset(self):
+        super().reset()
+        self.swing_distance = 0
+        self.swing_vel = self.swing_distance_max / 160
+
+    def clone(self, screen_rect):
+        circle = super().clone(screen_rect)
+        circle.swing_distance = self.swing_distance
+        circle.swing_distance_max = self.swing_distance_max
+        circle.swing_angle = self.swing_angle
+        circle.swing_vel = self.swing_vel
+        return circle
+
     def update_pos(self, x, y, dt, angle_to_target):
         self.x = x + self.distance * cos(self.angle + angle_to_target)
         self.y = y - self.distance * sin(self.angle + angle_to_target)
@@ -236,11 +357,25 @@ class SwingingCircle(Circle):
 
 
 class RotatingCircle(Circle):
+    __slots__ = ("rot_distance", "start_rot_angle", "rot_angle")
+
     def __init__(self, screen_rect, color, radius, distance, angle, rot_distance, rot_angle, scale=1):
         super().__init__(screen_rect, color, radius, 8/75, distance, angle, scale=scale)
         self.rot_distance = rot_distance * scale
+        self.start_rot_angle = rot_angle
         self.rot_angle = rot_angle
 
+    def reset(self):
+        super().reset()
+        self.rot_angle = self.start_rot_angle
+
+    def clone(self, screen_rect):
+        circle = super().clone(screen_rect)
+        circle.rot_distance = self.rot_distance
+        circle.start_rot_angle = self.start_rot_angle
+        circle.rot_angle = self.rot_angle
+        return circle
+
     def update_pos(self, x, y, dt, angle_to_target):
         self.x = x + self.distance * cos(self.angle + angle_to_target)
         self.y = y - self.distance * sin(self.angle + angle_to_target)
@@ -252,88 +387,185 @@ class RotatingCircle(Circle):
 
 
 class DisplacebleCircle(ScalingCircle):
+    __slots__ = ("dx", "dy")
+
     def __init__(self, screen_rect, color, radius, distance, angle, scale=1):
         super().__init__(screen_rect, color, radius, 8/75, 0.347, distance, angle, scale)
         self.dx = 0
         self.dy = 0
 
+    def reset(self):
+        super().reset()
+        self.dx = 0
+        self.dy = 0
+
+    def clone(self, screen_rect):
+        circle = super().clone(screen_rect)
+        circle.dx = self.dx
+        circle.dy = self.dy
+        return circle
+
     def draw(self, surface, dx=0, dy=0):
         dx -= self.dx
         dy -= self.dy
         super().draw(surface, dx, dy)
 
 
-def make_circle(data, scale=1, screen_rect=None):
+class BakedCircles:
+    """Run of fixed circles of a body drawn with one baked sprite.
+
+    Fixed circles keep their places relative to the body and their radii,
+    so the run is drawn with the sprite of the current angle step of the body
+    anchored at the first circle of the run. The run takes the place of its
+    circles in the list of circles the body draws, so it has the methods
+    a body calls on a circle when drawing it.
+    """
+    __slots__ = ("body", "circles", "key", "colors")
+
+    def __init__(self, body, circles, key):
+        self.body = body
+        self.circles = circles
+        self.key = key
+        self.update_colors()
+
+    def update_colors(self):
+        """Must be called when the colors of the circles change. """
+        self.colors = tuple([circle.color for circle in self.circles])
+
+    @property
+    def is_on_screen(self):
+        for circle in self.circles:
+            if circle.is_on_screen:
+                return True
+        return False
+
+    def update_glares(self, angle_to_target):
+        pass
+
+    def draw(self, surface, dx=0, dy=0):
+        angle = self.body.angle
+        if not baked_sprites.enabled:
+            for circle in self.circles:
+                if circle.is_on_screen:
+                    circle.update_glares(angle)
+                    circle.draw(surface, dx, dy)
+            return
+        sprite, x, y = baked_sprites.get(self, angle)
+        anchor = self.circles[0]
+        render_queue.blit(surface, sprite, (round(anchor.x - dx) - x, round(anchor.y - dy) - y))
+
+
+def bake_circles(body, circles, states) -> list:
+    """Returns the list of parts the body draws for every group of its circles.
+    Runs of consecutive fixed circles of a group within 'max_radius' of the
+    center of the body become 'BakedCircles', and the other circles are drawn
+    one by one. Runs are keyed by the state table, which is shared by all
+    bodies of a type, and the indexes of their circles, so runs shared
+    by several groups or bodies share sprites.
+    """
+    def is_baked(circle):
+        return (type(circle) is Circle and
+                circle.distance + circle.radius <= baked_sprites.max_radius)
+
+    groups = []
+    for group in states.groups:
+        parts = []
+        run = []
+        for i in group + (None,):
+            if i is not None and is_baked(circles[i]):
+                run.append(i)
+                continue
+            if len(run) > 1:
+                parts.append(BakedCircles(body, [circles[j] for j in run], (states, tuple(run))))
+            else:
+                parts.extend([circles[j] for j in run])
+            run = []
+            if i is not None:
+                parts.append(circles[i])
+        groups.append(parts)
+    return groups
+
+
+def circle_template(data, scale=1) -> tuple:
+    """Parses the data of a circle once and returns the class of the circle
+    with the arguments its constructor takes after the screen rect,
+    so that any number of such circles can be made by 'make_circles'.
+    """
     if data["type"] == "scaling":
-        return ScalingCircle(screen_rect, COLORS[data["color"]], HF(data["radius"]),
-                             data["edge factor"], data["amplitude factor"],
-                             HF(data["distance"]), data["angle"], scale=scale)
+        return ScalingCircle, (COLORS[data["color"]], HF(data["radius"]),
+                               data["edge factor"], data["amplitude factor"],
+                               HF(data["distance"]), data["angle"]), {"scale": scale}
 
     if data["type"] == "blue":
-        return ScalingCircle(screen_rect, BLUE, HF(data["radius"]), 8/75, 0.347,
-                             HF(data["distance"]), data["angle"],
-                             scale=scale)
+        return ScalingCircle, (BLUE, HF(data["radius"]), 8/75, 0.347,
+                               HF(data["distance"]), data["angle"]), {"scale": scale}
 
     if data["type"] == "thick_blue":
-        return ScalingCircle(screen_rect, BLUE, HF(data["radius"]), 1/22, 0.177,
-                             HF(data["distance"]), data["angle"],
-                             scale=scale)
+        return ScalingCircle, (BLUE, HF(data["radius"]), 1/22, 0.177,
+                               HF(data["distance"]), data["angle"]), {"scale": scale}
 
     if data["type"] == "orange":
-        return ScalingCircle(screen_rect, ORANGE, HF(data["radius"]), 8/75, 0.347,
-                             HF(data["distance"]), data["angle"],
-                             scale=scale)
+        return ScalingCircle, (ORANGE, HF(data["radius"]), 8/75, 0.347,
+                               HF(data["distance"]), data["angle"]), {"scale": scale}
 
     if data["type"] == "small bubble":
-        return ScalingCircle(screen_rect, BUBBLE_COLOR, HF(13), 8/75, 0.429, 0, 0, scale=scale)
+        return ScalingCircle, (BUBBLE_COLOR, HF(13), 8/75, 0.429, 0, 0), {"scale": scale}
 
     if data["type"] == "medium bubble":
-        return ScalingCircle(screen_rect, BUBBLE_COLOR, HF(16.911), 8/75, 0.429, 0, 0, scale=scale)
+        return ScalingCircle, (BUBBLE_COLOR, HF(16.911), 8/75, 0.429, 0, 0), {"scale": scale}
 
     if data["type"] == "large bubble":
-        return ScalingCircle(screen_rect, BUBBLE_COLOR, HF(23.885), 8/75, 0.112, 0, 0, scale=scale)
+        return ScalingCircle, (BUBBLE_COLOR, HF(23.885), 8/75, 0.112, 0, 0), {"scale": scale}
 
     if data["type"] == "ultra bubble":
-        return ScalingCircle(screen_rect, BUBBLE_COLOR_2, HF(30.764), 8/75, 0.112, 0, 0, scale=scale)
+        return ScalingCircle, (BUBBLE_COLOR_2, HF(30.764), 8/75, 0.112, 0, 0), {"scale": scale}
 
     if data["type"] == "swinging":
         edge_factor = data["edge factor"] if "edge factor" in data else 8/75
-        return SwingingCircle(screen_rect, COLORS[data["color"]], HF(data["radius"]),
-                              edge_factor, HF(data["distance"]), data["angle"],
-                              HF(data["swing distance"]), data["swing angle"],
-                              scale=scale)
+        return SwingingCircle, (COLORS[data["color"]], HF(data["radius"]),
+                                edge_factor, HF(data["distance"]), data["angle"],
+                                HF(data["swing distance"]), data["swing angle"]), {"scale": scale}
 
     if data["type"] == "rotating":
-        return RotatingCircle(screen_rect, COLORS[data["color"]], HF(data["radius"]),
-                              HF(data["distance"]), data["angle"],
-                              HF(data["rot distance"]), data["rot angle"],
-                              scale=scale)
+        return RotatingCircle, (COLORS[data["color"]], HF(data["radius"]),
+                                HF(data["distance"]), data["angle"],
+                                HF(data["rot distance"]), data["rot angle"]), {"scale": scale}
 
     if data["type"] == "displaceable":
-        return DisplacebleCircle(screen_rect, COLORS[data["color"]], HF(data["radius"]),
-                                 HF(data["distance"]), data["angle"], scale=scale)
+        return DisplacebleCircle, (COLORS[data["color"]], HF(data["radius"]),
+                                   HF(data["distance"]), data["angle"]), {"scale": scale}
 
     if data["type"] == "fixed":
-        return Circle(screen_rect, COLORS[data["color"]], HF(data["radius"]),
-                      data["edge factor"], HF(data["distance"]), data["angle"], scale=scale)
+        return Circle, (COLORS[data["color"]], HF(data["radius"]),
+                        data["edge factor"], HF(data["distance"]), data["angle"]), {"scale": scale}
 
     if data["type"] == "looping":
-        return LoopingCircle(screen_rect, HF(data["distance"]),
-                             data["angle"], data["loop angle"], scale=scale)
+        return LoopingCircle, (HF(data["distance"]), data["angle"], data["loop angle"]), {"scale": scale}
 
     if data["type"] == "confusion":
-        return ScalingCircle(screen_rect, COLORS["confusion"], HF(data["radius"]),
-                             0.053, 0.177, HF(data["distance"]),
-                             data["angle"], scale=scale, edge_color=CONFUSION_EDGE_COLOR)
+        kwargs = {"scale": scale, "edge_color": CONFUSION_EDGE_COLOR}
+        return ScalingCircle, (COLORS["confusion"], HF(data["radius"]),
+                               0.053, 0.177, HF(data["distance"]), data["angle"]), kwargs
 
     if data["type"] == "static":
-        return StaticCircle(screen_rect, COLORS[data["color"]], HF(data["radius"]),
-                            data["edge factor"], HF(data["distance"]), data["angle"],
-                            data["glares angle"])
+        return StaticCircle, (COLORS[data["color"]], HF(data["radius"]),
+                              data["edge factor"], HF(data["distance"]), data["angle"],
+                              data["glares angle"]), {}
+
+
+def make_circle(data, scale=1, screen_rect=None):
+    circle_class, args, kwargs = circle_template(data, scale)
+    return circle_class(screen_rect, *args, **kwargs)
+
+
+def make_circles(screen_rect: pg.Rect, template: tuple) -> list:
+    """Makes circles from a template made of the results of 'circle_template'. """
+    return [circle_class(screen_rect, *args, **kwargs) for circle_class, args, kwargs in template]
 
 
 def make_circles_list(screen_rect: pg.Rect, circle_data: list, scale=1) -> list:
     return [make_circle(data, scale, screen_rect) for data in circle_data]
 
 
-__all__ = ["make_circles_list", "make_circle"]
+__all__ = ["make_circles_list", "make_circle", "make_circles", "circle_template",
+           "BakedCircles", "bake_circles"]
@@ -0,0 +1,100 @@
+from collections import defaultdict
+
+from components.utils import HF
+
+
+class CollisionGrid:
+    """Uniform grid broadphase for collisions of bullets with targets.
+
+    Every target is put into all cells of the grid covered by its rect.
+    Since every 'collide_bullet' method starts with a test of rects,
+    only the targets found in the cells covered by a bullet's rect can
+    collide with it, and the rest of the targets are never tested.
+
+    Targets are given as a tuple of lists. Each target gets a key
+    reflecting its position in these lists, and targets are returned
+    sorted by keys, so they are tested in the same order as if all
+    lists were iterated. Lists may only grow while the grid is in use,
+    and targets appended to them are inserted into the grid by 'update'.
+
+    Building the grid costs more than testing a few bullets against
+    all targets, so the grid is used only when there are at least
+    'min_bullets' bullets.
+
+    Counters of tested candidate pairs and actual hits are stored
+    in the grid, along with the number of pairs a full nested loop
+    would test, whether the grid was used or not.
+    """
+    KEY_SHIFT = 20
+
+    def __init__(self, cell_size=HF(384), min_bullets=24):
+        self.cell_size = cell_size
+        self.min_bullets = min_bullets
+        self.cells = defaultdict(list)
+        self.groups = ()
+        self.sizes = []
+        self.candidates = 0
+        self.hits = 0
+        self.pairs = 0
+
+    @property
+    def n_targets(self) -> int:
+        return sum(self.sizes)
+
+    def report(self) -> str:
+        return ("Bullet collisions: %d candidate pairs tested of %d pairs, %d hits" %
+                (self.candidates, self.pairs, self.hits))
+
+    def build(self, groups):
+        self.cells.clear()
+        self.groups = groups
+        self.sizes = [0] * len(groups)
+        self.update()
+
+    def update(self) -> bool:
+        """Inserts targets appended to the lists since the last update.
+        Returns True if any targets were inserted.
+        """
+        inserted = False
+        cells = self.cells
+        size = self.cell_size
+        for n, group in enumerate(self.groups):
+            start = self.sizes[n]
+            if start == len(group):
+                continue
+            for i in range(start, len(group)):
+                target = group[i]
+                item = (n << self.KEY_SHIFT) + i, target
+                left, top, w, h = target.rect
+                x_1, x_2 = int(left // size), int((left + w) // size)
+                y_1, y_2 = int(top // size), int((top + h) // size)
+                if x_1 == x_2 and y_1 == y_2:
+                    cells[x_1, y_1].append(item)
+                    continue
+                for cell_x in range(x_1, x_2 + 1):
+                    for cell_y in range(y_1, y_2 + 1):
+                        cells[cell_x, cell_y].append(item)
+            self.sizes[n] = len(group)
+            inserted = True
+        return inserted
+
+    def query(self, rect, min_key=-1) -> list:
+        """Returns the list of (key, target) pairs with keys greater than 'min_key'
+        for targets in the cells covered by the rect. The list is sorted
+        by keys in descending order, so that targets can be popped from it.
+        """
+        found = dict()
+        cells = self.cells
+        size = self.cell_size
+        left, top, w, h = rect
+        for cell_x in range(int(left // size), int((left + w) // size) + 1):
+            for cell_y in range(int(top // size), int((top + h) // size) + 1):
+                cell = cells.get((cell_x, cell_y))
+                if cell is not None:
+                    for key, target in cell:
+                        if key > min_key:
+                            found[key] = target
+        return sorted(found.items(), key=lambda item: item[0], reverse=True)
+
+
+__all__ = ["CollisionGrid"]
@@ -1,17 +1,18 @@
-from random import uniform
-from math import pi, cos, sin, hypot
+from math import pi, cos, sin, hypot, atan2
 import pygame as pg
 
 from assets.paths import *
 from data.constants import *
-from data.enemies import ENEMIES
 
 from components.utils import *
+from components.rng import rng
 from components.base_mob import BaseMob
 from components.enemy_body import EnemyBody
 from components.enemy_weapons import EnemyWeapons
 from components.enemy_event import EnemyEvent
+from components.enemy_prototype import get_enemy_prototype
 from components.special_effects import infection_surfaces
+from components.render_queue import render_queue
 
 
 sticky_w = H(108.391)
@@ -21,29 +22,34 @@ sticky_image = pg.transform.smoothscale(sticky_image, (sticky_w, sticky_h))
 
 
 class Enemy(BaseMob):
+    # Wandering enemies move by the rules of 'Enemy.update_pos',
+    # which 'update_enemies' inlines for them.
+    wandering = True
+
     def __init__(self, game, name):
         self.name = name
-        data = ENEMIES[name]
-        super().__init__(*self.start_pos(), data["max health"], data["max health"],
-                         data["radius"], EnemyBody(self, game.rect, data), EnemyWeapons(self, game, data))
+        prototype = get_enemy_prototype(name)
+        super().__init__(*self.start_pos(), prototype.max_health, prototype.max_health,
+                         prototype.radius, EnemyBody(self, game.rect, prototype),
+                         EnemyWeapons(self, game, prototype))
         self.game = game
-        self.death_award = data["death award"]
+        self.death_award = prototype.death_award
         self.screen_rect = game.rect
-        self.rect = pg.Rect(0, 0, data["rect size"], data["rect size"])
+        self.rect = pg.Rect(0, 0, prototype.rect_size, prototype.rect_size)
         self.rect.center = self.x, self.y
         self.update_component_states()
-        self.events = [EnemyEvent(self, game, event_data) for event_data in data["events"]]
-        self.velocity = data["velocity"]
+        self.events = [EnemyEvent(self, game, event_data) for event_data in prototype.events]
+        self.velocity = prototype.velocity
         self.vel_x = 0
         self.vel_y = 0
-        self.body.angle = uniform(0, 2*pi) if self.velocity != 0 else 0
+        self.body.angle = rng.ai.uniform(0, 2*pi) if self.velocity != 0 else 0
         self.set_velocity()
         self.angle_to_turn = 0
         self.last_angle = 0
         self.safety_turn = False
         self.time_to_turn = 0
         self.time_to_hold_turning = 0
-        self.spawners_data = data["spawners"]
+        self.spawners_data = prototype.spawners
         self.killed = False
         self.chasing_infectors = set()
 
@@ -67,8 +73,8 @@ class Enemy(BaseMob):
 
     @staticmethod
     def start_pos():
-        distance = uniform(0, ROOM_RADIUS * 0.7)
-        angle = uniform(0, 2*pi)
+        distance = rng.ai.uniform(0, ROOM_RADIUS * 0.7)
+        angle = rng.ai.uniform(0, 2*pi)
         x = SCR_W2 + distance * cos(angle)
         y = SCR_H2 - distance * sin(angle)
         return x, y
@@ -122,7 +128,7 @@ class Enemy(BaseMob):
         if self.time_to_turn == 0 or (about_to_exit and not self.safety_turn):
             if about_to_exit:
                 angle_pos = self.get_angle_pos()
-                angle_to_turn = uniform(-pi, -pi/2)
+                angle_to_turn = rng.ai.uniform(-pi, -pi/2)
                 if angle_pos > last_angle_pos:
                     angle_to_turn *= -1
                 k = HF(2.4 * 180 / pi)
@@ -137,8 +143,8 @@ class Enemy(BaseMob):
         if self.time_to_hold_turning > 0:
             self.time_to_hold_turning -= dt
         elif self.time_to_turn == 0:
-            if dt != 0 and uniform(0, 1000/dt) < 1:
-                distance = uniform(-100, 100)
+            if dt != 0 and rng.ai.uniform(0, 1000/dt) < 1:
+                distance = rng.ai.uniform(-100, 100)
                 k = HF(2.4)
                 self.time_to_turn = abs(distance) / self.velocity * k
                 self.angle_to_turn = self.velocity * sign(distance) / k * pi/180
@@ -163,7 +169,7 @@ class Enemy(BaseMob):
                 event.action()
         if self.killed:
             self.game.sound_player.play_sound(ENEMY_DEATH)
-            self.game.pause_menu.update_counter(0, 1)
+            self.game.events.update_counter(0, 1)
         if play_sound:
             self.game.sound_player.play_sound(ENEMY_HIT)
 
@@ -178,7 +184,7 @@ class Enemy(BaseMob):
     def draw_sticky(self, screen, dx, dy):
         x = self.x - dx - sticky_w/2
         y = self.y - dy - sticky_h/2
-        screen.blit(sticky_image, (x, y))
+        render_queue.blit(screen, sticky_image, (x, y))
 
     def draw_infected(self, screen, dx, dy):
         index = int(17 * self.infection_effect_time/320)
@@ -186,7 +192,7 @@ class Enemy(BaseMob):
             surface = infection_surfaces[index - 9]
             x = self.x - dx - surface.get_width()/2
             y = self.y - dy - surface.get_height()/2
-            screen.blit(surface, (x, y))
+            render_queue.blit(screen, surface, (x, y))
 
     def draw(self, screen, dx=0, dy=0):
         if self.is_on_screen:
@@ -199,6 +205,8 @@ class Enemy(BaseMob):
 
 
 class BossHead(Enemy):
+    wandering = False
+
     def __init__(self, game, name):
         super().__init__(game, name)
         self.body.angle = -0.5 * pi
@@ -238,6 +246,8 @@ class BossHead(Enemy):
 
 
 class BossLeg(Enemy):
+    wandering = False
+
     def __init__(self, game, name):
         super().__init__(game, name)
         self.body.angle = 0.5 * pi
@@ -264,6 +274,8 @@ class BossLeg(Enemy):
 
 
 class BossHand(Enemy):
+    wandering = False
+
     def __init__(self, game, name):
         super().__init__(game, name)
         if self.name == "BossLeftHand":
@@ -280,6 +292,74 @@ class BossHand(Enemy):
         self.weapons.update_pos()
 
 
+def update_enemies(enemies, dt):
+    """Updates enemies of the list one by one, like their 'update' methods do,
+    and yields every enemy right after it is updated.
+
+    Locomotion of wandering enemies is inlined into the loop, and the angle
+    of an enemy's position before the move is only computed when the enemy
+    has to make a safety turn. Enemies are still updated one at a time,
+    because movement, shooting and events of all enemies draw from the same
+    random stream, and their order of draws must stay the same.
+    """
+    exit_distance = HF(132)
+    safety_k = HF(2.4 * 180 / pi)
+    wander_k = HF(2.4)
+    for enemy in enemies:
+        if not enemy.wandering:
+            enemy.update(dt)
+            yield enemy
+            continue
+        enemy.update_sticky_state(dt)
+        enemy.update_stunned_state(dt)
+        enemy.update_infected_state(dt)
+
+        velocity = enemy.velocity
+        rect = enemy.rect
+        if enemy.stunned or enemy.sticky or velocity == 0:
+            rect.center = enemy.x, enemy.y
+        else:
+            last_x, last_y = enemy.x, enemy.y
+            vel_x, vel_y = enemy.vel_x, enemy.vel_y
+            x = enemy.x = last_x + vel_x * dt
+            y = enemy.y = last_y + vel_y * dt
+            rect.center = x, y
+
+            distance = rect.w/2 + exit_distance
+            about_to_exit = hypot(x + distance * vel_x / velocity - SCR_W2,
+                                  y + distance * vel_y / velocity - SCR_H2) > ROOM_RADIUS
+            time_to_turn = enemy.time_to_turn
+            if time_to_turn == 0 or (about_to_exit and not enemy.safety_turn):
+                if about_to_exit:
+                    angle_to_turn = rng.ai.uniform(-pi, -pi/2)
+                    if atan2(SCR_H2 - y, x - SCR_W2) > atan2(SCR_H2 - last_y, last_x - SCR_W2):
+                        angle_to_turn *= -1
+                    enemy.time_to_turn = abs(angle_to_turn) / velocity * safety_k
+                    enemy.angle_to_turn = velocity * sign(angle_to_turn) / safety_k
+                    enemy.time_to_hold_turning = 1800
+                    enemy.safety_turn = True
+            else:
+                enemy.time_to_turn = max(0, time_to_turn - dt)
+                body = enemy.body
+                angle = body.angle = body.angle + enemy.angle_to_turn * dt
+                enemy.vel_x = velocity * cos(angle)
+                enemy.vel_y = -velocity * sin(angle)
+
+            if enemy.time_to_hold_turning > 0:
+                enemy.time_to_hold_turning -= dt
+            elif enemy.time_to_turn == 0:
+                if dt != 0 and rng.ai.uniform(0, 1000/dt) < 1:
+                    distance = rng.ai.uniform(-100, 100)
+                    enemy.time_to_turn = abs(distance) / velocity * wander_k
+                    enemy.angle_to_turn = velocity * sign(distance) / wander_k * pi/180
+                    enemy.safety_turn = False
+        enemy.weapons.update_pos()
+
+        enemy.update_shape(dt)
+        enemy.update_shooting(dt)
+        yield enemy
+
+
 def make_enemy(game, name):
     if name == "BossHead":
         return BossHead(game, name)
@@ -290,4 +370,4 @@ def make_enemy(game, name):
     return Enemy(game, name)
 
 
-__all__ = ["Enemy", "make_enemy"]
+__all__ = ["Enemy", "make_enemy", "update_enemies"]
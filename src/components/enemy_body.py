@@ -1,24 +1,19 @@
-from components.circle import make_circles_list
+from components.circle import BakedCircles, bake_circles
 
 
 class EnemyBody:
-    def __init__(self, owner, screen_rect, data):
+    def __init__(self, owner, screen_rect, prototype):
         self.owner = owner
         self.angle = 0
         self.state = 0
-        self.all_circles = make_circles_list(screen_rect, data["circles"])
-        self.circles = self.init_circles(data)
+        self.all_circles = [circle.clone(screen_rect) for circle in prototype.body_circles]
+        self.states = prototype.body_states
+        self.circles = self.states.select(self.all_circles)
+        self.parts = bake_circles(self, self.all_circles, self.states)
 
     @property
     def current_circles(self) -> list:
-        return self.circles[self.state]
-
-    def init_circles(self, data: dict) -> dict:
-        circles = {}
-        for (left, right), indexes in data["circles states"].items():
-            for state in range(left, right + 1):
-                circles[state] = [self.all_circles[i] for i in indexes]
-        return circles
+        return self.circles[self.states.group_of[self.state]]
 
     def update_state(self, state):
         self.state = state
@@ -27,6 +22,10 @@ class EnemyBody:
     def become_infected(self):
         for circle in self.all_circles:
             circle.become_infected()
+        for parts in self.parts:
+            for part in parts:
+                if isinstance(part, BakedCircles):
+                    part.update_colors()
 
     def update_shape(self, dt):
         x, y, angle = self.owner.x, self.owner.y, self.angle
@@ -34,7 +33,7 @@ class EnemyBody:
             circle.update_pos(x, y, dt, angle)
 
     def draw(self, surface, dx=0, dy=0):
-        for circle in self.current_circles:
+        for circle in self.parts[self.states.group_of[self.state]]:
             if circle.is_on_screen:
                 circle.update_glares(self.angle)
                 circle.draw(surface, dx, dy)
@@ -1,11 +1,13 @@
 from math import sin, cos
 
-from components.bubble import Bubble
+from components.bubble import make_bubble
 from components.utils import HF
 from data.constants import CONFUSION_COLORS
 
 
 class EnemyEvent:
+    __slots__ = ("owner", "game", "trigger_value", "action", "hit", "value")
+
     def __init__(self, owner, game, data: dict):
         self.owner = owner
         self.game = game
@@ -28,8 +30,8 @@ class EnemyEvent:
         return lambda: None
 
     def drop_bubble(self):
-        bubble = Bubble(self.game.rect, self.owner.x, self.owner.y,
-                        gravitation_radius=self.game.room.gravitation_radius)
+        bubble = make_bubble(self.game.rect, self.owner.x, self.owner.y,
+                             gravitation_radius=self.game.room.gravitation_radius)
         self.game.room.bubbles.append(bubble)
 
     def change_speed(self):
@@ -0,0 +1,81 @@
+from data.enemies import ENEMIES
+from data.guns import GUNS
+
+from components.utils import HF
+from components.rng import rng
+from components.circle import circle_template, make_circles
+from components.bullets import get_bullet_type
+from components.bullet_specs import BULLET_SPECS
+from components.state_table import get_state_table
+
+
+def make_prototype_circles(circles_data, scale=1) -> tuple:
+    """Makes circles to be cloned by all enemies of a type. Random numbers
+    drawn by the circles are given back to the vfx stream, so that building
+    a prototype doesn't change the numbers drawn by the game.
+    """
+    state = rng.vfx.getstate()
+    circles = make_circles(None, [circle_template(data, scale) for data in circles_data])
+    rng.vfx.setstate(state)
+    return tuple(circles)
+
+
+class GunPrototype:
+    """Parameters of an enemy gun read from GUNS and scaled once. """
+    def __init__(self, data):
+        gun_params = GUNS[data["name"]]
+        scale = data["scale"]
+        self.distance = HF(data["distance"])
+        self.angle = data["angle"]
+        self.emitter_offset = HF(gun_params["emitter offset"]) * scale
+        self.circles = make_prototype_circles(gun_params["circles"], scale)
+        self.rotation_type = data["rotation type"]
+        self.rotation_angle = data["rotation angle"]
+        self.shooting_type = data["shooting type"]
+        self.cooldown_min = data["cooldown min"]
+        self.cooldown_max = data["cooldown max"]
+        self.delay = data["delay"]
+        self.bullet = get_bullet_type(gun_params["bullet type"])
+        self.bullet_spec = BULLET_SPECS.get(data["bullet name"])
+        self.bullet_vel = HF(data["bullet velocity"])
+        self.bullet_dmg = data["bullet damage"]
+
+
+class EnemyPrototype:
+    """Everything an enemy of the given type is made of, parsed and scaled
+    once: circles of its body and guns, gun parameters and tables of
+    component states. Every enemy of the type is made from its prototype
+    by cloning the circles instead of building them from the raw data.
+    Clones draw the same random numbers as new circles would draw.
+
+    Sizes in the data are scaled to the screen resolution when the data is
+    loaded, and the resolution can't change while the game is running,
+    so a prototype is built once per type and resolution.
+    """
+    def __init__(self, name):
+        data = ENEMIES[name]
+        self.name = name
+        self.max_health = data["max health"]
+        self.radius = data["radius"]
+        self.rect_size = data["rect size"]
+        self.velocity = data["velocity"]
+        self.death_award = data["death award"]
+        self.events = data["events"]
+        self.spawners = data["spawners"]
+        self.body_circles = make_prototype_circles(data["circles"])
+        self.body_states = get_state_table(("enemy circles", name), data["circles states"])
+        self.guns = tuple(GunPrototype(gun_data) for gun_data in data["guns"])
+        self.guns_states = get_state_table(("enemy guns", name), data["guns states"])
+
+
+_prototypes = dict()
+
+
+def get_enemy_prototype(name) -> EnemyPrototype:
+    prototype = _prototypes.get(name)
+    if prototype is None:
+        prototype = _prototypes[name] = EnemyPrototype(name)
+    return prototype
+
+
+__all__ = ["EnemyPrototype", "GunPrototype", "get_enemy_prototype", "make_prototype_circles"]
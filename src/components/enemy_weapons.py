@@ -1,23 +1,34 @@
-from math import cos, sin, pi, hypot
-from random import uniform, choice
+from math import cos, sin, pi, hypot, inf
 
-from data.guns import GUNS
 from data.constants import *
 
 from components.utils import *
+from components.rng import rng
 from components.bullets import *
-from components.circle import make_circles_list
 
 
 class EnemyWeapons:
-    def __init__(self, owner, game, data):
+    """Guns of an enemy, switched by its state.
+
+    Guns are timed by the shooting clock of the weapons, which runs only
+    while the enemy isn't stunned. A gun stores the time of the clock
+    when it was reloaded instead of accumulating its own time on every
+    frame, and the guns of the current state are only touched when
+    the clock reaches the earliest time one of them can shoot.
+    Guns of other states are paused, as if their time didn't run.
+    """
+    def __init__(self, owner, game, prototype):
         self.game = game
         self.state = 0
-        self.all_guns = [self.make_gun(owner, gun_data) for gun_data in data["guns"]]
-        self.guns = dict()
-        self.init_guns(data)
+        self.clock = 0
+        self.next_shot = 0
+        self.all_guns = [Gun(owner, self, game, gun) for gun in prototype.guns]
+        self.states = prototype.guns_states
+        self.guns = self.states.select(self.all_guns)
         self.machine_gun_time = 0
         self.machine_gun_on = False
+        for gun in self.current_guns:
+            gun.resume()
 
     def machine_gun_delay(self, dt):
         self.machine_gun_time += dt
@@ -30,40 +41,23 @@ class EnemyWeapons:
             self.machine_gun_time = 0
 
     def update_state(self, state):
+        old_guns = self.current_guns
         self.state = state
-        for gun in self.current_guns:
+        new_guns = self.current_guns
+        if new_guns is not old_guns:
+            for gun in old_guns:
+                if gun not in new_guns:
+                    gun.pause()
+            for gun in new_guns:
+                if gun not in old_guns:
+                    gun.resume()
+            self.next_shot = self.clock
+        for gun in new_guns:
             gun.update_shape(0)
 
     @property
     def current_guns(self):
-        return self.guns[self.state]
-
-    def init_guns(self, data):
-        self.guns = dict()
-        for (left, right), indexes in data["guns states"].items():
-            for state in range(left, right + 1):
-                self.guns[state] = [self.all_guns[i] for i in indexes]
-
-    def make_gun(self, owner, data):
-        gun_params = GUNS[data["name"]]
-        distance = HF(data["distance"])
-        angle = data["angle"]
-        emitter_offset = HF(gun_params["emitter offset"])
-        circles_data = gun_params["circles"]
-        rotation_type = data["rotation type"]
-        rotation_angle = data["rotation angle"]
-        shooting_type = data["shooting type"]
-        cooldown_min = data["cooldown min"]
-        cooldown_max = data["cooldown max"]
-        delay = data["delay"]
-        bullet_type = gun_params["bullet type"]
-        bullet_name = data["bullet name"]
-        bullet_vel = HF(data["bullet velocity"])
-        bullet_dmg = data["bullet damage"]
-        scale = data["scale"]
-        return Gun(owner, self.game, self.game.rect, distance, angle, emitter_offset,
-                   circles_data, rotation_type, rotation_angle, shooting_type, cooldown_min,
-                   cooldown_max, delay, bullet_type, bullet_name, bullet_vel, bullet_dmg, scale)
+        return self.guns[self.states.group_of[self.state]]
 
     def become_infected(self):
         for gun in self.all_guns:
@@ -79,8 +73,17 @@ class EnemyWeapons:
 
     def update_shooting(self, dt):
         self.machine_gun_delay(dt)
+        self.clock += dt
+        if self.clock < self.next_shot:
+            return
+        clock = self.clock
+        next_shot = inf
         for gun in self.current_guns:
-            gun.update_shooting(dt)
+            if clock - gun.start >= gun.cooldown:
+                gun.shoot()
+            # a millisecond earlier, so that rounding of the sum never delays a shot
+            next_shot = min(next_shot, gun.start + gun.cooldown - 1)
+        self.next_shot = next_shot
 
     def draw(self, screen, dx=0, dy=0):
         for gun in self.current_guns:
@@ -88,37 +91,35 @@ class EnemyWeapons:
 
 
 class Gun:
-    def __init__(self, owner, game, screen_rect, distance, angle,
-                 emitter_offset, circles_data, rotation_type, rotation_angle,
-                 shooting_type, cooldown_min, cooldown_max, delay,
-                 bullet_type, bullet_name, bullet_vel, bullet_dmg, scale):
-
+    def __init__(self, owner, weapons, game, prototype):
         self.owner = owner
+        self.weapons = weapons
         self.game = game
         self.player = game.player
-        self.screen_rect = screen_rect
+        self.screen_rect = game.rect
         self.spawned_enemy = None
         self.spawned_seeker = None
         self.x = 0
         self.y = 0
-        self.distance = distance
-        self.angle = angle
+        self.distance = prototype.distance
+        self.angle = prototype.angle
         self.angle_to_target = 0
-        self.emitter_offset = emitter_offset * scale
-        self.cooldown_min = cooldown_min
-        self.cooldown_max = cooldown_max
-        self.cooldown = (cooldown_max + cooldown_min) / 2
-        self.time = self.cooldown - delay
-
-        self.circles = make_circles_list(self.screen_rect, circles_data, scale)
-        self.rotation_type = rotation_type
-        self.rotation_angle = rotation_angle
-        self.shoot = self.get_shooting_func(shooting_type)
-
-        self.bullet = get_bullet_type(bullet_type)
-        self.bullet_name = bullet_name
-        self.bullet_vel = bullet_vel
-        self.bullet_dmg = bullet_dmg
+        self.emitter_offset = prototype.emitter_offset
+        self.cooldown_min = prototype.cooldown_min
+        self.cooldown_max = prototype.cooldown_max
+        self.cooldown = (self.cooldown_max + self.cooldown_min) / 2
+        self.start = 0
+        self.paused_time = self.cooldown - prototype.delay
+
+        self.circles = [circle.clone(self.screen_rect) for circle in prototype.circles]
+        self.rotation_type = prototype.rotation_type
+        self.rotation_angle = prototype.rotation_angle
+        self.shoot = self.get_shooting_func(prototype.shooting_type)
+
+        self.bullet = prototype.bullet
+        self.bullet_spec = prototype.bullet_spec
+        self.bullet_vel = prototype.bullet_vel
+        self.bullet_dmg = prototype.bullet_dmg
 
     def become_infected(self):
         for circle in self.circles:
@@ -139,10 +140,15 @@ class Gun:
         for circle in self.circles:
             circle.update_pos(x, y, dt, angle_to_target)
 
-    def update_shooting(self, dt):
-        self.time += dt
-        if self.time >= self.cooldown:
-            self.shoot()
+    def pause(self):
+        self.paused_time = self.weapons.clock - self.start
+
+    def resume(self):
+        self.start = self.weapons.clock - self.paused_time
+
+    def reload(self):
+        self.start = self.weapons.clock
+        self.cooldown = rng.ai.uniform(self.cooldown_min, self.cooldown_max)
 
     def get_shooting_func(self, shooting_type):
         if shooting_type == "single":
@@ -158,7 +164,7 @@ class Gun:
         if shooting_type == "10 spread":
             return self.shoot_10_spread
         if shooting_type == "spawn enemy":
-            self.spawned_enemy = choice(["Gull", "Bug", "Scarab"])
+            self.spawned_enemy = rng.ai.choice(["Gull", "Bug", "Scarab"])
             return self.spawn_enemy
         if shooting_type == "spawn bubble bomber":
             self.spawned_enemy = "BubbleBomber"
@@ -186,7 +192,7 @@ class Gun:
         return lambda: None
 
     def make_bullet(self, x, y, angle):
-        return self.bullet(self.bullet_name, self.screen_rect, x, y,
+        return make_bullet(self.bullet, self.bullet_spec, self.screen_rect, x, y,
                            self.bullet_dmg, self.bullet_vel, angle)
 
     def shoot_single(self):
@@ -194,8 +200,7 @@ class Gun:
         y = self.y - self.emitter_offset * sin(self.angle_to_target)
         bullet = self.make_bullet(x, y, self.angle_to_target)
         self.game.room.bullets.append(bullet)
-        self.time = 0
-        self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+        self.reload()
 
     def shoot_3_parallel(self):
         angle = self.angle_to_target
@@ -207,8 +212,7 @@ class Gun:
         for k in (-1, 0, 1):
             bullet = self.make_bullet(x + k * dx, y + k * dy, angle)
             self.game.room.bullets.append(bullet)
-        self.time = 0
-        self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+        self.reload()
 
     def shoot_5_parallel(self):
         angle = self.angle_to_target
@@ -221,16 +225,14 @@ class Gun:
         for dx, dy in (0, 0), (dx1, dy1), (-dx1, -dy1), (dx2-dx3, dy2+dy3), (-dx2-dx3, -dy2+dy3):
             bullet = self.make_bullet(x + dx, y + dy, angle)
             self.game.room.bullets.append(bullet)
-        self.time = 0
-        self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+        self.reload()
 
     def shoot_mine(self):
         x = self.x + self.emitter_offset * cos(self.angle_to_target)
         y = self.y - self.emitter_offset * sin(self.angle_to_target)
         mine = self.make_bullet(x, y, self.angle_to_target)
         self.game.room.mines.append(mine)
-        self.time = 0
-        self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+        self.reload()
 
     def shoot_mg_360(self):
         if not self.owner.weapons.machine_gun_on:
@@ -257,8 +259,7 @@ class Gun:
         distance = hypot(self.owner.x - self.player.x, self.owner.y - self.player.y)
         if distance <= self.owner.rect.width/2 + self.player.radius:
             self.player.receive_damage(self.bullet_dmg, play_sound=True)
-            self.time = 0
-            self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+            self.reload()
 
     def shoot_3_spread(self):
         angle = self.angle_to_target
@@ -269,8 +270,7 @@ class Gun:
         for k in (-1, 0, 1):
             bullet = self.make_bullet(x - k * dx, y - k * dy, angle + k * pi/6)
             self.game.room.bullets.append(bullet)
-        self.time = 0
-        self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+        self.reload()
 
     def shoot_5_spread(self):
         for k in (-2, -1, 0, 1, 2):
@@ -279,8 +279,7 @@ class Gun:
             y = self.y - self.emitter_offset * sin(angle)
             bullet = self.make_bullet(x, y, angle)
             self.game.room.bullets.append(bullet)
-        self.time = 0
-        self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+        self.reload()
 
     def shoot_10_spread(self):
         x = self.x + self.emitter_offset * cos(self.angle_to_target)
@@ -289,58 +288,52 @@ class Gun:
             angle = self.angle_to_target + k * 0.2 * pi
             bullet = self.make_bullet(x, y, angle)
             self.game.room.bullets.append(bullet)
-        self.time = 0
-        self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+        self.reload()
 
     def spawn_enemy(self):
         self.game.room.spawn_enemy(self.spawned_enemy, self.x, self.y)
-        self.time = 0
-        self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+        self.reload()
 
     def spawn_seeker(self):
         x = self.x + self.emitter_offset * cos(self.angle_to_target)
         y = self.y - self.emitter_offset * sin(self.angle_to_target)
-        seeker = self.bullet(self.game, self.bullet_name, self.screen_rect,
+        seeker = self.bullet(self.game, self.bullet_spec, self.screen_rect,
                              x, y, self.angle_to_target, 0.018,
                              self.bullet_dmg, self.bullet_vel)
         seeker.update(0)
         self.game.room.seekers.append(seeker)
-        self.time = 0
-        self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+        self.reload()
 
     def spawn_leecher(self):
         if self.spawned_seeker is None or self.spawned_seeker.killed:
             x = self.x + self.emitter_offset * cos(self.angle_to_target)
             y = self.y - self.emitter_offset * sin(self.angle_to_target)
-            leecher = self.bullet(self.player, self.bullet_name, self.screen_rect, x, y,
+            leecher = self.bullet(self.player, self.bullet_spec, self.screen_rect, x, y,
                                   self.angle_to_target, 0.018, self.bullet_dmg, self.bullet_vel)
             self.spawned_seeker = leecher
             self.game.room.seekers.append(leecher)
-            self.time = 0
-            self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+            self.reload()
 
     def spawn_sapper(self):
         if self.spawned_seeker is None or self.spawned_seeker.killed:
             x = self.x + self.emitter_offset * cos(self.angle_to_target)
             y = self.y - self.emitter_offset * sin(self.angle_to_target)
-            sapper = self.bullet(self.owner, self.game, self.bullet_name, self.screen_rect,
+            sapper = self.bullet(self.owner, self.game, self.bullet_spec, self.screen_rect,
                                  x, y, self.angle_to_target, 0.02,
                                  self.bullet_dmg, self.bullet_vel)
             self.spawned_seeker = sapper
             self.game.room.seekers.append(sapper)
-            self.time = 0
-            self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+            self.reload()
 
     def spawn_orbital_seeker(self):
         if self.spawned_seeker is None or self.spawned_seeker.killed:
             x = self.x + self.emitter_offset * cos(self.angle_to_target)
             y = self.y - self.emitter_offset * sin(self.angle_to_target)
-            seeker = EnemyOrbitalSeeker(self.owner, self.bullet_name, self.screen_rect,
+            seeker = EnemyOrbitalSeeker(self.owner, self.bullet_spec, self.screen_rect,
                                         x, y, self.angle_to_target, 0.018, self.bullet_dmg)
             self.spawned_seeker = seeker
             self.game.room.seekers.append(seeker)
-            self.time = 0
-            self.cooldown = uniform(self.cooldown_min, self.cooldown_max)
+            self.reload()
 
     def draw(self, screen, dx=0, dy=0):
         for circle in self.circles:
@@ -0,0 +1,89 @@
+from data.constants import ENTITY_CAPS
+
+
+
+def evict_oldest(entities, n, budget) -> list:
+    """Removes the n oldest entities from the list and returns them. """
+    evicted = entities[:n]
+    del entities[:n]
+    return evicted
+
+
+def evict_offscreen_first(entities, n, budget) -> list:
+    """Removes the n oldest of the entities whose positions are outside
+    the screen, and if there are not enough of them, the oldest of the
+    entities on the screen. Returns the removed entities.
+    """
+    screen_rect = budget.screen_rect
+    if screen_rect is None:
+        return evict_oldest(entities, n, budget)
+    evicted = [entity for entity in entities
+               if not screen_rect.collidepoint(entity.x, entity.y)][:n]
+    if len(evicted) < n:
+        offscreen = set(map(id, evicted))
+        evicted.extend([entity for entity in entities
+                        if id(entity) not in offscreen][:n - len(evicted)])
+    removed = set(map(id, evicted))
+    entities[:] = [entity for entity in entities if id(entity) not in removed]
+    return evicted
+
+
+def merge_bubbles(entities, n, budget) -> list:
+    """Removes the n oldest bubbles and adds their health to the oldest
+    of the remaining bubbles, so the health the player can collect
+    in the room stays the same. Returns the removed bubbles.
+    """
+    evicted = evict_oldest(entities, n, budget)
+    if entities:
+        entities[0].health += sum(bubble.health for bubble in evicted)
+    return evicted
+
+
+class EntityBudget:
+    """Cap on the number of entities of a category, such as room bullets
+    or bottom effects, with the policy evicting entities beyond the cap.
+
+    An entity list with a budget calls 'enforce' when it is compacted.
+    The policy removes the excess entities from the list in place and
+    returns them, and they are given to 'release', which returns them
+    to their pool or kills them. The budget of a category in which new entities are
+    refused instead of evicting old ones is checked with 'admit'.
+
+    Budgets are made by the room and the player together with their
+    entity lists, so every game has its own budgets. Policies evicting
+    off-screen entities first use the given screen rect.
+
+    Every evicted or refused entity is counted, so it can be seen when
+    the gameplay is clipped to protect the frame time.
+    """
+    def __init__(self, name, policy=evict_oldest, release=None, screen_rect=None):
+        self.name = name
+        self.cap = ENTITY_CAPS[name]
+        self.policy = policy
+        self.release = release
+        self.screen_rect = screen_rect
+        self.evictions = 0
+
+    def report(self) -> str:
+        return "%s budget: cap %d, %d evicted" % (self.name.capitalize(), self.cap, self.evictions)
+
+    def admit(self, entities) -> bool:
+        """Returns True if a new entity can be added to the list. """
+        if len(entities) < self.cap:
+            return True
+        self.evictions += 1
+        return False
+
+    def enforce(self, entities) -> int:
+        """Evicts entities beyond the cap. Returns their number. """
+        n = len(entities) - self.cap
+        if n <= 0:
+            return 0
+        evicted = self.policy(entities, n, self)
+        if self.release is not None:
+            self.release(evicted)
+        self.evictions += len(evicted)
+        return len(evicted)
+
+
+__all__ = ["EntityBudget", "evict_oldest", "evict_offscreen_first", "merge_bubbles"]
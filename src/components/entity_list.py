@@ -0,0 +1,65 @@
+class EntityList(list):
+    """List of entities of the room or the player, from which dead entities
+    are removed in place, keeping the order of the rest of the list.
+
+    Removal doesn't allocate anything when no entity died: the list is
+    only scanned. Otherwise the tail of the list starting from the first
+    dead entity is rebuilt. If the list has a budget, entities beyond
+    its cap are evicted by the policy of the budget.
+
+    The list counts removed entries, so that structures indexing
+    its entities by position can see that the positions have changed.
+    """
+    def __init__(self, iterable=(), budget=None):
+        super().__init__(iterable)
+        self.budget = budget
+        self.removed = 0
+
+    def clear(self):
+        self.removed += len(self)
+        super().clear()
+
+    def trim(self) -> int:
+        """Evicts entities beyond the cap of the budget. Returns their number. """
+        if self.budget is None or len(self) <= self.budget.cap:
+            return 0
+        n = self.budget.enforce(self)
+        self.removed += n
+        return n
+
+    def cut(self, start, kept) -> int:
+        """Replaces the tail of the list starting at 'start' with the list
+        of kept entities. Returns the number of removed entities.
+        """
+        n = len(self)
+        self[start:] = kept
+        self.removed += n - len(self)
+        return n - len(self) + self.trim()
+
+    def compact(self) -> int:
+        """Removes killed entities. Returns the number of removed entities. """
+        for i, entity in enumerate(self):
+            if entity.killed:
+                return self.cut(i, [entity for entity in self[i+1:] if not entity.killed])
+        return self.trim()
+
+    def remove_none(self) -> int:
+        """Removes None entries left by entities taken out of the list
+        while it was iterated. Returns the number of removed entries.
+        """
+        for i, entity in enumerate(self):
+            if entity is None:
+                return self.cut(i, [entity for entity in self[i+1:] if entity is not None])
+        return self.trim()
+
+    def keep(self, alive) -> int:
+        """Removes entities for which 'alive' returns False.
+        Returns the number of removed entities.
+        """
+        for i, entity in enumerate(self):
+            if not alive(entity):
+                return self.cut(i, [entity for entity in self[i+1:] if alive(entity)])
+        return self.trim()
+
+
+__all__ = ["EntityList"]
@@ -0,0 +1,68 @@
+from components.special_effects import add_effect
+from components.utils import HF
+
+
+class EventBus:
+    """Per-frame queue of the side effects of gameplay events: updates
+    of the counters of the pause menu and special effects.
+
+    Damage and deaths are resolved immediately, but their side effects
+    are emitted into the bus and applied once per simulation step by
+    'drain'. Duplicates are coalesced: the deltas of a counter are summed
+    into one update, and effects with the same name emitted into the same
+    list at positions in the same cell of size 'cell_size' become one
+    effect, or 'n' effects if they are emitted as a group. So a spread
+    shot hitting a crowd updates the kill counter once and draws one hit
+    effect per spot instead of one per bullet. Effects are added to their
+    lists in the order in which they were emitted. Sounds are played
+    directly, since the sound player already plays every sound once
+    per frame.
+
+    Effects are purely cosmetic and draw only from the vfx stream,
+    so coalescing them doesn't change the simulation.
+
+    The bus counts emitted events and applied actions.
+    """
+    def __init__(self, game, cell_size=HF(8)):
+        self.game = game
+        self.cell_size = cell_size
+        self.counters = dict()
+        self.effects = dict()
+        self.emitted = 0
+        self.applied = 0
+
+    def report(self) -> str:
+        return ("Event bus: %d events emitted, %d actions applied (%d coalesced)" %
+                (self.emitted, self.applied, self.emitted - self.applied))
+
+    def update_counter(self, index, delta_value):
+        self.emitted += 1
+        self.counters[index] = self.counters.get(index, 0) + delta_value
+
+    def add_effect(self, name, effects, x=0, y=0, radius=0, n=1):
+        self.emitted += n
+        key = (name, id(effects), x // self.cell_size, y // self.cell_size)
+        if key not in self.effects:
+            self.effects[key] = (name, effects, x, y, radius, n)
+
+    def drain(self):
+        """Applies all events emitted since the last call. """
+        if self.counters:
+            update_counter = self.game.pause_menu.update_counter
+            for index, delta_value in self.counters.items():
+                update_counter(index, delta_value)
+            self.applied += len(self.counters)
+            self.counters.clear()
+        if self.effects:
+            for name, effects, x, y, radius, n in self.effects.values():
+                for _ in range(n):
+                    add_effect(name, effects, x, y, radius)
+                self.applied += n
+            self.effects.clear()
+
+    def clear(self):
+        self.counters.clear()
+        self.effects.clear()
+
+
+__all__ = ["EventBus"]
@@ -24,6 +24,14 @@ from components.room import Room
 from components.sound_player import SoundPlayer
 from components.bubble_tanks_world import BubbleTanksWorld
 from components.fps_manager import FPSManager
+from components.timestep import FixedTimestep
+from components.rng import rng
+from components.collision_grid import CollisionGrid
+from components.spatial_index import SpatialIndex
+from components.object_pool import bubble_pool, pools, recycle_pools
+from components.gc_scheduler import gc_scheduler, scheduled_gc
+from components.event_bus import EventBus
+from components.render_queue import render_queue
 from components.superpowers import Disassemble
 from components.special_effects import *
 from components.utils import *
@@ -43,16 +51,22 @@ class Game:
         self.running = True
         self.pause = False
         self.transportation = False
+        self.mouse_pos = pg.mouse.get_pos()
+        self.recorder = None
 
         self.fps_manager = FPSManager()
+        self.timestep = FixedTimestep(SIMULATION_STEP, MAX_STEPS_PER_FRAME, FIXED_TIMESTEP)
 
         self.sound_player = SoundPlayer()
+        self.events = EventBus(self)
         self.clock = pg.time.Clock()
         self.camera = Camera()
         self.player = Player(self)
         self.bg_environment = BackgroundEnvironment(self)
         self.world = BubbleTanksWorld(self.player)
         self.room = Room(self)
+        self.collision_grid = CollisionGrid()
+        self.spatial_index = SpatialIndex(self.room)
 
         self.main_menu = MainMenu(self)
         self.upgrade_menu = UpgradeMenu(self)
@@ -62,6 +76,8 @@ class Game:
         self.health_window = HealthWindow(self)
         self.cooldown_window = CooldownWindow(self)
 
+        gc_scheduler.freeze()
+
     @property
     def boss_defeated(self) -> bool:
         if self.world.boss_pos == self.world.cur_room and not self.room.mobs:
@@ -113,7 +129,16 @@ class Game:
                          boss_generated, boss_position,
                          hints_history)
 
-    def set_save_data(self, save_data: dict):
+    def set_save_data(self, save_data: dict, seed=None):
+        """Starts a run from the given save data. All random streams are
+        reseeded with the given seed, or with a new random seed if it is None.
+        """
+        rng.seed(seed)
+        for pool in pools:
+            pool.clear()
+        self.events.clear()
+        if self.recorder is not None:
+            self.recorder.start(save_data, rng.run_seed)
         self.player.set_save_data(save_data)
         self.world.set_save_data(save_data)
         self.health_window.set_data()
@@ -126,6 +151,7 @@ class Game:
         self.pause = False
         self.transportation = False
         self.clock.tick()
+        self.timestep.reset()
         self.set_language(self.language)
 
     def set_language(self, language):
@@ -143,10 +169,14 @@ class Game:
 
     def quit(self):
         self.update_save_data()
+        if self.recorder is not None:
+            self.recorder.save()
         pg.quit()
         sys.exit()
 
     def handle(self, e_type, e_key):
+        if self.recorder is not None:
+            self.recorder.record_input(e_type, e_key)
         if e_type == pg.KEYDOWN and e_key in (self.controls["pause"], pg.K_ESCAPE):
             if not self.transportation:
                 self.pause = True
@@ -157,6 +187,7 @@ class Game:
         """Main events handler that handles pygame events
         during the actual game.
         """
+        self.mouse_pos = pg.mouse.get_pos()
         for event in pg.event.get():
             if event.type in [pg.KEYDOWN, pg.KEYUP]:
                 self.handle(event.type, event.key)
@@ -172,10 +203,11 @@ class Game:
                 self.player.update_health(bubble.health)
                 self.health_window.activate()
                 self.room.bubbles[i] = None
+                bubble_pool.release(bubble.bubble_type, bubble)
                 eaten_bubbles += 1
         if eaten_bubbles:
-            self.pause_menu.update_counter(1, eaten_bubbles)
-            self.room.bubbles = list(filter(lambda b: b is not None, self.room.bubbles))
+            self.events.update_counter(1, eaten_bubbles)
+            self.room.bubbles.remove_none()
             self.sound_player.play_sound(COLLECT_BUBBLE)
 
     def downgrade_player(self):
@@ -185,12 +217,22 @@ class Game:
         self.bg_environment.set_player_halo()
         self.room.set_gravity_radius()
 
+    @scheduled_gc
+    def choose_new_tank(self):
+        """Runs upgrade menu and returns the tank chosen by player. """
+        self.timestep.reset()
+        self.upgrade_menu.run()
+        self.timestep.reset()
+        return self.upgrade_menu.chosen_tank
+
     def upgrade_player(self):
         if self.player.last_tank_in_history:
-            self.upgrade_menu.run()
+            tank = self.choose_new_tank()
             if not self.running:
                 return
-            self.player.upgrade(True, self.upgrade_menu.chosen_tank)
+            if self.recorder is not None:
+                self.recorder.record_tank(tank)
+            self.player.upgrade(True, tank)
         else:
             self.player.upgrade(False)
         self.set_windows()
@@ -199,7 +241,7 @@ class Game:
         self.room.set_gravity_radius()
 
     def add_effect(self, entity):
-        add_effect(entity.hit_effect, self.room.top_effects, entity.x, entity.y)
+        self.events.add_effect(entity.hit_effect, self.room.top_effects, entity.x, entity.y)
 
     def handle_damage_to_player(self, bullet):
         """Handles damage to player made by enemy's bullet. """
@@ -216,7 +258,7 @@ class Game:
             if bullet.can_attack:
                 self.player.receive_damage(bullet.damage, play_sound=False)
                 bullet.return_to_enemy()
-                add_effect("SapperAttack", self.room.top_effects)
+                self.events.add_effect("SapperAttack", self.room.top_effects)
         else:
             self.player.receive_damage(bullet.damage)
             bullet.killed = True
@@ -224,26 +266,23 @@ class Game:
 
     def handle_bullet_explosion(self, bullet):
         x, y, radius = bullet.x, bullet.y, bullet.explosion_radius
-        for enemy in chain(self.room.mobs, self.room.seekers, self.room.spawners):
-            if circle_collidepoint(x, y, radius + enemy.radius, enemy.x, enemy.y):
-                enemy.receive_damage(bullet.damage)
+        for enemy in self.spatial_index.within_radius(x, y, radius, touching=True):
+            enemy.receive_damage(bullet.damage)
         bullet.killed = True
         self.add_effect(bullet)
-        add_effect('Flash', self.room.top_effects)
+        self.events.add_effect('Flash', self.room.top_effects)
         self.camera.start_shaking(200)
 
     def handle_sniper_bullet_explosion(self, bullet):
         x, y, radius = bullet.x, bullet.y, bullet.explosion_radius
-        for enemy in chain(self.room.mobs, self.room.seekers, self.room.spawners):
-            if (enemy not in bullet.attacked_mobs and
-                    circle_collidepoint(x, y, radius + enemy.radius, enemy.x, enemy.y)):
+        for enemy in self.spatial_index.within_radius(x, y, radius, touching=True):
+            if enemy not in bullet.attacked_mobs:
                 enemy.receive_damage(bullet.damage)
                 bullet.attacked_mobs.append(enemy)
         self.add_effect(bullet)
-        for _ in range(3):
-            add_effect('SmallHitLines', self.room.top_effects, bullet.x, bullet.y)
-        add_effect('BigHitLines', self.room.top_effects, bullet.x, bullet.y)
-        add_effect('Flash', self.room.top_effects)
+        self.events.add_effect('SmallHitLines', self.room.top_effects, bullet.x, bullet.y, n=3)
+        self.events.add_effect('BigHitLines', self.room.top_effects, bullet.x, bullet.y)
+        self.events.add_effect('Flash', self.room.top_effects)
         self.camera.start_shaking(200)
 
     def handle_enemy_collision(self, enemy, bullet):
@@ -270,16 +309,55 @@ class Game:
                     enemy.chasing_infectors.remove(bullet)
 
     def handle_enemies_collisions(self):
-        """Handles collisions between enemies and player's bullets. """
-        for bullet in chain(self.player.bullets, self.player.mines, self.player.seekers):
-            if isinstance(bullet, BulletBuster):
-                continue
+        """Handles collisions between enemies and player's bullets.
+        When there are many bullets, each of them is tested only against
+        the enemies found in the collision grid.
+        """
+        bullets = [bullet for bullet in chain(self.player.bullets, self.player.mines, self.player.seekers)
+                   if not isinstance(bullet, BulletBuster)]
+        if not bullets:
+            return
+        grid = self.collision_grid
+        if len(bullets) < grid.min_bullets:
+            grid.pairs += len(bullets) * (len(self.room.mobs) + len(self.room.seekers) +
+                                          len(self.room.spawners))
+            self.collide_bullets(bullets)
+        else:
+            self.collide_bullets_using_grid(bullets)
+
+    def collide_bullets(self, bullets):
+        grid = self.collision_grid
+        for bullet in bullets:
             for enemy in chain(self.room.mobs, self.room.seekers, self.room.spawners):
+                grid.candidates += 1
                 if enemy.collide_bullet(bullet):
+                    grid.hits += 1
                     self.handle_enemy_collision(enemy, bullet)
                     if not isinstance(bullet, PierceShot):
                         break
 
+    def collide_bullets_using_grid(self, bullets):
+        """Enemies are tested in the same order in which they are stored in the room.
+        Enemies spawned by a collision are added to the grid right away,
+        so that the following bullets (or the same pierce shot) can hit them.
+        """
+        grid = self.collision_grid
+        grid.build((self.room.mobs, self.room.seekers, self.room.spawners))
+        for bullet in bullets:
+            grid.update()
+            grid.pairs += grid.n_targets
+            candidates = grid.query(bullet.rect)
+            while candidates:
+                key, enemy = candidates.pop()
+                grid.candidates += 1
+                if enemy.collide_bullet(bullet):
+                    grid.hits += 1
+                    self.handle_enemy_collision(enemy, bullet)
+                    if not isinstance(bullet, PierceShot):
+                        break
+                    if grid.update():
+                        candidates = grid.query(bullet.rect, key)
+
     def handle_allys_collisions(self):
         """Handles collisions between player's tank/seekers and all bullets of enemies. """
         if self.player.disassembled:
@@ -304,16 +382,21 @@ class Game:
 
     def update_transportation(self, dt):
         """ Update all objects during transportation. """
+        if self.recorder is not None:
+            self.recorder.record_frame(dt)
+        self.spatial_index.invalidate()
+        recycle_pools()
         self.player.update(dt)
         self.update_rect()
         self.room.update(dt)
         self.health_window.update(dt)
         self.cooldown_window.update(dt)
+        self.events.drain()
 
     def draw_transportation(self, time, dx, dy):
         """ Draw all objects during transportation. """
-        offset_old = self.camera.offset
-        offset_new = self.camera.dx + dx, self.camera.dy + dy
+        offset_old = self.timestep.camera_offset(self.camera)
+        offset_new = offset_old[0] + dx, offset_old[1] + dy
 
         self.bg_environment.draw_bg(self.screen)
         self.bg_environment.draw_room_bg(self.screen, *offset_new)
@@ -325,46 +408,78 @@ class Game:
         self.bg_environment.draw_player_halo(self.screen, offset_old, offset_new)
         self.bg_environment.draw_boss_skeleton(self.screen, *offset_old)
 
+        render_queue.begin(self.screen)
         self.room.draw_bottom_effects(self.screen, *offset_old)
+        render_queue.set_layer("bubbles")
         self.room.draw_bubbles(self.screen, *offset_old)
+        render_queue.set_layer("mines")
         self.room.draw_mines(self.screen, *offset_old)
 
+        render_queue.set_layer("player")
         self.player.draw(self.screen, *offset_old)
 
+        render_queue.set_layer("enemies")
         self.room.draw_enemies(self.screen, *offset_old)
+        render_queue.set_layer("spawners")
         self.room.draw_spawners(self.screen, *offset_old)
+        render_queue.set_layer("bullets")
         self.room.draw_bullets(self.screen, *offset_old)
+        render_queue.set_layer("new enemies")
         self.room.draw_new_enemies(self.screen, *offset_old)
+        render_queue.set_layer("new spawners")
         self.room.draw_new_spawners(self.screen, *offset_old)
 
+        render_queue.set_layer("room glares")
         self.bg_environment.draw_room_glares(self.screen, *offset_new)
         self.bg_environment.draw_room_glares(self.screen, *offset_old)
 
+        render_queue.set_layer("top effects")
         self.room.draw_top_effects(self.screen, *offset_old)
+        render_queue.end()
 
         self.health_window.draw(self.screen)
         self.cooldown_window.draw(self.screen)
 
+    def update_transportation_steps(self, time_left) -> int:
+        """Runs fixed simulation steps of transportation available in this frame.
+        Returns the simulated time.
+        """
+        time = 0
+        self.timestep.start_frame()
+        while time < time_left and self.timestep.next_step():
+            if self.timestep.last_step:
+                self.timestep.save_positions(self.camera, self.moving_objects())
+            self.update_transportation(self.timestep.step)
+            time += self.timestep.step
+        return time
+
     def run_transportation(self, dx, dy):
         self.sound_player.play_sound(WATER_SPLASH)
         time = dt = 0
+        self.timestep.reset()
         while time < TRANSPORTATION_TIME and self.running:
             self.sound_player.reset()
             self.handle_events()
-            self.update_transportation(dt)
+            if self.timestep.enabled:
+                time += self.update_transportation_steps(TRANSPORTATION_TIME - time)
+            else:
+                self.update_transportation(dt)
             self.draw_transportation(time, dx, dy)
             pg.display.update()
             dt = self.clock.tick()
             self.fps_manager.update(dt)
-            time += dt
+            if not self.timestep.enabled:
+                time += dt
 
     def get_destination_pos(self, dx, dy):
         """Method returns player's destination point during transportation. """
         distance = DIST_BETWEEN_ROOMS - (ROOM_RADIUS - self.player.bg_radius - H(40))
         return SCR_W2 + dx * distance, SCR_H2 + dy * distance
 
+    @scheduled_gc
     def manage_transportation(self, dx, dy):
         self.transportation = True
+        self.timestep.reset()
 
         offset = -DIST_BETWEEN_ROOMS * dx, -DIST_BETWEEN_ROOMS * dy
 
@@ -402,6 +517,7 @@ class Game:
 
         self.transportation = False
         self.clock.tick()
+        self.timestep.reset()
 
     def get_direction(self):
         player_offset = hypot(*self.camera.offset)
@@ -457,6 +573,10 @@ class Game:
             self.downgrade_player()
 
     def update(self, dt):
+        if self.recorder is not None:
+            self.recorder.record_frame(dt)
+        self.spatial_index.invalidate()
+        recycle_pools()
         if self.pause:
             self.run_pause_menu()
             return
@@ -470,9 +590,10 @@ class Game:
         self.room.update(dt)
         self.health_window.update(dt)
         self.cooldown_window.update(dt)
+        self.events.drain()
 
         if self.boss_defeated:
-            self.victory_menu.run()
+            self.run_victory_menu()
         if not self.running:
             return
 
@@ -483,25 +604,37 @@ class Game:
 
     def draw_background(self, surface):
         """Draw all entities that should be drawn below player, mobs, bullets etc. """
+        offset = self.timestep.camera_offset(self.camera)
         self.bg_environment.draw_bg(surface)
-        self.bg_environment.draw_room_bg(surface, *self.camera.offset)
-        self.bg_environment.draw_player_halo(surface, self.camera.offset)
-        self.bg_environment.draw_hint(surface, *self.camera.offset)
-        self.bg_environment.draw_boss_skeleton(surface, *self.camera.offset)
+        self.bg_environment.draw_room_bg(surface, *offset)
+        self.bg_environment.draw_player_halo(surface, offset)
+        self.bg_environment.draw_hint(surface, *offset)
+        self.bg_environment.draw_boss_skeleton(surface, *offset)
 
     def draw_foreground(self):
         """Foreground includes player, mobs, bullets,
         bubbles, popup windows and effects.
         """
-        self.room.draw_bottom_effects(self.screen, *self.camera.offset)
-        self.room.draw_bubbles(self.screen, *self.camera.offset)
-        self.room.draw_mines(self.screen, *self.camera.offset)
-        self.player.draw(self.screen, *self.camera.offset)
-        self.room.draw_enemies(self.screen, *self.camera.offset)
-        self.room.draw_spawners(self.screen, *self.camera.offset)
-        self.room.draw_bullets(self.screen, *self.camera.offset)
-        self.bg_environment.draw_room_glares(self.screen, *self.camera.offset)
-        self.room.draw_top_effects(self.screen, *self.camera.offset)
+        offset = self.timestep.camera_offset(self.camera)
+        render_queue.begin(self.screen)
+        self.room.draw_bottom_effects(self.screen, *offset)
+        render_queue.set_layer("bubbles")
+        self.room.draw_bubbles(self.screen, *offset)
+        render_queue.set_layer("mines")
+        self.room.draw_mines(self.screen, *offset)
+        render_queue.set_layer("player")
+        self.player.draw(self.screen, *offset)
+        render_queue.set_layer("enemies")
+        self.room.draw_enemies(self.screen, *offset)
+        render_queue.set_layer("spawners")
+        self.room.draw_spawners(self.screen, *offset)
+        render_queue.set_layer("bullets")
+        self.room.draw_bullets(self.screen, *offset)
+        render_queue.set_layer("room glares")
+        self.bg_environment.draw_room_glares(self.screen, *offset)
+        render_queue.set_layer("top effects")
+        self.room.draw_top_effects(self.screen, *offset)
+        render_queue.end()
         self.health_window.draw(self.screen)
         self.cooldown_window.draw(self.screen)
 
@@ -526,19 +659,50 @@ class Game:
 
         self.room.update_effects(dt)
 
+    @scheduled_gc
+    def run_victory_menu(self):
+        self.timestep.reset()
+        self.victory_menu.run()
+        self.timestep.reset()
+
+    @scheduled_gc
     def run_pause_menu(self):
+        self.timestep.reset()
         self.draw_background(self.pause_menu.bg_surface)
         self.pause_menu.run()
         self.pause = False
+        self.timestep.reset()
+
+    def moving_objects(self):
+        """Returns all objects whose positions are interpolated when drawn. """
+        return chain((self.player,), self.player.bullets, self.player.seekers,
+                     self.player.drones, self.player.orbital_seekers,
+                     self.room.mobs, self.room.new_mobs, self.room.spawners,
+                     self.room.new_spawners, self.room.bullets,
+                     self.room.seekers, self.room.bubbles)
+
+    def update_fixed_steps(self):
+        """Runs all fixed simulation steps available in this frame. """
+        self.timestep.start_frame()
+        while self.running and self.timestep.next_step():
+            if self.timestep.last_step:
+                self.timestep.save_positions(self.camera, self.moving_objects())
+            self.update(self.timestep.step)
 
     @set_cursor_grab(False)
     def run_game(self):
         """ Game loop that starts when the main menu is closed. """
         self.clock.tick()
+        self.mouse_pos = pg.mouse.get_pos()
+        self.timestep.reset()
+        gc_scheduler.enter_combat()
         dt = 0
         while self.running:
             self.sound_player.reset()
-            self.update(dt)
+            if self.timestep.enabled:
+                self.update_fixed_steps()
+            else:
+                self.update(dt)
             if self.running:
                 self.draw_background(self.screen)
                 self.draw_foreground()
@@ -546,6 +710,9 @@ class Game:
             self.handle_events()
             dt = self.clock.tick()
             self.fps_manager.update(dt)
+        gc_scheduler.leave_combat()
+        if self.recorder is not None:
+            self.recorder.save()
 
     def run(self):
         """Main game loop. """
@@ -0,0 +1,99 @@
+import gc
+from functools import wraps
+from time import perf_counter
+
+from data.constants import GC_COMBAT_THRESHOLDS
+
+
+class GCScheduler:
+    """Decides when the garbage collector runs.
+
+    Objects loaded at startup (game data, surfaces, menus) live until
+    the game is closed, so they are moved to the permanent generation
+    with 'freeze' and full collections no longer scan them.
+
+    During a fight the thresholds of the collector are raised, so that
+    the expensive generation-2 collections are deferred and don't cause
+    frame spikes. Full collections are run explicitly with 'collect'
+    at moments when the player doesn't notice a pause: when the player
+    is transported to another room and when a menu is opened.
+
+    The scheduler measures the pause of every collection and stores
+    the number, the total and the longest pause of collections of
+    every generation, separately for the automatic collections and
+    for the scheduled ones.
+    """
+    def __init__(self, combat_thresholds=GC_COMBAT_THRESHOLDS):
+        self.default_thresholds = gc.get_threshold()
+        self.combat_thresholds = combat_thresholds
+        self.in_combat = False
+        self.scheduled = False
+        self.start_time = 0
+        self.stats = dict()
+        self.last_pause = 0
+        gc.callbacks.append(self.on_collection)
+
+    def on_collection(self, phase, info):
+        if phase == "start":
+            self.start_time = perf_counter()
+            return
+        pause = perf_counter() - self.start_time
+        key = (info["generation"], self.scheduled)
+        count, total, longest = self.stats.get(key, (0, 0, 0))
+        self.stats[key] = count + 1, total + pause, max(longest, pause)
+        self.last_pause = pause
+
+    def freeze(self):
+        """Collects the garbage left by loading and moves all objects
+        that are alive to the permanent generation.
+        """
+        self.collect()
+        gc.freeze()
+
+    def collect(self):
+        """Runs a full collection. Returns its pause in seconds. """
+        self.scheduled = True
+        gc.collect()
+        self.scheduled = False
+        return self.last_pause
+
+    def enter_combat(self):
+        if not self.in_combat:
+            self.in_combat = True
+            gc.set_threshold(*self.combat_thresholds)
+
+    def leave_combat(self):
+        """Restores the default thresholds and runs a full collection. """
+        if self.in_combat:
+            self.in_combat = False
+            gc.set_threshold(*self.default_thresholds)
+        self.collect()
+
+    def report(self) -> str:
+        lines = ["GC pauses (%d objects frozen):" % gc.get_freeze_count()]
+        for (generation, scheduled), (count, total, longest) in sorted(self.stats.items()):
+            lines.append("  gen %d %-9s %5d x %7.3f ms avg, %7.3f ms max, %8.1f ms total" %
+                         (generation, "scheduled" if scheduled else "automatic",
+                          count, 1000 * total / count, 1000 * longest, 1000 * total))
+        return "\n".join(lines)
+
+
+gc_scheduler = GCScheduler()
+
+
+def scheduled_gc(game_scene):
+    """A game scene wrapper for menus and transportation. Runs a full
+    collection when the scene starts and defers full collections again
+    when it ends, even if the scene raises an exception or exits the game.
+    """
+    @wraps(game_scene)
+    def wrapper(*args, **kwargs):
+        gc_scheduler.leave_combat()
+        try:
+            return game_scene(*args, **kwargs)
+        finally:
+            gc_scheduler.enter_combat()
+    return wrapper
+
+
+__all__ = ["GCScheduler", "gc_scheduler", "scheduled_gc"]
@@ -0,0 +1,149 @@
+import pygame as pg
+import sys
+from math import hypot, pi, cos, sin
+from random import Random
+
+from data.constants import *
+from components.game import Game
+from components.gc_scheduler import gc_scheduler
+from components.utils import HF
+
+
+class ScriptedInput:
+    """Input of a simple scripted player for headless runs.
+
+    The player keeps shooting at the closest enemy, approaching it until it
+    is 'keep_distance' away, and collects bubbles when the room is clear.
+    When there is nothing left in the room, it wanders in a direction
+    changed every 'wander_frames' frames, so it is transported to other
+    rooms sooner or later. Directions are drawn from its own generator,
+    so the random streams of the game are not touched.
+    """
+    def __init__(self, seed=0, keep_distance=HF(300), wander_frames=120):
+        self.random = Random("%d input" % seed)
+        self.keep_distance = keep_distance
+        self.wander_frames = wander_frames
+        self.wander_angle = 0
+        self.frames = 0
+
+    @staticmethod
+    def closest(entities, x, y):
+        return min(entities, key=lambda entity: hypot(entity.x - x, entity.y - y), default=None)
+
+    @staticmethod
+    def press(game, control, pressed):
+        game.handle(pg.KEYDOWN if pressed else pg.KEYUP, game.controls[control])
+
+    def move(self, game, dx, dy):
+        """Presses the keys moving the player in the direction (dx, dy)
+        and releases the other ones.
+        """
+        player = game.player
+        for control, pressed, moving in (("left", dx < -0.38, player.moving_left),
+                                         ("right", dx > 0.38, player.moving_right),
+                                         ("up", dy < -0.38, player.moving_up),
+                                         ("down", dy > 0.38, player.moving_down)):
+            if pressed != moving:
+                self.press(game, control, pressed)
+
+    def __call__(self, game):
+        player, room = game.player, game.room
+        self.frames += 1
+        target = self.closest(room.mobs, player.x, player.y)
+        if target is not None:
+            x, y = target.x, target.y
+            distance = hypot(x - player.x, y - player.y)
+            game.mouse_pos = (round(SCR_W2 + x - player.x), round(SCR_H2 + y - player.y))
+            if not player.shooting:
+                game.handle(pg.MOUSEBUTTONDOWN, pg.BUTTON_LEFT)
+            if distance > self.keep_distance:
+                self.move(game, (x - player.x) / distance, (y - player.y) / distance)
+            else:
+                self.move(game, 0, 0)
+            return
+
+        if player.shooting:
+            game.handle(pg.MOUSEBUTTONUP, pg.BUTTON_LEFT)
+        bubble = self.closest(room.bubbles, player.x, player.y)
+        if bubble is not None:
+            distance = max(hypot(bubble.x - player.x, bubble.y - player.y), 1)
+            self.move(game, (bubble.x - player.x) / distance, (bubble.y - player.y) / distance)
+            return
+
+        if self.frames % self.wander_frames == 1:
+            self.wander_angle = self.random.uniform(0, 2 * pi)
+        self.move(game, cos(self.wander_angle), -sin(self.wander_angle))
+
+
+class HeadlessGame(Game):
+    """Game that runs without a display, sound and player input.
+
+    It never draws anything and never opens menus: new tanks are chosen
+    automatically, the boss victory doesn't stop the game and nothing is
+    written to save files. The simulation is stepped with a constant dt
+    as fast as the CPU allows, which is used for batch balance runs,
+    soak tests and profiling of pure simulation cost.
+
+    The player is driven by an input source: a callable which is called
+    with the game before every frame and feeds it input with 'handle'
+    and 'mouse_pos', such as a ScriptedInput or a ReplayInput. Without
+    an input source the player stays idle.
+    """
+    def __init__(self, screen, dt=SIMULATION_STEP):
+        super().__init__(screen)
+        self.dt = dt
+        self.frames = 0
+        self.input_source = None
+
+    def start(self, save_data: dict, seed=None):
+        self.set_save_data(save_data, seed)
+        self.frames = 0
+
+    def set_screen_mode(self, screen_mode):
+        self.screen_mode = screen_mode
+
+    def update_save_data(self):
+        pass
+
+    def quit(self):
+        pg.quit()
+        sys.exit()
+
+    def choose_new_tank(self):
+        return self.upgrade_menu.get_next_tanks()[0]
+
+    def run_victory_menu(self):
+        pass
+
+    def run_pause_menu(self):
+        self.pause = False
+
+    def run_transportation(self, dx, dy):
+        time = 0
+        while time < TRANSPORTATION_TIME and self.running:
+            self.sound_player.reset()
+            self.update_transportation(self.dt)
+            time += self.dt
+
+    def step(self):
+        """Advances the simulation by one frame. """
+        self.sound_player.reset()
+        self.handle_events()
+        if self.input_source is not None:
+            self.input_source(self)
+        self.update(self.dt)
+        self.frames += 1
+
+    def run(self, frames, input_source=None):
+        """Runs the given number of frames, with the player
+        driven by the input source, if it is given.
+        """
+        if input_source is not None:
+            self.input_source = input_source
+        gc_scheduler.enter_combat()
+        while self.running and self.frames < frames:
+            self.step()
+        gc_scheduler.leave_combat()
+
+
+__all__ = ["HeadlessGame", "ScriptedInput"]
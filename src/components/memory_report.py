@@ -0,0 +1,117 @@
+import sys
+from itertools import chain
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+import pygame as pg
+
+import data.constants
+from data.bubbles import BUBBLES
+from data.bullets import BULLETS
+from data.enemies import ENEMIES
+from data.guns import GUNS
+from data.shapes import SHAPES
+from components.bubble import BUBBLE_TEMPLATES
+from components.bullet_specs import BULLET_SPECS
+from components.state_table import state_tables
+
+
+# objects that are never owned by a single entity
+SKIPPED_TYPES = (str, bool, type(None), type, ModuleType,
+                 FunctionType, BuiltinFunctionType, pg.Surface)
+
+
+def live_entities(game) -> list:
+    """Returns all simulated entities of the player and the room. """
+    player, room = game.player, game.room
+    entities = dict()
+    for entity in chain(player.bullets, player.seekers, player.drones,
+                        player.orbital_seekers, player.mines,
+                        room.mobs, room.new_mobs, room.bullets, room.mines,
+                        room.seekers, room.bubbles, room.spawners, room.new_spawners,
+                        room.top_effects, room.bottom_effects):
+        entities[id(entity)] = entity
+    for mob in chain(room.mobs, room.new_mobs):
+        for event in mob.events:
+            entities[id(event)] = event
+    return list(entities.values())
+
+
+def shared_ids(game, entities) -> set:
+    """Returns ids of objects shared by many entities: game objects,
+    game data and the entities themselves, so that an entity referencing
+    another entity or a shared object isn't charged for it.
+    """
+    ids = {id(game), id(game.rect), id(game.player), id(game.room)}
+    ids.update(id(entity) for entity in entities)
+    stack = [BUBBLES, BULLETS, ENEMIES, GUNS, SHAPES, BULLET_SPECS, BUBBLE_TEMPLATES,
+             vars(data.constants)]
+    for table in state_tables.values():
+        ids.add(id(table))
+        stack.extend((table.groups, table.group_of))
+    while stack:
+        obj = stack.pop()
+        if id(obj) in ids:
+            continue
+        ids.add(id(obj))
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return ids
+
+
+def deep_size(obj, seen) -> int:
+    """Returns the size in bytes of the object and all objects
+    reachable from it, except for the objects with ids in 'seen'.
+    Ids of all counted objects are added to 'seen'.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SKIPPED_TYPES):
+            continue
+        if type(obj) is int and -5 <= obj <= 256:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif not isinstance(obj, (int, float, MethodType, pg.Rect)):
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                for name in cls.__dict__.get("__slots__", ()):
+                    if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                        stack.append(getattr(obj, name))
+    return size
+
+
+def memory_report(game) -> str:
+    """Returns the number of live entities of every type and the average
+    number of bytes taken by an entity with all its components: bodies,
+    circles, glares, rects, guns and so on. Surfaces and game data
+    shared by entities are not counted.
+    """
+    entities = live_entities(game)
+    shared = shared_ids(game, entities)
+    counts, sizes = dict(), dict()
+    for entity in entities:
+        name = type(entity).__name__
+        counts[name] = counts.get(name, 0) + 1
+        seen = set(shared)
+        seen.discard(id(entity))
+        sizes[name] = sizes.get(name, 0) + deep_size(entity, seen)
+
+    lines = ["Memory of live entities:"]
+    for name in sorted(sizes, key=sizes.get, reverse=True):
+        lines.append("  %-20s %5d x %8.0f B = %8.1f KB" %
+                     (name, counts[name], sizes[name] / counts[name], sizes[name] / 1024))
+    lines.append("  %-20s %5d %21.1f KB" % ("Total", sum(counts.values()), sum(sizes.values()) / 1024))
+    return "\n".join(lines)
+
+
+__all__ = ["memory_report", "live_entities", "deep_size"]
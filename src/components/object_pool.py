@@ -0,0 +1,78 @@
+from collections import defaultdict
+
+
+class ObjectPool:
+    """Recycles short-lived objects: bullets, bubbles and special effects.
+
+    Released objects are stored by key, for example by the bullet name,
+    and 'acquire' returns one of them instead of building a new object.
+    The caller re-initializes the object with its 'reset' method, which
+    must leave it in the same state a new object would have.
+
+    An object released during a simulation step may still be referenced
+    until the end of the step, for example by the saved positions used
+    for interpolation, so it is only reused after 'recycle' is called
+    at the beginning of the next step.
+
+    The pool counts requests and hits, and stores the peak number
+    of free objects it held at once.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.free = defaultdict(list)
+        self.released = []
+        self.size = 0
+        self.peak_size = 0
+        self.requests = 0
+        self.hits = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0
+
+    def report(self) -> str:
+        return ("%s pool: %d of %d requests hit (%.1f%%), peak size %d" %
+                (self.name, self.hits, self.requests, 100 * self.hit_rate, self.peak_size))
+
+    def acquire(self, key):
+        """Returns a free object with the key, or None if there is none. """
+        self.requests += 1
+        free = self.free.get(key)
+        if not free:
+            return None
+        self.hits += 1
+        self.size -= 1
+        return free.pop()
+
+    def release(self, key, obj):
+        self.released.append((key, obj))
+
+    def recycle(self):
+        """Makes objects released since the last call available for reuse. """
+        if not self.released:
+            return
+        free = self.free
+        for key, obj in self.released:
+            free[key].append(obj)
+        self.size += len(self.released)
+        self.peak_size = max(self.peak_size, self.size)
+        self.released.clear()
+
+    def clear(self):
+        self.free.clear()
+        self.released.clear()
+        self.size = 0
+
+
+bullet_pool = ObjectPool("Bullet")
+bubble_pool = ObjectPool("Bubble")
+effect_pool = ObjectPool("Effect")
+pools = (bullet_pool, bubble_pool, effect_pool)
+
+
+def recycle_pools():
+    for pool in pools:
+        pool.recycle()
+
+
+__all__ = ["ObjectPool", "bullet_pool", "bubble_pool", "effect_pool", "pools", "recycle_pools"]
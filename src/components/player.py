@@ -1,6 +1,7 @@
 import pygame as pg
 from math import cos, sin, pi, hypot
 from itertools import chain
+from operator import attrgetter
 
 from data.constants import *
 from data.player_tanks import PLAYER_TANKS
@@ -11,6 +12,9 @@ from components.superpowers import *
 from components.base_mob import BaseMob
 from components.player_body import PlayerBody
 from components.player_weapons import PlayerWeapons
+from components.bullets import update_bullets, update_seekers, release_bullets, release_seekers
+from components.entity_list import EntityList
+from components.entity_budget import EntityBudget, evict_oldest
 
 
 class Player(BaseMob):
@@ -56,15 +60,19 @@ class Player(BaseMob):
 
         self.superpower = get_superpower(tank, game, self)
 
-        self.bullets = []
-        self.mines = []
-        self.seekers = []
-        self.drones = []
-        self.orbital_seekers = []
+        self.bullets = EntityList(budget=EntityBudget("player bullets", evict_oldest, release_bullets))
+        self.mines = EntityList(budget=EntityBudget("player mines"))
+        self.seekers = EntityList(budget=EntityBudget("player seekers", evict_oldest, release_seekers))
+        self.drones = EntityList()
+        self.orbital_seekers = EntityList()
 
         self.killed = False
         self.update_component_states()
 
+    @property
+    def budgets(self) -> tuple:
+        return self.bullets.budget, self.mines.budget, self.seekers.budget
+
     @property
     def is_outside(self):
         return hypot(*self.camera.offset) > ROOM_RADIUS
@@ -179,11 +187,12 @@ class Player(BaseMob):
         self.prev_cumulative_health = self.cumulative_health
         self.drones.clear()
         self.seekers.clear()
+        release_bullets(self.bullets)
         self.bullets.clear()
         self.mines.clear()
 
     def get_mouse_pos(self):
-        x, y = pg.mouse.get_pos()
+        x, y = self.game.mouse_pos
         return self.x + x - SCR_W2, self.y + y - SCR_H2
 
     def rotate_body(self, dt):
@@ -263,7 +272,7 @@ class Player(BaseMob):
         self.superpower = get_superpower(self.tank, self.game, self)
         self.update_component_states()
 
-        self.orbital_seekers = list(filter(lambda s: not s.orbiting, self.orbital_seekers))
+        self.orbital_seekers.keep(lambda s: not s.orbiting)
 
     def handle(self, e_type, e_key):
         if e_key == self.game.controls["left"]:
@@ -318,29 +327,26 @@ class Player(BaseMob):
         self.set_params(upgrade=False)
 
     def update_bullets(self, dt):
-        for bullet in self.bullets:
-            bullet.update(dt)
-        self.bullets = list(filter(lambda b: not b.killed, self.bullets))
+        update_bullets(self.bullets, dt)
 
     def update_mines(self, dt):
         for mine in self.mines:
             mine.update(dt)
-        self.mines = list(filter(lambda m: not m.killed, self.mines))[-30:]
+        self.mines.compact()
 
     def update_seekers(self, dt):
-        for seeker in self.seekers:
-            seeker.update(dt)
-        self.seekers = list(filter(lambda s: not s.killed, self.seekers))
+        update_seekers(self.seekers, dt)
+        self.seekers.compact()
 
     def update_drones(self, dt):
         for drone in self.drones:
             drone.update(dt)
-        self.drones = list(filter(lambda d: not d.killed, self.drones))
+        self.drones.compact()
 
     def update_orbital_seekers(self, dt):
         for seeker in self.orbital_seekers:
             seeker.update(dt)
-        self.orbital_seekers = list(filter(lambda s: s.orbiting, self.orbital_seekers))
+        self.orbital_seekers.keep(attrgetter("orbiting"))
 
     def update_acc(self):
         if not self.moving_right ^ self.moving_left:
@@ -400,9 +406,14 @@ class Player(BaseMob):
         self.update_orbital_seekers(dt)
 
     def draw(self, screen, dx=0, dy=0):
-        for obj in chain(self.mines, (self.body, self.weapons), self.bullets,
-                         self.seekers, self.drones, self.orbital_seekers):
-            obj.draw(screen, dx, dy)
+        interpolate = self.game.timestep.interpolate
+        for mine in self.mines:
+            mine.draw(screen, dx, dy)
+        player_dx, player_dy = interpolate(self, dx, dy)
+        self.body.draw(screen, player_dx, player_dy)
+        self.weapons.draw(screen, player_dx, player_dy)
+        for obj in chain(self.bullets, self.seekers, self.drones, self.orbital_seekers):
+            obj.draw(screen, *interpolate(obj, dx, dy))
 
 
 __all__ = ["Player"]
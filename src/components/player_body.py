@@ -2,7 +2,8 @@ from math import pi
 
 from data.player_tanks import PLAYER_TANKS
 
-from components.circle import make_circles_list
+from components.circle import make_circles_list, bake_circles
+from components.state_table import get_state_table
 from components.utils import *
 
 
@@ -13,27 +14,27 @@ class PlayerBody:
         self.owner = owner
         self.angle = 0
         self.state = 0
-        self.circles = self.init_circles(data)
+        self.states = None
+        self.parts = None
+        self.circles = self.init_circles(tank)
         self.is_rotating = data["rotating"]
 
     @property
     def current_circles(self) -> list:
-        return self.circles[self.state]
+        return self.circles[self.states.group_of[self.state]]
 
-    def init_circles(self, data: dict) -> dict:
-        all_circles = make_circles_list(self.screen_rect, data["circles"])
-        circles = {}
-        for (left, right), indexes in data["circles states"].items():
-            for state in range(left, right + 1):
-                circles[state] = [all_circles[i] for i in indexes]
-        return circles
+    def init_circles(self, tank) -> list:
+        data = PLAYER_TANKS[tank]
+        self.states = get_state_table(("player circles", tank), data["circles states"])
+        circles = make_circles_list(self.screen_rect, data["circles"])
+        self.parts = bake_circles(self, circles, self.states)
+        return self.states.select(circles)
 
     def set_params(self, new_tank):
         """Method is called when player is being upgraded/downgraded.
         Updates body parameters according to new player's tank state"""
-        data = PLAYER_TANKS[new_tank]
-        self.circles = self.init_circles(data)
-        self.is_rotating = data["rotating"]
+        self.circles = self.init_circles(new_tank)
+        self.is_rotating = PLAYER_TANKS[new_tank]["rotating"]
 
     def get_angle_of_rotation(self, destination_angle):
         """Method is called when player's tank body should be
@@ -69,7 +70,7 @@ class PlayerBody:
             circle.update(x, y, dt, angle)
 
     def draw(self, surface, dx=0, dy=0):
-        for circle in self.current_circles:
+        for circle in self.parts[self.states.group_of[self.state]]:
             circle.draw(surface, dx, dy)
 
 
@@ -1,15 +1,17 @@
 from math import cos, sin, hypot, pi
-from random import uniform
 from itertools import chain
 
 
 from components.circle import make_circles_list
+from components.state_table import get_state_table
 from data.guns import GUNS
 from data.shapes import SHAPES
 from data.constants import *
 from assets.paths import SHOOT
 from components.utils import *
+from components.rng import rng
 from components.bullets import *
+from components.bullet_specs import BULLET_SPECS
 from data.player_tanks import PLAYER_TANKS
 
 
@@ -19,8 +21,9 @@ class PlayerWeapons:
         self.game = game
         self.state = 0
 
-        self.guns = dict()
-        self.auto_guns = dict()
+        self.states = None
+        self.guns = []
+        self.auto_guns = []
         self.init_guns(tank)
 
         self.cooldown = PLAYER_TANKS[tank]["cooldown"]
@@ -31,11 +34,11 @@ class PlayerWeapons:
 
     @property
     def current_guns(self):
-        return self.guns[self.state]
+        return self.guns[self.states.group_of[self.state]]
 
     @property
     def current_auto_guns(self):
-        return self.auto_guns[self.state]
+        return self.auto_guns[self.states.group_of[self.state]]
 
     def set_params(self, tank):
         self.init_guns(tank)
@@ -62,14 +65,11 @@ class PlayerWeapons:
                    bullet_name, bullet_vel, bullet_dmg, scale)
 
     def init_guns(self, tank):
-        self.guns = dict()
-        self.auto_guns = dict()
         guns_list = [self.make_gun(data) for data in PLAYER_TANKS[tank]["guns"]]
-        states = PLAYER_TANKS[tank]["guns states"]
-        for (left, right), indexes in states.items():
-            for state in range(left, right + 1):
-                self.guns[state] = [guns_list[i] for i in indexes if guns_list[i].rotation_type != AUTO_GUN]
-                self.auto_guns[state] = [guns_list[i] for i in indexes if guns_list[i].rotation_type == AUTO_GUN]
+        self.states = get_state_table(("player guns", tank), PLAYER_TANKS[tank]["guns states"])
+        groups = self.states.select(guns_list)
+        self.guns = [[gun for gun in group if gun.rotation_type != AUTO_GUN] for group in groups]
+        self.auto_guns = [[gun for gun in group if gun.rotation_type == AUTO_GUN] for group in groups]
 
     def update_state(self, state):
         self.state = state
@@ -152,14 +152,14 @@ class Gun:
 
         self.bullet = get_bullet_type(bullet_type)
         self.bullet_is_custom = self.bullet in (PierceShot, ExplosivePierceShot, LeecherBullet)
-        self.bullet_name = bullet_name
+        self.bullet_spec = BULLET_SPECS.get(bullet_name)
         self.bullet_vel = bullet_vel
         self.bullet_dmg = bullet_dmg
 
     def make_bullet(self, x, y, angle):
         if self.bullet_is_custom:
             return self.bullet(self.screen_rect, x, y, self.bullet_dmg, self.bullet_vel, angle)
-        return self.bullet(self.bullet_name, self.screen_rect, x, y,
+        return make_bullet(self.bullet, self.bullet_spec, self.screen_rect, x, y,
                            self.bullet_dmg, self.bullet_vel, angle)
 
     def get_shooting_func(self, shooting_type):
@@ -263,8 +263,8 @@ class Gun:
     def shoot_drone(self):
         x = self.x + self.emitter_offset * cos(self.angle_to_target)
         y = self.y - self.emitter_offset * sin(self.angle_to_target)
-        drone = Drone(self.bullet_name, self.screen_rect, x, y, self.bullet_dmg,
-                      self.bullet_vel, uniform(0, 2 * pi), self.player)
+        drone = Drone(self.bullet_spec, self.screen_rect, x, y, self.bullet_dmg,
+                      self.bullet_vel, rng.ai.uniform(0, 2 * pi), self.player)
         drone.update(0)
         self.player.drones.append(drone)
 
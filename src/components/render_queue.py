@@ -0,0 +1,102 @@
+from data.constants import RENDER_LAYERS, RENDER_QUEUE_ENABLED
+
+
+class RenderQueue:
+    """Queue of sprites blitted onto the screen in batches.
+
+    While the foreground is drawn, entities don't blit their sprites
+    onto the screen one by one but submit them with 'blit' into the
+    current layer of the queue. When everything is submitted, 'end'
+    draws the layers bottom to top.
+
+    Shapes drawn with 'pg.draw' can't be batched, so entities drawing
+    them submit the function drawing them with 'draw'. The function is
+    queued into the current layer between the sprites submitted before
+    and after it, and a layer is drawn as runs of sprites, each with one
+    'Surface.blits' call, and the queued functions between them. So
+    everything is drawn in the order in which it was submitted to its
+    layer. Blits and drawing onto any other surface than the one the
+    queue was started with are done immediately.
+
+    The queue counts the sprites drawn in every layer,
+    the 'blits' calls and the queued drawing functions.
+    """
+    def __init__(self, layers=RENDER_LAYERS, enabled=RENDER_QUEUE_ENABLED):
+        self.layer_names = layers
+        self.layer_indices = {name: i for i, name in enumerate(layers)}
+        self.layers = [[[]] for _ in layers]
+        self.enabled = enabled
+        self.surface = None
+        self.layer = 0
+        self.items = self.layers[0][-1]
+        self.draws = [0] * len(layers)
+        self.batches = 0
+        self.calls = 0
+        self.frames = 0
+
+    def report(self) -> str:
+        lines = ["Render queue: %d sprites in %d batches over %d frames, %d queued drawing functions" %
+                 (sum(self.draws), self.batches, self.frames, self.calls)]
+        for name, draws in zip(self.layer_names, self.draws):
+            if draws:
+                lines.append("  %-14s %8d sprites, %7.1f per frame" %
+                             (name, draws, draws / max(self.frames, 1)))
+        return "\n".join(lines)
+
+    def begin(self, surface):
+        """Starts queueing the sprites blitted onto the surface. """
+        if self.enabled:
+            self.surface = surface
+            self.set_layer(self.layer_names[0])
+            self.frames += 1
+
+    def set_layer(self, name):
+        self.layer = self.layer_indices[name]
+        self.items = self.layers[self.layer][-1]
+
+    def blit(self, surface, source, dest):
+        if surface is self.surface:
+            self.items.append((source, dest))
+        else:
+            surface.blit(source, dest)
+
+    def draw(self, surface, function, *args):
+        """Calls function(surface, *args), which draws shapes onto the surface,
+        in its turn among the sprites of the current layer.
+        """
+        if surface is self.surface:
+            layer = self.layers[self.layer]
+            layer.append((function, args))
+            self.items = []
+            layer.append(self.items)
+            self.calls += 1
+        else:
+            function(surface, *args)
+
+    def end(self):
+        """Draws the queued sprites and shapes and stops queueing. """
+        if self.surface is None:
+            return
+        surface = self.surface
+        self.surface = None
+        blits = surface.blits
+        for i, layer in enumerate(self.layers):
+            if len(layer) == 1 and not layer[0]:
+                continue
+            for entry in layer:
+                if type(entry) is list:
+                    if entry:
+                        blits(entry, False)
+                        self.draws[i] += len(entry)
+                        self.batches += 1
+                else:
+                    function, args = entry
+                    function(surface, *args)
+            layer[:] = [[]]
+        self.items = self.layers[self.layer][-1]
+
+
+render_queue = RenderQueue()
+
+
+__all__ = ["RenderQueue", "render_queue"]
@@ -0,0 +1,305 @@
+import pygame as pg
+import json
+import struct
+import zlib
+from hashlib import blake2b
+from itertools import chain
+
+from data.constants import *
+from components.headless_game import HeadlessGame
+from components.gc_scheduler import gc_scheduler
+
+
+# Replay file layout:
+#   header: magic, version, run seed, hash interval, length of save data;
+#   save data the run was started from, encoded in JSON;
+#   zlib-compressed sequence of frames.
+# Every frame is one call of Game.update or Game.update_transportation:
+#   dt, mouse position, flags, number of inputs;
+#   state hash, if the frame has one;
+#   inputs handled before the frame and tanks chosen during the frame.
+MAGIC = b"BTRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHqHI")
+FRAME = struct.Struct("<dhhBB")
+HASH = struct.Struct("<Q")
+INPUT = struct.Struct("<BB")
+
+# frame flags
+TRANSPORTATION_FRAME = 1
+HASHED_FRAME = 2
+
+# input types
+KEY_DOWN = 0
+KEY_UP = 1
+BUTTON_DOWN = 2
+BUTTON_UP = 3
+TANK_CHOSEN = 4
+
+# Keys are recorded as game actions, so that a replay
+# doesn't depend on the controls of the player who watches it.
+ACTIONS = ("left", "right", "up", "down", "superpower", "pause")
+
+
+def state_hash(game) -> int:
+    """Returns a hash of the simulated state of the player and the room. """
+    player = game.player
+    room = game.room
+    state = [game.world.cur_room, player.tank, player.health,
+             player.x, player.y, player.body.angle]
+    for obj in chain(player.bullets, player.seekers, player.drones,
+                     player.orbital_seekers, player.mines,
+                     room.bullets, room.seekers, room.mines, room.bubbles,
+                     room.spawners, room.new_spawners):
+        state.append((obj.x, obj.y))
+    for mob in chain(room.mobs, room.new_mobs):
+        state.append((mob.name, mob.health, mob.x, mob.y))
+    return HASH.unpack(blake2b(repr(state).encode(), digest_size=HASH.size).digest())[0]
+
+
+class ReplayFrame:
+    def __init__(self, dt, mouse_pos, transportation, state_hash=None):
+        self.dt = dt
+        self.mouse_pos = mouse_pos
+        self.transportation = transportation
+        self.state_hash = state_hash
+        self.inputs = []
+        self.tanks = []
+
+    def pack(self) -> bytes:
+        flags = TRANSPORTATION_FRAME if self.transportation else 0
+        if self.state_hash is not None:
+            flags |= HASHED_FRAME
+        items = self.inputs + [(TANK_CHOSEN, i) for i in self.tanks]
+        data = FRAME.pack(self.dt, *self.mouse_pos, flags, len(items))
+        if self.state_hash is not None:
+            data += HASH.pack(self.state_hash)
+        return data + b"".join(INPUT.pack(*item) for item in items)
+
+
+class Replay:
+    """Recorded run: the seed and the save data it was started
+    from, and the list of frames to drive the simulation with.
+    """
+    def __init__(self, seed, save_data, hash_interval=REPLAY_HASH_INTERVAL):
+        self.seed = seed
+        self.save_data = save_data
+        self.hash_interval = hash_interval
+        self.frames = []
+
+    def save(self, path):
+        save_data = json.dumps(self.save_data).encode()
+        frames = zlib.compress(b"".join(frame.pack() for frame in self.frames))
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.seed, self.hash_interval, len(save_data)))
+            file.write(save_data)
+            file.write(frames)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, seed, hash_interval, size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("'%s' is not a replay file of a supported version" % path)
+        offset = HEADER.size
+        replay = Replay(seed, json.loads(data[offset:offset + size]), hash_interval)
+
+        data = zlib.decompress(data[offset + size:])
+        offset = 0
+        while offset < len(data):
+            dt, mouse_x, mouse_y, flags, n_items = FRAME.unpack_from(data, offset)
+            offset += FRAME.size
+            frame = ReplayFrame(dt, (mouse_x, mouse_y), bool(flags & TRANSPORTATION_FRAME))
+            if flags & HASHED_FRAME:
+                frame.state_hash = HASH.unpack_from(data, offset)[0]
+                offset += HASH.size
+            for _ in range(n_items):
+                item = INPUT.unpack_from(data, offset)
+                offset += INPUT.size
+                if item[0] == TANK_CHOSEN:
+                    frame.tanks.append(item[1])
+                else:
+                    frame.inputs.append(item)
+            replay.frames.append(frame)
+        return replay
+
+
+class ReplayRecorder:
+    """Records a run of the game into a replay file.
+
+    The game reports to the recorder every handled input, every
+    simulation frame and every tank chosen in the upgrade menu.
+    Every 'hash_interval' frames a hash of the game state is recorded,
+    so that the frame where a replay desyncs can be found.
+    """
+    def __init__(self, game, path, hash_interval=REPLAY_HASH_INTERVAL):
+        self.game = game
+        self.path = path
+        self.hash_interval = hash_interval
+        self.replay = None
+        self.inputs = []
+
+    def start(self, save_data: dict, seed):
+        self.replay = Replay(seed, json.loads(json.dumps(save_data)), self.hash_interval)
+        self.inputs = []
+
+    def record_input(self, e_type, e_key):
+        if self.replay is None:
+            return
+        if e_type in (pg.KEYDOWN, pg.KEYUP):
+            if e_key == pg.K_ESCAPE:
+                action = "pause"
+            else:
+                action = next((a for a in ACTIONS if self.game.controls[a] == e_key), None)
+            if action is not None:
+                input_type = KEY_DOWN if e_type == pg.KEYDOWN else KEY_UP
+                self.inputs.append((input_type, ACTIONS.index(action)))
+        elif e_key <= 255:
+            input_type = BUTTON_DOWN if e_type == pg.MOUSEBUTTONDOWN else BUTTON_UP
+            self.inputs.append((input_type, e_key))
+
+    def record_frame(self, dt):
+        if self.replay is None:
+            return
+        frames = self.replay.frames
+        x, y = self.game.mouse_pos
+        frame = ReplayFrame(dt, (max(-32768, min(x, 32767)), max(-32768, min(y, 32767))),
+                            self.game.transportation)
+        if len(frames) % self.hash_interval == 0:
+            frame.state_hash = state_hash(self.game)
+        frame.inputs = self.inputs
+        self.inputs = []
+        frames.append(frame)
+
+    def record_tank(self, tank):
+        if self.replay is not None and self.replay.frames:
+            index = self.game.upgrade_menu.get_next_tanks().index(tank)
+            self.replay.frames[-1].tanks.append(index)
+
+    def save(self):
+        if self.replay is not None:
+            self.replay.save(self.path)
+
+
+class ReplayInput:
+    """Input source of a headless game that feeds it the recorded input
+    of a replay frame by frame, whatever save the game was started from.
+    When the frames run out, the pressed keys and buttons are released
+    and the input is fed from the first frame again, so it can drive
+    runs of any length.
+    """
+    def __init__(self, replay: Replay):
+        self.replay = replay
+        self.frame = 0
+
+    def release_all(self, game):
+        for action in ("left", "right", "up", "down", "superpower"):
+            game.handle(pg.KEYUP, game.controls[action])
+        game.handle(pg.MOUSEBUTTONUP, pg.BUTTON_LEFT)
+
+    def __call__(self, game):
+        frames = self.replay.frames
+        if not frames:
+            return
+        if self.frame == len(frames):
+            self.frame = 0
+            self.release_all(game)
+        frame = frames[self.frame]
+        self.frame += 1
+        for input_type, code in frame.inputs:
+            if input_type == KEY_DOWN:
+                game.handle(pg.KEYDOWN, game.controls[ACTIONS[code]])
+            elif input_type == KEY_UP:
+                game.handle(pg.KEYUP, game.controls[ACTIONS[code]])
+            elif input_type == BUTTON_DOWN:
+                game.handle(pg.MOUSEBUTTONDOWN, code)
+            else:
+                game.handle(pg.MOUSEBUTTONUP, code)
+        game.mouse_pos = frame.mouse_pos
+
+
+class ReplayGame(HeadlessGame):
+    """Game that re-drives the simulation with the frames of a replay
+    as fast as possible, optionally drawing every frame.
+
+    Before every frame the game state is compared with the hash
+    recorded for this frame. When the hashes differ, the replay stops
+    and 'desync_frame' is set to the index of that frame.
+    """
+    def __init__(self, screen, replay: Replay, render=False):
+        super().__init__(screen)
+        self.replay = replay
+        self.render = render
+        self.desync_frame = None
+        self.tanks = []
+
+    @property
+    def replaying(self) -> bool:
+        return (self.running and self.desync_frame is None and
+                self.frames < len(self.replay.frames))
+
+    def start(self, save_data=None, seed=None):
+        super().start(self.replay.save_data, self.replay.seed)
+
+    def next_frame(self):
+        """Applies inputs of the next frame and returns its dt. """
+        frame = self.replay.frames[self.frames]
+        for input_type, code in frame.inputs:
+            if input_type == KEY_DOWN:
+                self.handle(pg.KEYDOWN, self.controls[ACTIONS[code]])
+            elif input_type == KEY_UP:
+                self.handle(pg.KEYUP, self.controls[ACTIONS[code]])
+            elif input_type == BUTTON_DOWN:
+                self.handle(pg.MOUSEBUTTONDOWN, code)
+            else:
+                self.handle(pg.MOUSEBUTTONUP, code)
+        self.mouse_pos = frame.mouse_pos
+        self.tanks = list(frame.tanks)
+        if frame.state_hash is not None and frame.state_hash != state_hash(self):
+            self.desync_frame = self.frames
+        self.frames += 1
+        return frame.dt
+
+    def handle_events(self):
+        for _ in pg.event.get(pg.QUIT):
+            self.running = False
+        pg.event.clear()
+
+    def choose_new_tank(self):
+        new_tanks = self.upgrade_menu.get_next_tanks()
+        return new_tanks[self.tanks.pop(0)] if self.tanks else new_tanks[0]
+
+    def run_transportation(self, dx, dy):
+        time = 0
+        while self.replaying and self.replay.frames[self.frames].transportation:
+            dt = self.next_frame()
+            if self.desync_frame is not None:
+                break
+            self.update_transportation(dt)
+            time += dt
+            if self.render:
+                self.handle_events()
+                self.draw_transportation(time, dx, dy)
+                pg.display.update()
+
+    def step(self):
+        dt = self.next_frame()
+        if self.desync_frame is not None:
+            return
+        self.sound_player.reset()
+        self.update(dt)
+        if self.render and self.running:
+            self.handle_events()
+            self.draw_background(self.screen)
+            self.draw_foreground()
+            pg.display.update()
+
+    def run(self, frames=None):
+        gc_scheduler.enter_combat()
+        while self.replaying and (frames is None or self.frames < frames):
+            self.step()
+        gc_scheduler.leave_combat()
+
+
+__all__ = ["Replay", "ReplayFrame", "ReplayRecorder", "ReplayInput", "ReplayGame", "state_hash"]
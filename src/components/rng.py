@@ -0,0 +1,39 @@
+from random import Random, randrange
+
+
+class RNG:
+    """Random number generators used by all gameplay code.
+
+    Randomness is split into independent streams, all derived from a single
+    run seed, so that a run can be reproduced frame by frame:
+        - world: generation of enemies in new rooms;
+        - ai: behaviour of all simulated objects: enemies, weapons,
+          bullets, bubbles and camera shaking;
+        - vfx: purely cosmetic randomness of circles and special effects.
+
+    Since no gameplay code draws numbers from the vfx stream, it can be
+    replaced with any other generator without changing the gameplay.
+    """
+    def __init__(self, seed=None):
+        self.run_seed = None
+        self.world = Random()
+        self.ai = Random()
+        self.vfx = Random()
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reseeds all streams from the given run seed.
+        If no seed is given, a new random seed is generated.
+        """
+        if seed is None:
+            seed = randrange(2 ** 32)
+        self.run_seed = seed
+        self.world.seed("%d world" % seed)
+        self.ai.seed("%d ai" % seed)
+        self.vfx.seed("%d vfx" % seed)
+
+
+rng = RNG()
+
+
+__all__ = ["RNG", "rng"]
@@ -1,13 +1,16 @@
 from math import pi
-from random import uniform, randint
 
 from data.constants import *
 
-from components.bubble import Bubble
+from components.bubble import make_bubble, update_bubbles, release_bubbles
 from components.utils import HF
-from components.enemy import make_enemy
+from components.rng import rng
+from components.enemy import make_enemy, update_enemies
 from components.spawner import Spawner
-from components.bullets import AllyInfector
+from components.bullets import AllyInfector, update_bullets, update_seekers, release_bullets, release_seekers
+from components.special_effects import update_effects, release_effects
+from components.entity_list import EntityList
+from components.entity_budget import EntityBudget, evict_oldest, evict_offscreen_first, merge_bubbles
 
 
 class Room:
@@ -23,23 +26,33 @@ class Room:
     in which bubbles are attracted to the player.
     """
     gravitation_radius = HF(1.5 * 160)
-    bullets = []
-    mines = []
-    seekers = []
-    bubbles = []
-    bottom_effects = []
-    top_effects = []
-    mobs = []
-    spawners = []
-
-    # temporary lists that store enemies and spawners of the next room during transportation of player
-    new_mobs = []
-    new_spawners = []
 
     def __init__(self, game):
         self.game = game
         self.player = game.player
 
+        rect = game.rect
+        self.bullets = EntityList(budget=EntityBudget("room bullets", evict_oldest, release_bullets))
+        self.mines = EntityList(budget=EntityBudget("room mines"))
+        self.seekers = EntityList(budget=EntityBudget("room seekers", evict_oldest, release_seekers))
+        self.bubbles = EntityList(budget=EntityBudget("bubbles", merge_bubbles, release_bubbles))
+        self.bottom_effects = EntityList(budget=EntityBudget("bottom effects", evict_offscreen_first,
+                                                             release_effects, rect))
+        self.top_effects = EntityList(budget=EntityBudget("top effects", evict_offscreen_first,
+                                                          release_effects, rect))
+        self.mobs = EntityList()
+        self.spawners = EntityList()
+        self.spawned_mobs_budget = EntityBudget("spawned mobs")
+
+        # temporary lists that store enemies and spawners of the next room during transportation of player
+        self.new_mobs = EntityList()
+        self.new_spawners = EntityList()
+
+    @property
+    def budgets(self) -> tuple:
+        return (self.bullets.budget, self.mines.budget, self.seekers.budget, self.bubbles.budget,
+                self.top_effects.budget, self.bottom_effects.budget, self.spawned_mobs_budget)
+
     @property
     def no_enemies(self) -> bool:
         return not self.mobs and not self.seekers
@@ -55,6 +68,7 @@ class Room:
                 self.mobs.append(enemy)
         for enemy in self.mobs:
             self.add_spawners(self.spawners, enemy, enemy.spawners_data)
+        self.gravitation_radius = 1.5 * self.player.bg_radius
 
     def set_new_enemies(self, enemies_dict: dict):
         self.new_mobs.clear()
@@ -78,6 +92,8 @@ class Room:
             spawners.append(Spawner(enemy, self.game, data))
 
     def spawn_enemy(self, name, x, y, angle=None):
+        if not self.spawned_mobs_budget.admit(self.mobs):
+            return
         enemy = make_enemy(self.game, name)
         enemy.set_pos(x, y)
         if angle is not None:
@@ -86,7 +102,7 @@ class Room:
         self.mobs.append(enemy)
 
     def spawn_leeched_bubble(self, x, y):
-        bubble = Bubble(self.game.rect, x, y, gravitation_radius=2*ROOM_RADIUS)
+        bubble = make_bubble(self.game.rect, x, y, gravitation_radius=2*ROOM_RADIUS)
         bubble.vel = 0
         self.bubbles.append(bubble)
 
@@ -97,6 +113,10 @@ class Room:
             self.mobs.append(enemy)
         for spawner in self.new_spawners:
             self.spawners.append(spawner)
+        release_bubbles(self.bubbles)
+        release_bullets(self.bullets)
+        release_effects(self.top_effects)
+        release_effects(self.bottom_effects)
         for obj in (self.bubbles, self.bullets, self.mines,
                     self.seekers, self.new_spawners, self.top_effects,
                     self.bottom_effects, self.new_mobs):
@@ -108,25 +128,19 @@ class Room:
             spawner.update_shape(0)
 
     def update_bullets(self, dt):
-        for bullet in self.bullets:
-            bullet.update(dt)
-        self.bullets = list(filter(lambda b: not b.killed, self.bullets))
+        update_bullets(self.bullets, dt)
 
     def update_mines(self, dt):
         for mine in self.mines:
             mine.update(dt)
-        self.mines = list(filter(lambda m: not m.killed, self.mines))[-50:]
+        self.mines.compact()
 
     def update_seekers(self, dt):
-        for seeker in self.seekers:
-            seeker.update(dt)
-        self.seekers = list(filter(lambda s: not s.killed, self.seekers))
+        update_seekers(self.seekers, dt)
+        self.seekers.compact()
 
     def update_bubbles(self, dt):
-        x, y = self.player.x, self.player.y
-        for bubble in self.bubbles:
-            bubble.update(x, y, dt)
-        self.bubbles = list(filter(lambda b: not b.is_outside, self.bubbles))
+        update_bubbles(self.bubbles, self.player.x, self.player.y, dt)
         if self.no_enemies:
             for bubble in self.bubbles:
                 bubble.maximize_gravity()
@@ -134,41 +148,39 @@ class Room:
     def update_spawners(self, dt):
         for spawner in self.spawners:
             spawner.update(dt)
-        self.spawners = list(filter(lambda s: not s.killed, self.spawners))
+        self.spawners.compact()
 
     def update_new_spawners(self, dt):
         for spawner in self.new_spawners:
             spawner.update(dt)
 
     def update_effects(self, dt):
-        for effect in self.top_effects:
-            effect.update(dt)
-        for effect in self.bottom_effects:
-            effect.update(dt)
-        self.top_effects = list(filter(lambda e: e.running, self.top_effects))
-        self.bottom_effects = list(filter(lambda e: e.running, self.bottom_effects))
+        update_effects(self.top_effects, dt)
+        update_effects(self.bottom_effects, dt)
 
     def set_gravity_radius(self):
         radius = 1.5 * self.game.player.bg_radius
         if not self.no_enemies:
             self.gravitation_radius = radius
             for bubble in self.bubbles:
-                bubble.gravitation_radius = radius
+                bubble.gravity_radius = radius
 
     def spawn_infectors(self, x, y):
-        for _ in range(randint(1, 3)):
-            infector = AllyInfector(self.game, self.game.rect, x, y, uniform(0, 2*pi))
+        # infectors look for their targets at once, while the mobs
+        # have already moved in this frame and the index is outdated
+        self.game.spatial_index.invalidate()
+        for _ in range(rng.ai.randint(1, 3)):
+            infector = AllyInfector(self.game, self.game.rect, x, y, rng.ai.uniform(0, 2*pi))
             infector.update(0)
             self.player.seekers.append(infector)
 
     def update_enemies(self, dt):
-        for enemy in self.mobs:
-            enemy.update(dt)
+        for enemy in update_enemies(self.mobs, dt):
             if enemy.killed:
                 self.add_bubbles(enemy)
                 if enemy.infected:
                     self.spawn_infectors(enemy.x, enemy.y)
-        self.mobs = list(filter(lambda m: not m.killed, self.mobs))
+        self.mobs.compact()
 
     def update_new_enemies(self, dt):
         for mob in self.new_mobs:
@@ -191,40 +203,46 @@ class Room:
         """
         for bubble_name, n in enemy.death_award.items():
             for i in range(n):
-                bubble = Bubble(self.game.rect, enemy.x, enemy.y,
-                                uniform(0, 2 * pi),
-                                self.gravitation_radius, bubble_name)
+                bubble = make_bubble(self.game.rect, enemy.x, enemy.y,
+                                     rng.ai.uniform(0, 2 * pi),
+                                     self.gravitation_radius, bubble_name)
                 self.bubbles.append(bubble)
 
     def draw_bubbles(self, surface, dx, dy):
+        interpolate = self.game.timestep.interpolate
         for bubble in self.bubbles:
-            bubble.draw(surface, dx, dy)
+            bubble.draw(surface, *interpolate(bubble, dx, dy))
 
     def draw_enemies(self, surface, dx, dy):
+        interpolate = self.game.timestep.interpolate
         for enemy in self.mobs:
-            enemy.draw(surface, dx, dy)
+            enemy.draw(surface, *interpolate(enemy, dx, dy))
 
     def draw_new_enemies(self, surface, dx, dy):
+        interpolate = self.game.timestep.interpolate
         for enemy in self.new_mobs:
-            enemy.draw(surface, dx, dy)
+            enemy.draw(surface, *interpolate(enemy, dx, dy))
 
     def draw_mines(self, surface, dx, dy):
         for mine in self.mines:
             mine.draw(surface, dx, dy)
 
     def draw_bullets(self, surface, dx, dy):
+        interpolate = self.game.timestep.interpolate
         for bullet in self.bullets:
-            bullet.draw(surface, dx, dy)
+            bullet.draw(surface, *interpolate(bullet, dx, dy))
         for bullet in self.seekers:
-            bullet.draw(surface, dx, dy)
+            bullet.draw(surface, *interpolate(bullet, dx, dy))
 
     def draw_spawners(self, surface, dx, dy):
+        interpolate = self.game.timestep.interpolate
         for spawner in self.spawners:
-            spawner.draw(surface, dx, dy)
+            spawner.draw(surface, *interpolate(spawner, dx, dy))
 
     def draw_new_spawners(self, surface, dx, dy):
+        interpolate = self.game.timestep.interpolate
         for spawner in self.new_spawners:
-            spawner.draw(surface, dx, dy)
+            spawner.draw(surface, *interpolate(spawner, dx, dy))
 
     def draw_top_effects(self, surface, dx, dy):
         for effect in self.top_effects:
@@ -1,14 +1,25 @@
-from components.circle import make_circles_list
+from components.circle import make_circles
 
 
 class Body:
-    """Used for bullets and pickup-bubbles. """
-    def __init__(self, owner, screen_rect, circles_data):
+    """Used for bullets and pickup-bubbles. Circles of the body are made
+    from a template shared by all bodies of the same kind.
+    """
+    __slots__ = ("owner", "circles", "angle")
+
+    def __init__(self, owner, screen_rect, template):
         self.owner = owner
-        self.circles = make_circles_list(screen_rect, circles_data)
+        self.circles = make_circles(screen_rect, template)
         self.angle = 0
         self.update_shape(0)
 
+    def reset(self):
+        """Restores the initial shape of a body of a recycled object. """
+        self.angle = 0
+        for circle in self.circles:
+            circle.reset()
+        self.update_shape(0)
+
     def rotate(self, angle):
         for circle in self.circles:
             circle.angle += angle
@@ -0,0 +1,164 @@
+from collections import defaultdict
+from math import hypot
+
+from components.utils import HF
+
+
+# groups of targets
+MOBS = 1
+SEEKERS = 2
+SPAWNERS = 4
+ALL_TARGETS = MOBS | SEEKERS | SPAWNERS
+
+
+class SpatialIndex:
+    """Grid of centers of all enemy targets in the room: mobs, enemy
+    seekers and spawners. Answers nearest-target and radius queries
+    of seekers, explosions and superpowers.
+
+    The index is built on the first query in a frame and invalidated by
+    the game at the beginning of every frame, since targets move during
+    the room update. Queries made during the room update after the mobs
+    have moved, such as the ones of infectors spawned by dying mobs,
+    must invalidate the index first, because targets may have left the
+    cells they were indexed in. Targets appended to the room lists in
+    the middle of a frame are added to the index on the next query.
+
+    Every target gets a key reflecting its position in the room lists,
+    so that queries return targets in the same order in which the room
+    stores them, and ties are resolved in favour of the first target.
+    When entities are removed from a list, positions of the rest of them
+    change, so the index is rebuilt.
+    """
+    KEY_SHIFT = 20
+
+    def __init__(self, room, cell_size=HF(256)):
+        self.room = room
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.groups = ()
+        self.sizes = []
+        self.removed = []
+        self.max_radius = 0
+        self.bounds = None
+        self.valid = False
+
+    def invalidate(self):
+        self.valid = False
+
+    def sync(self) -> bool:
+        """Builds the index if it's invalid or entities were removed from
+        the room lists or the lists were replaced, otherwise adds targets appended to the lists since the last sync.
+        Returns True if any targets were added.
+        """
+        groups = self.room.mobs, self.room.seekers, self.room.spawners
+        if (not self.valid or
+                any(group is not old or group.removed != removed
+                    for group, old, removed in zip(groups, self.groups, self.removed))):
+            self.cells.clear()
+            self.groups = groups
+            self.sizes = [0] * len(groups)
+            self.removed = [group.removed for group in groups]
+            self.max_radius = 0
+            self.bounds = None
+            self.valid = True
+
+        added = False
+        cells = self.cells
+        size = self.cell_size
+        for n, group in enumerate(groups):
+            start = self.sizes[n]
+            if start == len(group):
+                continue
+            for i in range(start, len(group)):
+                target = group[i]
+                cell_x, cell_y = int(target.x // size), int(target.y // size)
+                cells[cell_x, cell_y].append(((n << self.KEY_SHIFT) + i, 1 << n, target))
+                self.max_radius = max(self.max_radius, target.radius)
+                if self.bounds is None:
+                    self.bounds = [cell_x, cell_y, cell_x, cell_y]
+                else:
+                    bounds = self.bounds
+                    bounds[0] = min(bounds[0], cell_x)
+                    bounds[1] = min(bounds[1], cell_y)
+                    bounds[2] = max(bounds[2], cell_x)
+                    bounds[3] = max(bounds[3], cell_y)
+            self.sizes[n] = len(group)
+            added = True
+        return added
+
+    def find(self, x, y, radius, groups, touching, min_key) -> list:
+        """Returns (key, target) pairs of the targets within radius with keys
+        greater than 'min_key', sorted by keys in descending order.
+        """
+        found = []
+        cells = self.cells
+        size = self.cell_size
+        extent = radius + self.max_radius if touching else radius
+        for cell_x in range(int((x - extent) // size), int((x + extent) // size) + 1):
+            for cell_y in range(int((y - extent) // size), int((y + extent) // size) + 1):
+                cell = cells.get((cell_x, cell_y))
+                if cell is None:
+                    continue
+                for key, group, target in cell:
+                    if key <= min_key or not group & groups:
+                        continue
+                    r = radius + target.radius if touching else radius
+                    if hypot(target.x - x, target.y - y) <= r:
+                        found.append((key, target))
+        found.sort(key=lambda item: item[0], reverse=True)
+        return found
+
+    def within_radius(self, x, y, radius, groups=ALL_TARGETS, touching=False):
+        """Yields targets whose centers are within radius from the point,
+        or, if 'touching' is True, whose circles intersect the circle.
+        Targets are yielded in the order of the room lists. Targets added
+        to the room while iterating are yielded too if they are within radius
+        and come later in the room lists than the last yielded target.
+        """
+        self.sync()
+        found = self.find(x, y, radius, groups, touching, -1)
+        while found:
+            key, target = found.pop()
+            yield target
+            if self.sync():
+                found = self.find(x, y, radius, groups, touching, key)
+
+    def nearest(self, x, y, groups=ALL_TARGETS, filter=None):
+        """Returns the target nearest to the point among the targets
+        satisfying the filter, or None if there is no such target.
+        """
+        self.sync()
+        if self.bounds is None:
+            return None
+        cells = self.cells
+        size = self.cell_size
+        x_0, y_0 = int(x // size), int(y // size)
+        min_x, min_y, max_x, max_y = self.bounds
+        max_ring = max(x_0 - min_x, max_x - x_0, y_0 - min_y, max_y - y_0)
+
+        best = None
+        best_distance = best_key = 0
+        ring = 0
+        while ring <= max_ring:
+            for cell_x in range(x_0 - ring, x_0 + ring + 1):
+                step = 1 if abs(cell_x - x_0) == ring else 2 * ring
+                for cell_y in range(y_0 - ring, y_0 + ring + 1, step):
+                    cell = cells.get((cell_x, cell_y))
+                    if cell is None:
+                        continue
+                    for key, group, target in cell:
+                        if not group & groups or filter is not None and not filter(target):
+                            continue
+                        distance = hypot(x - target.x, y - target.y)
+                        if (best is None or distance < best_distance or
+                                distance == best_distance and key < best_key):
+                            best, best_distance, best_key = target, distance, key
+            # all targets in farther rings are at least 'ring * size' away from the point
+            if best is not None and best_distance < ring * size:
+                break
+            ring += 1
+        return best
+
+
+__all__ = ["SpatialIndex", "MOBS", "SEEKERS", "SPAWNERS", "ALL_TARGETS"]
@@ -1,17 +1,20 @@
 from math import cos, sin, pi
-from random import uniform
 import pygame as pg
 
 from assets.paths import ENEMY_DEATH
 from data.shapes import SHAPES
 
 from components.bullets import EnemySeeker
+from components.bullet_specs import BULLET_SPECS
 from components.circle import make_circle
-from components.special_effects import add_effect
 from components.utils import *
+from components.rng import rng
 
 
 class Spawner:
+    __slots__ = ("owner", "game", "screen_rect", "distance", "angle", "x", "y", "circle",
+                 "radius", "rect", "killed")
+
     def __init__(self, owner, game, data):
         self.owner = owner
         self.game = game
@@ -42,15 +45,16 @@ class Spawner:
 
     def receive_damage(self, damage):
         for _ in range(8):
-            offset = uniform(0, self.radius)
-            angle = uniform(0, 2 * pi)
+            offset = rng.ai.uniform(0, self.radius)
+            angle = rng.ai.uniform(0, 2 * pi)
             x = self.x + offset * cos(angle)
             y = self.y - offset * sin(angle)
-            seeker = EnemySeeker(self.game, "enemy seeker", self.game.rect, x, y, angle, 0.009, -5, 0.3)
+            seeker = EnemySeeker(self.game, BULLET_SPECS["enemy seeker"], self.game.rect,
+                                 x, y, angle, 0.009, -5, 0.3)
             seeker.update(0)
             self.game.room.seekers.append(seeker)
 
-        add_effect("SpawnerBurst", self.game.room.top_effects, self.x, self.y)
+        self.game.events.add_effect("SpawnerBurst", self.game.room.top_effects, self.x, self.y)
         self.killed = True
         self.game.sound_player.play_sound(ENEMY_DEATH)
 
@@ -1,9 +1,11 @@
 import pygame as pg
-from random import uniform
 from math import pi, sin, cos
 
 from components.circle import make_circle
 from components.utils import *
+from components.rng import rng
+from components.object_pool import effect_pool
+from components.render_queue import render_queue
 from data.constants import *
 from data.bullets import BULLETS
 from assets.paths import *
@@ -20,13 +22,20 @@ images = {
 
 
 class Line:
+    __slots__ = ("X0", "Y0", "X1", "Y1", "vel_x", "vel_y", "widths")
+
     def __init__(self, x, y, size, alpha, duration):
         if size == 'SmallHitLines':
             self.widths = [H(3), H(5), H(6)]
-            length = uniform(HF(59), HF(251))
         else:
             self.widths = [H(8), H(11), H(14)]
-            length = uniform(HF(216), HF(616))
+        self.reset(x, y, size, alpha, duration)
+
+    def reset(self, x, y, size, alpha, duration):
+        if size == 'SmallHitLines':
+            length = rng.vfx.uniform(HF(59), HF(251))
+        else:
+            length = rng.vfx.uniform(HF(216), HF(616))
 
         radius = HF(32)
         cosa, sina = cos(alpha), sin(alpha)
@@ -57,13 +66,23 @@ class Line:
 
 
 class SpecialEffect:
+    __slots__ = ("name", "x", "y", "t", "duration", "running")
+
     def __init__(self, x, y, duration):
+        self.name = None
         self.x = x
         self.y = y
         self.t = 0
         self.duration = duration
         self.running = True
 
+    def reset(self, x, y):
+        """Restarts a recycled effect at the given position. """
+        self.x = x
+        self.y = y
+        self.t = 0
+        self.running = True
+
     @staticmethod
     def set_image(name, size):
         return pg.transform.scale(images[name], (size, size))
@@ -78,19 +97,30 @@ class SpecialEffect:
 
 
 class BulletHitLines(SpecialEffect):
+    __slots__ = ("size", "lines")
+
     def __init__(self, x, y, size: str):
         super().__init__(x, y, duration=90)
+        self.size = size
         self.lines = self.create_lines(size)
 
     def create_lines(self, size):
         lines = []
         beta = 0
         for i in range(4):
-            angle = uniform(pi/16, 7*pi/16) + beta
+            angle = rng.vfx.uniform(pi/16, 7*pi/16) + beta
             beta += pi/2
             lines.append(Line(self.x, self.y, size, angle, self.duration))
         return lines
 
+    def reset(self, x, y):
+        super().reset(x, y)
+        beta = 0
+        for line in self.lines:
+            angle = rng.vfx.uniform(pi/16, 7*pi/16) + beta
+            beta += pi/2
+            line.reset(x, y, self.size, angle, self.duration)
+
     def update(self, dt):
         super().update(dt)
 
@@ -98,11 +128,15 @@ class BulletHitLines(SpecialEffect):
             line.update(dt)
 
     def draw(self, surface, dx, dy):
+        render_queue.draw(surface, self.draw_lines, dx, dy)
+
+    def draw_lines(self, surface, dx, dy):
         for line in self.lines:
             line.draw(surface, dx, dy)
 
 
 class LeechEffect(SpecialEffect):
+    __slots__ = ()
     circles_data = [
         # radius  |  width
         (H(4.224),  H(1)),
@@ -137,6 +171,9 @@ class LeechEffect(SpecialEffect):
         super().__init__(x, y, duration=249)
 
     def draw(self, screen, dx, dy):
+        render_queue.draw(screen, self.draw_circles, dx, dy)
+
+    def draw_circles(self, screen, dx, dy):
         frame = min(13, int(14 * self.t / self.duration))
         for index in self.frames[frame]:
             r, w = self.circles_data[index]
@@ -144,10 +181,12 @@ class LeechEffect(SpecialEffect):
 
 
 class StarsAroundMob(SpecialEffect):
+    __slots__ = ("angle", "timer", "radius", "big_stars_marker")
+
     def __init__(self, mob_x, mob_y, mob_radius):
         super().__init__(mob_x, mob_y, duration=2000)
 
-        self.angle = uniform(0, 2*pi)
+        self.angle = rng.vfx.uniform(0, 2*pi)
         self.timer = 0
         self.radius = mob_radius + HF(60)
         self.big_stars_marker = True
@@ -189,6 +228,9 @@ class StarsAroundMob(SpecialEffect):
         pg.draw.circle(screen, WHITE, (x, y), H(5))
 
     def draw(self, screen, dx, dy):
+        render_queue.draw(screen, self.draw_stars, dx, dy)
+
+    def draw_stars(self, screen, dx, dy):
         if self.big_stars_marker:
             for pos in self.get_stars_coords(dx, dy):
                 self.draw_big_star(screen, *pos)
@@ -198,12 +240,18 @@ class StarsAroundMob(SpecialEffect):
 
 
 class SpriteEffect(SpecialEffect):
+    __slots__ = ("surfaces", "index", "fixed")
+
     def __init__(self, x, y, surfaces, duration, fixed=False):
         super().__init__(x, y, duration)
         self.surfaces = surfaces
         self.index = 0
         self.fixed = fixed
 
+    def reset(self, x, y):
+        super().reset(x, y)
+        self.index = 0
+
     def update(self, dt):
         super().update(dt)
         self.index = min(len(self.surfaces) - 1, int(self.t/self.duration * len(self.surfaces)))
@@ -212,8 +260,8 @@ class SpriteEffect(SpecialEffect):
         surface = self.surfaces[self.index]
         if self.fixed:
             dx = dy = 0
-        screen.blit(surface, (self.x - surface.get_width()/2 - dx,
-                              self.y - surface.get_height()/2 - dy))
+        render_queue.blit(screen, surface, (self.x - surface.get_width()/2 - dx,
+                                            self.y - surface.get_height()/2 - dy))
 
 
 def _init_conversion_surfaces() -> list:
@@ -518,38 +566,69 @@ infection_surfaces = _init_infection_surfaces()
 
 
 def add_effect(name, effects, x=0, y=0, radius=0):
-    if name in ('SmallHitLines', 'BigHitLines'):
-        effects.append(BulletHitLines(x, y, name))
+    if name == 'StarsAroundMob':
+        effects.append(StarsAroundMob(x, y, radius))
+        return
+    if name in ("Flash", "SapperAttack"):
+        x, y = SCR_W2, SCR_H2
+
+    effect = effect_pool.acquire(name)
+    if effect is not None:
+        effect.reset(x, y)
+    elif name in ('SmallHitLines', 'BigHitLines'):
+        effect = BulletHitLines(x, y, name)
     elif name == 'LightRedCircle':
-        effects.append(SpriteEffect(x, y, light_red_circle_surfaces, 126))
+        effect = SpriteEffect(x, y, light_red_circle_surfaces, 126)
     elif name == 'RedCircle':
-        effects.append(SpriteEffect(x, y, red_circle_surfaces, 126))
+        effect = SpriteEffect(x, y, red_circle_surfaces, 126)
     elif name == 'StickyCircle':
-        effects.append(SpriteEffect(x, y, sticky_circle_surfaces, 108))
+        effect = SpriteEffect(x, y, sticky_circle_surfaces, 108)
     elif name == 'Shield':
-        effects.append(SpriteEffect(x, y, shield_surfaces, 452, fixed=True))
+        effect = SpriteEffect(x, y, shield_surfaces, 452, fixed=True)
     elif name == "StunBurst":
-        effects.append(SpriteEffect(x, y, stun_burst_surfaces, 397))
+        effect = SpriteEffect(x, y, stun_burst_surfaces, 397)
     elif name == 'StunBurstLarge':
-        effects.append(SpriteEffect(x, y, stun_burst_large_surfaces, 397))
+        effect = SpriteEffect(x, y, stun_burst_large_surfaces, 397)
     elif name == 'DamageBurst':
-        effects.append(SpriteEffect(x, y, damage_burst_surfaces, 253))
+        effect = SpriteEffect(x, y, damage_burst_surfaces, 253)
     elif name == 'DamageBurstLarge':
-        effects.append(SpriteEffect(x, y, damage_burst_large_surfaces, 253))
+        effect = SpriteEffect(x, y, damage_burst_large_surfaces, 253)
     elif name == "Conversion":
-        effects.append(SpriteEffect(x, y, conversion_surfaces, 344))
+        effect = SpriteEffect(x, y, conversion_surfaces, 344)
     elif name == "Flash":
-        effects.append(SpriteEffect(SCR_W2, SCR_H2, flash_surfaces, 83, fixed=True))
-    elif name == 'StarsAroundMob':
-        effects.append(StarsAroundMob(x, y, radius))
+        effect = SpriteEffect(x, y, flash_surfaces, 83, fixed=True)
     elif name == "Teleport":
-        effects.append(SpriteEffect(x, y, teleport_surfaces, 193))
+        effect = SpriteEffect(x, y, teleport_surfaces, 193)
     elif name == "SpawnerBurst":
-        effects.append(SpriteEffect(x, y, spawner_burst_surfaces, 108))
+        effect = SpriteEffect(x, y, spawner_burst_surfaces, 108)
     elif name == "SapperAttack":
-        effects.append(SpriteEffect(SCR_W2, SCR_H2, sapper_attack_surfaces, 144, fixed=True))
+        effect = SpriteEffect(x, y, sapper_attack_surfaces, 144, fixed=True)
     elif name == "LeechEffect":
-        effects.append(LeechEffect(x, y))
-
-
-__all__ = ["add_effect", "sapper_surfaces", "infection_surfaces"]
+        effect = LeechEffect(x, y)
+    else:
+        return
+    effect.name = name
+    effects.append(effect)
+
+
+def update_effects(effects, dt):
+    """Updates all effects of the entity list and removes finished effects
+    from the list. Finished effects are released to the pool.
+    """
+    for i, effect in enumerate(effects):
+        effect.update(dt)
+        if not effect.running:
+            if effect.name is not None:
+                effect_pool.release(effect.name, effect)
+            effects[i] = None
+    effects.remove_none()
+
+
+def release_effects(effects):
+    """Releases effects of the list to the pool before the list is cleared. """
+    for effect in effects:
+        if effect.name is not None:
+            effect_pool.release(effect.name, effect)
+
+
+__all__ = ["add_effect", "update_effects", "release_effects", "sapper_surfaces", "infection_surfaces"]
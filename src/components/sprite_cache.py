@@ -0,0 +1,201 @@
+from collections import OrderedDict
+from math import cos, sin, pi, ceil
+import pygame as pg
+
+from data.constants import *
+
+
+def new_sprite(w, h) -> pg.Surface:
+    sprite = pg.Surface((w, h))
+    if pg.display.get_surface() is not None:
+        sprite = sprite.convert()
+    sprite.fill(COLOR_KEY)
+    return sprite
+
+
+def render_circle(sprite, circle, x, y, r, angle=None):
+    """Draws the circle with the rounded radius r and its center at (x, y)
+    the same way the circle draws itself. If the angle is given, the glares
+    are drawn as well, turned by the angle.
+    """
+    pg.draw.circle(sprite, circle.edge_color, (x, y), r)
+    pg.draw.circle(sprite, circle.color, (x, y), r - circle.edge)
+    if angle is not None:
+        radius = r - circle.edge
+        for glare in circle.glares:
+            glare_x = x + glare.offset_factor * radius * cos(glare.angle + angle)
+            glare_y = y - glare.offset_factor * radius * sin(glare.angle + angle)
+            pg.draw.circle(sprite, glare.color, (round(glare_x), round(glare_y)), glare.radius_coeff * radius)
+
+
+class SpriteCache:
+    """LRU cache of pre-rendered sprites.
+
+    When the total size of the sprites exceeds 'max_bytes', the least
+    recently used sprites are dropped. Angles are quantized into
+    'angle_steps' steps, so that shapes turning slowly share sprites.
+    The cache counts hits, misses and dropped sprites. If 'enabled'
+    is False, the shapes are drawn directly, which can be used
+    to compare the two paths.
+    """
+    name = "Sprites"
+
+    def __init__(self, max_bytes, angle_steps, enabled):
+        self.sprites = OrderedDict()
+        self.max_bytes = max_bytes
+        self.angle_steps = angle_steps
+        self.enabled = enabled
+        self.bytes = 0
+        self.peak_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0
+
+    def report(self) -> str:
+        return ("%s: %d of %d requests hit (%.1f%%), %d sprites, "
+                "%.1f KB (peak %.1f KB), %d dropped" %
+                (self.name, self.hits, self.hits + self.misses, 100 * self.hit_rate, len(self.sprites),
+                 self.bytes / 1024, self.peak_bytes / 1024, self.evictions))
+
+    def angle_step(self, angle) -> int:
+        return round(angle * self.angle_steps / (2*pi)) % self.angle_steps
+
+    def step_angle(self, step) -> float:
+        return 2 * pi * step / self.angle_steps
+
+    def lookup(self, key):
+        """Returns the cached entry of the key or None. """
+        entry = self.sprites.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, entry):
+        self.sprites[key] = entry
+        self.bytes += self.entry_bytes(entry)
+        while self.bytes > self.max_bytes and len(self.sprites) > 1:
+            _, old_entry = self.sprites.popitem(last=False)
+            self.bytes -= self.entry_bytes(old_entry)
+            self.evictions += 1
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+
+    @staticmethod
+    def sprite_bytes(sprite) -> int:
+        return sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
+
+    def entry_bytes(self, entry) -> int:
+        return self.sprite_bytes(entry)
+
+    def clear(self):
+        self.sprites.clear()
+        self.bytes = 0
+
+
+class CircleSpriteCache(SpriteCache):
+    """Cache of pre-rendered circles with their glares.
+
+    A circle is drawn with two 'pg.draw.circle' calls for the edge and
+    the fill and four more for the glares, which also have to be moved
+    around the circle every frame. Instead, the circle is rendered once
+    into a sprite, which is blitted afterwards. Sprites are keyed by the
+    colors of the circle and its glares, its rounded radius, its edge,
+    the set of its glares and the quantized angle of the glares.
+    Circles larger than 'max_radius' are few, and their sprites would
+    take more memory than drawing them saves, so they are drawn directly.
+    """
+    name = "Circle sprites"
+
+    def __init__(self, max_bytes=CIRCLE_SPRITES_MAX_BYTES, max_radius=CIRCLE_SPRITES_MAX_RADIUS,
+                 angle_steps=CIRCLE_SPRITES_ANGLE_STEPS, enabled=CIRCLE_SPRITES_ENABLED):
+        super().__init__(max_bytes, angle_steps, enabled)
+        self.max_radius = max_radius
+
+    def get(self, circle, r, with_glares=True) -> pg.Surface:
+        """Returns the sprite of the circle with the given rounded radius. """
+        glares = circle.glares
+        step = self.angle_step(circle.glares_angle) if with_glares else -1
+        key = (circle.color, circle.edge_color, glares[0].color, glares[2].color,
+               r, circle.edge, glares[0].angle, step)
+        sprite = self.lookup(key)
+        if sprite is None:
+            sprite = self.render(circle, r, step)
+            self.store(key, sprite)
+        return sprite
+
+    def render(self, circle, r, step) -> pg.Surface:
+        """Draws the circle in the center of a new sprite
+        with glares turned by the quantized angle.
+        """
+        sprite = new_sprite(2*r + 1, 2*r + 1)
+        render_circle(sprite, circle, r, r, r, self.step_angle(step) if step >= 0 else None)
+        sprite.set_colorkey(COLOR_KEY, pg.RLEACCEL)
+        return sprite
+
+
+class BakedSpriteCache(SpriteCache):
+    """Cache of runs of rigid circles baked into one sprite.
+
+    Fixed circles of a body keep their places relative to the body and
+    their radii, so a run of them looks the same whenever the body has
+    the same angle. Such a run is rendered once per quantized angle of
+    the body and drawn with one blit instead of one blit per circle.
+    Only runs within 'max_radius' of the center of the body are baked,
+    since sprites of runs spread around large bodies would be mostly empty.
+    Sprites are keyed by the circles of the run, their colors, which
+    change when the body is infected, and the angle step. An entry is
+    the sprite with the position of the first circle of the run in it.
+    """
+    name = "Baked sprites"
+
+    def __init__(self, max_bytes=BAKED_SPRITES_MAX_BYTES, max_radius=BAKED_SPRITES_MAX_RADIUS,
+                 angle_steps=BAKED_SPRITES_ANGLE_STEPS, enabled=BAKED_SPRITES_ENABLED):
+        super().__init__(max_bytes, angle_steps, enabled)
+        self.max_radius = max_radius
+
+    def entry_bytes(self, entry) -> int:
+        return self.sprite_bytes(entry[0])
+
+    def get(self, run, angle) -> tuple:
+        """Returns the sprite of the run of circles of a body turned by the angle
+        and the position of the first circle of the run in the sprite.
+        """
+        step = self.angle_step(angle)
+        key = (run.key, run.colors, step)
+        entry = self.lookup(key)
+        if entry is None:
+            entry = self.render(run.circles, self.step_angle(step))
+            self.store(key, entry)
+        return entry
+
+    @staticmethod
+    def render(circles, angle) -> tuple:
+        """Draws the circles around the center of a new sprite
+        as they are placed around a body turned by the angle.
+        """
+        size = ceil(max(circle.distance + circle.radius for circle in circles)) + 1
+        sprite = new_sprite(2*size + 1, 2*size + 1)
+        positions = []
+        for circle in circles:
+            x = round(size + circle.distance * cos(circle.angle + angle))
+            y = round(size - circle.distance * sin(circle.angle + angle))
+            glares_angle = circle.angle + angle if circle.radius >= 6 else None
+            render_circle(sprite, circle, x, y, round(circle.radius), glares_angle)
+            positions.append((x, y))
+        sprite.set_colorkey(COLOR_KEY, pg.RLEACCEL)
+        return (sprite, *positions[0])
+
+
+circle_sprites = CircleSpriteCache()
+baked_sprites = BakedSpriteCache()
+
+
+__all__ = ["SpriteCache", "CircleSpriteCache", "BakedSpriteCache", "circle_sprites",
+           "baked_sprites", "render_circle"]
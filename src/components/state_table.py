@@ -0,0 +1,40 @@
+class StateTable:
+    """Table of component states of a type of mob, shared by all its instances.
+
+    The data of "circles states" and "guns states" maps ranges of states
+    (health points) to indexes of components. Each range becomes a group
+    of indexes, and 'group_of' gives the group of every state, so a mob
+    stores one list of components per group instead of one per state.
+    When ranges overlap, the later range wins, as in a dict of states.
+    """
+    __slots__ = ("groups", "group_of")
+
+    def __init__(self, states_data: dict):
+        groups = []
+        group_of = []
+        for (left, right), indexes in states_data.items():
+            if len(group_of) <= right:
+                group_of.extend([None] * (right + 1 - len(group_of)))
+            for state in range(left, right + 1):
+                group_of[state] = len(groups)
+            groups.append(tuple(indexes))
+        self.groups = tuple(groups)
+        self.group_of = tuple(group_of)
+
+    def select(self, components) -> list:
+        """Returns the list of components of every group. """
+        return [[components[i] for i in group] for group in self.groups]
+
+
+state_tables = dict()
+
+
+def get_state_table(key, states_data: dict) -> StateTable:
+    """Returns the table of the states data, built once for the given key. """
+    table = state_tables.get(key)
+    if table is None:
+        table = state_tables[key] = StateTable(states_data)
+    return table
+
+
+__all__ = ["StateTable", "get_state_table", "state_tables"]
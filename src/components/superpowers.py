@@ -1,5 +1,5 @@
 import pygame as pg
-from math import cos, sin, hypot, pi
+from math import cos, sin, pi
 
 from data.constants import *
 from data.superpowers.seekers import SEEKERS_COORDS
@@ -8,6 +8,8 @@ from assets.paths import *
 
 from .special_effects import *
 from .bullets import *
+from .bullet_specs import BULLET_SPECS
+from .spatial_index import MOBS
 from .utils import *
 
 
@@ -53,7 +55,7 @@ class Seekers(SuperPower):
             start_angle = self.player.body.angle + angle
             x = self.player.x + r * cos(start_angle)
             y = self.player.y - r * sin(start_angle)
-            seeker = Seeker(self.game, "ally seeker", self.screen_rect, x, y,
+            seeker = Seeker(self.game, BULLET_SPECS["ally seeker"], self.screen_rect, x, y,
                             start_angle, 0.01, -5, self.seeker_vel)
             seeker.update(0)
             self.player.seekers.append(seeker)
@@ -129,10 +131,9 @@ class BaseStunBurst(SuperPower):
         angle = self.player.body.angle
         x = self.player.x + self.offset * cos(angle)
         y = self.player.y - self.offset * sin(angle)
-        for enemy in self.game.room.mobs:
-            if hypot(x - enemy.x, y - enemy.y) <= self.radius:
-                enemy.become_stunned()
-                add_effect('StarsAroundMob', self.game.room.top_effects, enemy.x, enemy.y, enemy.radius)
+        for enemy in self.game.spatial_index.within_radius(x, y, self.radius, MOBS):
+            enemy.become_stunned()
+            add_effect('StarsAroundMob', self.game.room.top_effects, enemy.x, enemy.y, enemy.radius)
         add_effect(self.effect, self.game.room.bottom_effects, x, y)
         add_effect('Flash', self.game.room.top_effects)
         self.game.camera.start_shaking(300)
@@ -168,10 +169,9 @@ class AreaBurst(SuperPower):
         angle = self.player.body.angle
         x = self.player.x + self.offset * cos(angle)
         y = self.player.y - self.offset * sin(angle)
-        for enemy in self.game.room.mobs:
-            if hypot(x - enemy.x, y - enemy.y) <= self.radius:
-                enemy.receive_damage(-30, play_sound=False)
-                add_effect('BigHitaaaasLines', self.game.room.top_effects, enemy.x, enemy.y)
+        for enemy in self.game.spatial_index.within_radius(x, y, self.radius, MOBS):
+            enemy.receive_damage(-30, play_sound=False)
+            add_effect('BigHitaaaasLines', self.game.room.top_effects, enemy.x, enemy.y)
 
         add_effect('DamageBurstLarge', self.game.room.bottom_effects, x, y)
         add_effect('Flash', self.game.room.top_effects)
@@ -186,7 +186,7 @@ class Teleport(SuperPower):
     def activate(self):
         add_effect('Teleport', self.game.room.top_effects, self.player.x, self.player.y)
         add_effect('Flash', self.game.room.top_effects)
-        x, y = pg.mouse.get_pos()
+        x, y = self.game.mouse_pos
         self.player.x += x - SCR_W2
         self.player.y += y - SCR_H2
         self.game.camera.update(self.player.x, self.player.y, 0)
@@ -304,7 +304,8 @@ class StickyBurst(SuperPower):
         y = self.player.y - self.offset * sin(body_angle)
         for i in range(36):
             angle = i * pi/18
-            bullet = RegularBullet("sticky", self.screen_rect, x, y, 0, HF(0.9), angle)
+            bullet = make_bullet(RegularBullet, BULLET_SPECS["sticky"], self.screen_rect,
+                                 x, y, 0, HF(0.9), angle)
             self.player.bullets.append(bullet)
 # _________________________________________________________________________________________________
 
@@ -319,7 +320,7 @@ class DroneConversion(SuperPower):
     def activate(self):
         for seeker in self.game.room.seekers:
             seeker.killed = True
-            ally_seeker = Seeker(self.game, "ally seeker", self.screen_rect, seeker.x,
+            ally_seeker = Seeker(self.game, BULLET_SPECS["ally seeker"], self.screen_rect, seeker.x,
                                  seeker.y, -seeker.angle, 0.01, -5, self.seeker_vel)
             seeker.update(0)
             self.player.seekers.append(ally_seeker)
@@ -343,7 +344,8 @@ class MassiveCannon(SuperPower):
         angle = self.player.body.angle
         x = self.player.x + self.offset * cos(angle)
         y = self.player.y - self.offset * sin(angle)
-        bullet = RegularBullet("massive bullet", self.screen_rect, x, y, -200, HF(0.9), angle)
+        bullet = make_bullet(RegularBullet, BULLET_SPECS["massive bullet"], self.screen_rect,
+                             x, y, -200, HF(0.9), angle)
         self.player.bullets.append(bullet)
         add_effect("Flash", self.game.room.top_effects, *self.player.get_mouse_pos())
         self.game.camera.start_shaking(750)
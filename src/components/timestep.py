@@ -0,0 +1,91 @@
+from time import perf_counter
+
+
+class FixedTimestep:
+    """Splits real frame time into fixed simulation steps.
+
+    Elapsed time is measured with a high-resolution counter and collected
+    in an accumulator, from which whole steps are consumed every frame.
+    At most 'max_steps' steps are run per frame, the rest of the time is
+    dropped, so that a long hitch can't make the game spiral down trying
+    to catch up with real time.
+
+    Since the frame is drawn between two simulation steps, positions of
+    moving objects are saved before the last step of the frame, and the
+    objects are drawn interpolated between the saved and the current positions.
+    """
+    def __init__(self, step, max_steps, enabled=True):
+        self.step = step
+        self.max_steps = max_steps
+        self.enabled = enabled
+        self.accumulator = 0
+        self.steps_left = 0
+        self.last_time = perf_counter()
+        self.camera_pos = None
+        self.positions = dict()
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of the step the drawn frame is ahead of the saved positions. """
+        return self.accumulator / self.step
+
+    @property
+    def last_step(self) -> bool:
+        return self.steps_left == 0
+
+    def reset(self):
+        """Method is called when the game loop was interrupted, for example
+        by a menu or a transportation. Drops all accumulated time and saved positions.
+        """
+        self.accumulator = 0
+        self.steps_left = 0
+        self.last_time = perf_counter()
+        self.camera_pos = None
+        self.positions.clear()
+
+    def start_frame(self):
+        """Adds time elapsed since the previous frame to the accumulator
+        and calculates the number of steps to run in this frame.
+        """
+        time = perf_counter()
+        self.accumulator += 1000 * (time - self.last_time)
+        self.last_time = time
+
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator %= self.step
+        else:
+            self.accumulator -= steps * self.step
+        self.steps_left = steps
+
+    def next_step(self) -> bool:
+        if self.steps_left == 0:
+            return False
+        self.steps_left -= 1
+        return True
+
+    def save_positions(self, camera, objects):
+        self.camera_pos = camera.offset
+        self.positions = {obj: (obj.x, obj.y) for obj in objects}
+
+    def camera_offset(self, camera):
+        """Returns camera offset interpolated between the last two steps. """
+        if self.camera_pos is None:
+            return camera.offset
+        k = 1 - self.alpha
+        x, y = self.camera_pos
+        return camera.dx - k * (camera.dx - x), camera.dy - k * (camera.dy - y)
+
+    def interpolate(self, obj, dx, dy):
+        """Returns the offset an object should be drawn with to appear at
+        its position interpolated between the last two steps.
+        """
+        pos = self.positions.get(obj)
+        if pos is None:
+            return dx, dy
+        k = 1 - self.alpha
+        return dx + k * (obj.x - pos[0]), dy + k * (obj.y - pos[1])
+
+
+__all__ = ["FixedTimestep"]
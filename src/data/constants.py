@@ -28,6 +28,59 @@ ROOM_RADIUS = int(7/6 * SCR_H)
 DIST_BETWEEN_ROOMS = 2 * ROOM_RADIUS + SCR_W2
 TRANSPORTATION_TIME = 600
 
+# simulation
+FIXED_TIMESTEP = True
+SIMULATION_STEP = 8
+MAX_STEPS_PER_FRAME = 10
+REPLAY_HASH_INTERVAL = 60
+
+# garbage collector thresholds during a fight: generation-2 collections
+# are deferred to transportation and menus
+GC_COMBAT_THRESHOLDS = (1000, 20, 100000)
+
+# caps of the numbers of entities of every category, beyond which
+# entities are evicted by the policies of their budgets
+ENTITY_CAPS = {
+    "room bullets": 600,
+    "room mines": 50,
+    "room seekers": 150,
+    "bubbles": 200,
+    "top effects": 120,
+    "bottom effects": 120,
+    "spawned mobs": 120,
+    "player bullets": 400,
+    "player mines": 30,
+    "player seekers": 100,
+}
+
+# circles are drawn from cached sprites, unless the cache is disabled
+# to compare with the direct drawing of circles
+CIRCLE_SPRITES_ENABLED = True
+CIRCLE_SPRITES_MAX_BYTES = 16 * 1024 * 1024
+CIRCLE_SPRITES_MAX_RADIUS = 48
+CIRCLE_SPRITES_ANGLE_STEPS = 16
+
+# runs of fixed circles of a body are baked into one sprite per step
+# of the angle of the body, unless baking is disabled
+BAKED_SPRITES_ENABLED = True
+BAKED_SPRITES_MAX_BYTES = 16 * 1024 * 1024
+BAKED_SPRITES_MAX_RADIUS = 48
+BAKED_SPRITES_ANGLE_STEPS = 128
+
+# strips of the background of a room are cut into pieces and flattened
+# with the gradient into opaque surfaces composited for every 'gradient step'
+# pixels of their vertical position on the screen, unless it's disabled
+ROOM_STRIPS_ENABLED = True
+ROOM_STRIPS_PIECE_WIDTH = 512
+ROOM_STRIPS_GRADIENT_STEP = int(SCR_H / 24)
+ROOM_STRIPS_MAX_BYTES = 32 * 1024 * 1024
+
+# layers of the render queue, bottom to top; sprites of the foreground
+# are blitted in batches layer by layer, unless the queue is disabled
+RENDER_QUEUE_ENABLED = True
+RENDER_LAYERS = ("bottom effects", "bubbles", "mines", "player", "enemies", "spawners",
+                 "bullets", "new enemies", "new spawners", "room glares", "top effects")
+
 # gun types
 FIXED_GUN = 0
 ROTATING_GUN = 1
@@ -159,6 +212,26 @@ __all__ = [
     "ROOM_RADIUS",
     "DIST_BETWEEN_ROOMS",
     "TRANSPORTATION_TIME",
+    "FIXED_TIMESTEP",
+    "SIMULATION_STEP",
+    "MAX_STEPS_PER_FRAME",
+    "REPLAY_HASH_INTERVAL",
+    "GC_COMBAT_THRESHOLDS",
+    "ENTITY_CAPS",
+    "CIRCLE_SPRITES_ENABLED",
+    "CIRCLE_SPRITES_MAX_BYTES",
+    "CIRCLE_SPRITES_MAX_RADIUS",
+    "CIRCLE_SPRITES_ANGLE_STEPS",
+    "BAKED_SPRITES_ENABLED",
+    "BAKED_SPRITES_MAX_BYTES",
+    "BAKED_SPRITES_MAX_RADIUS",
+    "BAKED_SPRITES_ANGLE_STEPS",
+    "ROOM_STRIPS_ENABLED",
+    "ROOM_STRIPS_PIECE_WIDTH",
+    "ROOM_STRIPS_GRADIENT_STEP",
+    "ROOM_STRIPS_MAX_BYTES",
+    "RENDER_QUEUE_ENABLED",
+    "RENDER_LAYERS",
     "H_SCALE_FACTOR",
     "W_SCALE_FACTOR",
     "BLACK",
@@ -16,7 +16,11 @@ from data.languages import TEXTS
 def _max_available_resolution():
     """Returns maximum screen resolution suggested by pygame.
     This resolution is supposed to be the screen size of the monitor.
+    In headless mode there is no monitor, so all resolutions are allowed
+    and the config file of the player is left untouched.
     """
+    if os.environ.get("SDL_VIDEODRIVER") == "dummy":
+        return max(default_resolutions)
     pg.display.init()
     return list(pg.display.list_modes()[0])
 
@@ -171,11 +175,9 @@ def update_save_file(save_name,
         json.dump(data, file)
 
 
-def create_save_file(save_name):
-    """Created new save file with given name and
-    default data in user directory.
-    """
-    data = {
+def new_save_data() -> dict:
+    """Returns save data of a new game. """
+    return {
         "tank": (0, 0),
         "tanks history": ((0, 0),),
         "health": 0,
@@ -190,6 +192,13 @@ def create_save_file(save_name):
         "hints history": {"0 0": 0},
         "time": datetime.today().isoformat(sep=' ', timespec='minutes')
     }
+
+
+def create_save_file(save_name):
+    """Created new save file with given name and
+    default data in user directory.
+    """
+    data = new_save_data()
     magic_number = int(hashlib.sha512(json.dumps(data).encode()).hexdigest(), 16)
     data["magic number"] = magic_number
     file_path = os.path.join(_USER_DIR, "%s.json" % save_name)
@@ -255,6 +264,7 @@ __all__ = [
     "load_current_save",
     "load_controls",
     "load_save_file",
+    "new_save_data",
     "create_save_file",
     "update_save_file",
     "delete_save_file",
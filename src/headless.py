@@ -0,0 +1,153 @@
+"""
+Headless simulation mode.
+
+Runs the game simulation without a window and sound, as fast as the CPU
+allows. Can be used from Python:
+
+    from headless import run_headless
+    game = run_headless(frames=10000)
+
+or from the command line, inside the `src` directory:
+
+    $ python __main__.py --headless --frames 10000 --save save_1 --seed 42 --profile
+
+Without input the player stays idle. With --player scripted it is driven
+by a simple scripted player, and with --player fight.btr by the input
+recorded in a replay file, which is repeated when it runs out.
+
+With --memory the bytes taken by live entities of every type are printed
+at the end of the run. The construction speed of enemies of every type
+is measured with:
+
+    $ python __main__.py --bench-enemies 200
+
+Runs can be recorded with --record and played back with --replay:
+
+    $ python __main__.py --record fight.btr
+    $ python __main__.py --headless --replay fight.btr
+
+"""
+
+import os
+import cProfile
+import pstats
+from time import perf_counter
+
+
+def init_headless():
+    """Sets SDL dummy video and audio drivers and initialises pygame.
+    Must be called before any game module is imported.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    import pygame as pg
+    pg.init()
+
+    from data.constants import SCR_SIZE
+    return pg.display.set_mode(SCR_SIZE)
+
+
+def make_headless_game(save_name=None, dt=None, seed=None, record=None):
+    """Creates headless game and starts it with the data of a given save
+    file or, if no save file is given, with the data of a new game.
+    Games made with the same seed run exactly the same simulation.
+    If a replay path is given, the game is recorded.
+    """
+    screen = init_headless()
+
+    from components.headless_game import HeadlessGame
+    from data.scripts import load_save_file, new_save_data
+
+    game = HeadlessGame(screen) if dt is None else HeadlessGame(screen, dt)
+    if record is not None:
+        from components.replay import ReplayRecorder
+        game.recorder = ReplayRecorder(game, record)
+    save_data = new_save_data() if save_name is None else load_save_file(save_name)
+    if save_data is None:
+        raise ValueError("Save file '%s' is missing or corrupted" % save_name)
+    game.start(save_data, seed)
+    return game
+
+
+def make_input_source(player, seed):
+    """Returns the input source driving the player of a headless game:
+    None for an idle player, a scripted player for "scripted", or else
+    the recorded input of the replay file with the given path.
+    """
+    if player is None:
+        return None
+    if player == "scripted":
+        from components.headless_game import ScriptedInput
+        return ScriptedInput(seed)
+    from components.replay import Replay, ReplayInput
+    return ReplayInput(Replay.load(player))
+
+
+def run_headless(frames, save_name=None, dt=None, seed=None, record=None, profile=False,
+                 memory=False, player=None):
+    """Runs the given number of frames of the headless game and, if a path
+    is given, records them into a replay file. The player is driven by
+    the input source made by 'make_input_source' from 'player'.
+    If 'memory' is True, prints the memory taken by live entities.
+    Returns the game.
+    """
+    game = make_headless_game(save_name, dt, seed, record)
+    from components.rng import rng
+    from components.object_pool import pools
+    from components.gc_scheduler import gc_scheduler
+
+    profiler = cProfile.Profile() if profile else None
+
+    start_time = perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    game.run(frames, make_input_source(player, rng.run_seed))
+    if profiler is not None:
+        profiler.disable()
+    elapsed = perf_counter() - start_time
+    if game.recorder is not None:
+        game.recorder.save()
+
+    print("Run seed: %d" % rng.run_seed)
+    print("Simulated %d frames in %.2f s (%.0f frames per second)" %
+          (game.frames, elapsed, game.frames / max(elapsed, 1e-9)))
+    print(game.collision_grid.report())
+    for pool in pools:
+        print(pool.report())
+    print(gc_scheduler.report())
+    print(game.events.report())
+    for budget in game.room.budgets + game.player.budgets:
+        print(budget.report())
+    if memory:
+        from components.memory_report import memory_report
+        print(memory_report(game))
+    if profiler is not None:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(30)
+    return game
+
+
+def bench_enemies(count=200) -> dict:
+    """Constructs the given number of enemies of every type in data/enemies
+    and prints the number of enemies constructed per second for every type,
+    the slowest first. Returns the dict of these numbers.
+    """
+    game = make_headless_game()
+    from data.enemies import ENEMIES
+    from components.enemy import make_enemy
+
+    speeds = dict()
+    for name in ENEMIES:
+        make_enemy(game, name)
+        start_time = perf_counter()
+        for _ in range(count):
+            make_enemy(game, name)
+        speeds[name] = count / max(perf_counter() - start_time, 1e-9)
+
+    print("Enemies constructed per second:")
+    for name in sorted(speeds, key=speeds.get):
+        print("  %-22s %8.0f" % (name, speeds[name]))
+    return speeds
+
+
+__all__ = ["init_headless", "make_headless_game", "make_input_source", "run_headless", "bench_enemies"]